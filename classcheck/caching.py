@@ -0,0 +1,141 @@
+"""
+Helpers for results shared across workers through the default cache.
+
+Every key lives in a namespace ("superuser_dashboard", "teacher_dashboard:42")
+whose version is part of the key, so bump() invalidates a whole namespace
+with one increment instead of tracking and deleting individual keys.
+
+cached() is the get-or-compute entry point. Entries carry a soft expiry:
+once it passes, the first caller to take the namespace lock recomputes
+while everyone else keeps serving the stale value. A cold key has nothing
+to serve, so callers that miss the lock compute it themselves rather than
+wait: a sleeping caller would block the worker thread, which under ASGI is
+the single thread every sync view shares.
+
+With the CACHE_STATS setting on, hits and misses are counted per namespace
+in the cache itself, so counters() reports totals across all workers. It is
+off by default since each count is another cache round trip per read.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+VERSION_KEY = "cachever:{}"
+LOCK_KEY = "cachelock:{}"
+COUNTER_KEY = "cachestats:{}:{}"
+COUNTER_NAMESPACES_KEY = "cachestats:namespaces"
+
+LOCK_TIMEOUT = 30  # seconds a recompute may hold the lock
+
+
+def namespace_version(namespace):
+    """
+    Current version of `namespace`. A missing version starts from the
+    clock rather than from 1, so a version key that was evicted can never
+    come back pointing at entries written before the eviction.
+    """
+    key = VERSION_KEY.format(namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump(*namespaces):
+    """Invalidate everything cached under each of `namespaces`."""
+    for namespace in namespaces:
+        try:
+            cache.incr(VERSION_KEY.format(namespace))
+        except ValueError:
+            # No version yet: the next read starts a fresh one.
+            pass
+
+
+def make_key(namespace, *parts):
+    return ":".join([namespace, f"v{namespace_version(namespace)}", *map(str, parts)])
+
+
+def _count(namespace, outcome):
+    if not getattr(settings, "CACHE_STATS", False):
+        return
+    key = COUNTER_KEY.format(namespace, outcome)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+        namespaces = cache.get(COUNTER_NAMESPACES_KEY, set())
+        if namespace not in namespaces:
+            namespaces.add(namespace)
+            cache.set(COUNTER_NAMESPACES_KEY, namespaces, None)
+
+
+def _counter_group(namespace):
+    # "teacher_dashboard:42" is reported as "teacher_dashboard".
+    return namespace.split(":", 1)[0]
+
+
+def cached(namespace, parts, compute, timeout, stale_timeout=None):
+    """
+    The value cached under `namespace` and `parts`, computing and storing
+    it with `compute()` when missing.
+
+    The value counts as fresh for `timeout` seconds and may then be served
+    stale for up to `stale_timeout` more (default: `timeout`) while one
+    caller recomputes it.
+    """
+    if stale_timeout is None:
+        stale_timeout = timeout
+    key = make_key(namespace, *parts)
+    lock_key = LOCK_KEY.format(key)
+    group = _counter_group(namespace)
+
+    entry = cache.get(key)
+    if entry is not None:
+        fresh_until, value = entry
+        if time.time() < fresh_until or not cache.add(lock_key, 1, LOCK_TIMEOUT):
+            _count(group, "hits")
+            return value
+        locked = True
+    else:
+        # Losing the lock on a cold key means computing alongside its holder.
+        locked = cache.add(lock_key, 1, LOCK_TIMEOUT)
+
+    _count(group, "misses")
+    try:
+        value = compute()
+        cache.set(key, (time.time() + timeout, value), timeout + stale_timeout)
+    finally:
+        if locked:
+            cache.delete(lock_key)
+    return value
+
+
+def counters():
+    """{namespace: {"hits": n, "misses": n, "hit_rate": pct or None}}."""
+    result = {}
+    for namespace in sorted(cache.get(COUNTER_NAMESPACES_KEY, set())):
+        hits = cache.get(COUNTER_KEY.format(namespace, "hits"), 0)
+        misses = cache.get(COUNTER_KEY.format(namespace, "misses"), 0)
+        total = hits + misses
+        result[namespace] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(100 * hits / total, 1) if total else None,
+        }
+    return result
+
+
+def reset_counters():
+    namespaces = cache.get(COUNTER_NAMESPACES_KEY, set())
+    cache.delete_many(
+        [
+            COUNTER_KEY.format(namespace, outcome)
+            for namespace in namespaces
+            for outcome in ("hits", "misses")
+        ]
+        + [COUNTER_NAMESPACES_KEY]
+    )
@@ -0,0 +1,259 @@
+"""
+Opt-in per-request profiling.
+
+Enabled with REQUEST_PROFILING=true in the environment, which installs
+QueryProfilingMiddleware. For every request it counts SQL queries and
+measures database, template and total view time. The numbers are returned
+in a Server-Timing header (visible in the browser's network panel) and
+written as a log line. The same SQL shape running more than
+REQUEST_PROFILING_N_PLUS_ONE times in one request is logged as a likely
+N+1 query.
+
+Template time is measured by wrapping Template.render only while a
+profiled request is in flight; Django's template_rendered signal is sent
+under the test runner alone and carries no timing.
+
+Recent samples are kept per URL name in the default cache, so the
+request_profile command can print p50/p95 figures. Each sample is written
+to its own slot of a ring numbered with cache.incr, so concurrent requests
+never overwrite each other's samples. Use a cache shared between processes
+(file or Redis) when running under several workers.
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.template import base as template_base
+
+from .stats import percentile
+
+logger = logging.getLogger(__name__)
+
+PROFILE_KEY_PREFIX = "request_profile"
+PROFILE_NAMES_KEY = f"{PROFILE_KEY_PREFIX}:names"
+# Samples kept per URL name for the percentile table.
+PROFILE_SAMPLES = 200
+N_PLUS_ONE_THRESHOLD = 10
+
+_current_profile = ContextVar("request_profile", default=None)
+_original_template_render = template_base.Template.render
+_template_timer_lock = threading.Lock()
+_template_timer_users = 0
+
+_IN_LIST = re.compile(r"IN \((?:%s|\?)(?:, (?:%s|\?))*\)")
+_NUMBER = re.compile(r"\b\d+\b")
+_SPACE = re.compile(r"\s+")
+
+
+def sql_shape(sql):
+    """
+    `sql` with literals and IN-list lengths collapsed, so queries that differ
+    only in their parameters compare equal.
+    """
+    sql = _IN_LIST.sub("IN (...)", sql)
+    sql = _NUMBER.sub("N", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+class RequestProfile:
+    """Counters for one request; also usable as a connection execute_wrapper."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+            self.shapes[sql_shape(sql)] += 1
+
+    def repeated_queries(self, threshold):
+        """(shape, count) for every SQL shape run more than `threshold` times."""
+        return [
+            (shape, count)
+            for shape, count in self.shapes.most_common()
+            if count > threshold
+        ]
+
+
+def _timed_render(self, context):
+    profile = _current_profile.get()
+    if profile is None:
+        return _original_template_render(self, context)
+    # Included templates render inside their parent; only time the outermost.
+    profile.template_depth += 1
+    start = time.perf_counter()
+    try:
+        return _original_template_render(self, context)
+    finally:
+        profile.template_depth -= 1
+        if not profile.template_depth:
+            profile.template_time += time.perf_counter() - start
+
+
+@contextmanager
+def _template_timer():
+    """
+    Route Template.render through _timed_render while the block runs.
+
+    Reference counted, so overlapping requests share one installation and
+    the original method is back once the last of them finishes.
+    """
+    global _template_timer_users
+    with _template_timer_lock:
+        if not _template_timer_users:
+            template_base.Template.render = _timed_render
+        _template_timer_users += 1
+    try:
+        yield
+    finally:
+        with _template_timer_lock:
+            _template_timer_users -= 1
+            if not _template_timer_users:
+                template_base.Template.render = _original_template_render
+
+
+def _counter(key):
+    """Atomically increment the counter at `key`, creating it at zero."""
+    cache.add(key, 0, None)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Evicted between add() and incr().
+        cache.add(key, 0, None)
+        return cache.incr(key)
+
+
+def _sample_keys(name, count):
+    """Cache keys of the (at most PROFILE_SAMPLES) latest samples of `name`."""
+    first = max(count - PROFILE_SAMPLES, 0) + 1
+    return [
+        f"{PROFILE_KEY_PREFIX}:{name}:{n % PROFILE_SAMPLES}"
+        for n in range(first, count + 1)
+    ]
+
+
+def _names():
+    count = cache.get(PROFILE_NAMES_KEY, 0)
+    keys = [f"{PROFILE_NAMES_KEY}:{n}" for n in range(1, count + 1)]
+    return keys, cache.get_many(keys)
+
+
+def record_sample(name, total_ms, db_ms, queries):
+    """Store one sample in the next slot of `name`'s ring."""
+    count_key = f"{PROFILE_KEY_PREFIX}:{name}:count"
+    if cache.add(count_key, 0, None):
+        # First sample of this name: register it, also through a counter.
+        cache.set(f"{PROFILE_NAMES_KEY}:{_counter(PROFILE_NAMES_KEY)}", name, None)
+    index = _counter(count_key)
+    cache.set(
+        f"{PROFILE_KEY_PREFIX}:{name}:{index % PROFILE_SAMPLES}",
+        (total_ms, db_ms, queries),
+        None,
+    )
+
+
+def profile_table():
+    """Per URL name: sample count and p50/p95 of total time, DB time and queries."""
+    rows = []
+    for name in sorted(set(_names()[1].values())):
+        count = cache.get(f"{PROFILE_KEY_PREFIX}:{name}:count", 0)
+        samples = list(cache.get_many(_sample_keys(name, count)).values())
+        if not samples:
+            continue
+        total, db, queries = zip(*samples)
+        rows.append(
+            {
+                "name": name,
+                "count": len(samples),
+                "total_p50": percentile(total, 50),
+                "total_p95": percentile(total, 95),
+                "db_p50": percentile(db, 50),
+                "db_p95": percentile(db, 95),
+                "queries_p50": percentile(queries, 50),
+                "queries_p95": percentile(queries, 95),
+            }
+        )
+    return rows
+
+
+def reset_profiles():
+    name_keys, names = _names()
+    keys = name_keys + [PROFILE_NAMES_KEY]
+    for name in set(names.values()):
+        count_key = f"{PROFILE_KEY_PREFIX}:{name}:count"
+        keys += _sample_keys(name, cache.get(count_key, 0)) + [count_key]
+    cache.delete_many(keys)
+
+
+class QueryProfilingMiddleware:
+    """
+    Records queries, DB time, template time and view time for each request.
+
+    Place it first in MIDDLEWARE so queries made by the session and auth
+    middleware are counted too. Streaming response bodies are produced after
+    the middleware returns and are not included.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.threshold = getattr(
+            settings, "REQUEST_PROFILING_N_PLUS_ONE", N_PLUS_ONE_THRESHOLD
+        )
+
+    def __call__(self, request):
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                stack.enter_context(_template_timer())
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile))
+                response = self.get_response(request)
+        finally:
+            _current_profile.reset(token)
+        total_ms = (time.perf_counter() - start) * 1000
+        db_ms = profile.db_time * 1000
+        template_ms = profile.template_time * 1000
+
+        match = request.resolver_match
+        name = match.view_name if match else "<unresolved>"
+        response["Server-Timing"] = ", ".join(
+            [
+                f'db;dur={db_ms:.1f};desc="{profile.queries} queries"',
+                f"tpl;dur={template_ms:.1f}",
+                f"view;dur={total_ms:.1f}",
+            ]
+        )
+        logger.info(
+            "view=%s method=%s status=%s queries=%d db_ms=%.1f template_ms=%.1f total_ms=%.1f",
+            name,
+            request.method,
+            response.status_code,
+            profile.queries,
+            db_ms,
+            template_ms,
+            total_ms,
+        )
+        for shape, count in profile.repeated_queries(self.threshold):
+            logger.warning(
+                "n_plus_one view=%s repeats=%d sql=%s", name, count, shape[:500]
+            )
+        record_sample(name, round(total_ms, 1), round(db_ms, 1), profile.queries)
+        return response
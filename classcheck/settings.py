@@ -10,8 +10,10 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+from importlib.util import find_spec
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
 from environ import Env
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -53,12 +55,30 @@ MIDDLEWARE = [
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "user.middleware.PrincipalAuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
-ROOT_URLCONF = "classcheck.urls"
+# Opt-in request profiling: query counts and DB/template/view time per
+# request as Server-Timing headers and log lines (see classcheck/profiling.py).
+REQUEST_PROFILING = env.bool("REQUEST_PROFILING", default=False)
+# Log a warning when one SQL shape repeats more than this many times.
+REQUEST_PROFILING_N_PLUS_ONE = env.int("REQUEST_PROFILING_N_PLUS_ONE", default=10)
+if REQUEST_PROFILING:
+    MIDDLEWARE.insert(0, "classcheck.profiling.QueryProfilingMiddleware")
+
+# Sessions: "cached_db" reads through the cache and falls back to the
+# database, "signed_cookies" keeps the session in the client's cookie and
+# needs no server storage at all, "db" is Django's default.
+SESSION_ENGINE = "django.contrib.sessions.backends." + env(
+    "SESSION_BACKEND", default="cached_db"
+)
+
+# Async variants of the read-heavy views, for deployment under ASGI
+# (see classcheck/urls_async.py).
+ASYNC_VIEWS = env.bool("ASYNC_VIEWS", default=False)
+ROOT_URLCONF = "classcheck.urls_async" if ASYNC_VIEWS else "classcheck.urls"
 
 TEMPLATES = [
     {
@@ -80,17 +100,63 @@ WSGI_APPLICATION = "classcheck.wsgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
-
-# POSTGRESQL_URL = env("POSTGRESQL_URL")
-# print(POSTGRESQL_URL)
-# DATABASES = {"default": env.db("POSTGRESQL_URL")}
+#
+# DATABASE_URL picks the profile (see .env.example):
+#   unset / sqlite:///path  Local development. WAL journal so readers do not
+#                           block the writer, a busy timeout instead of
+#                           immediate "database is locked" errors, and
+#                           IMMEDIATE transactions so writers queue up front
+#                           rather than deadlocking on lock upgrade.
+#   postgres://...          Deployment. Persistent connections with health
+#                           checks (DB_CONN_MAX_AGE), or a psycopg 3
+#                           connection pool per worker with DB_POOL=true.
 DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
-    }
+    "default": env.db("DATABASE_URL", default=f"sqlite:///{BASE_DIR / 'db.sqlite3'}")
 }
 
+if DATABASES["default"]["ENGINE"] == "django.db.backends.sqlite3":
+    DATABASES["default"]["OPTIONS"] = {
+        "init_command": "PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;",
+        "timeout": env.int("SQLITE_BUSY_TIMEOUT", default=20),  # seconds
+        "transaction_mode": "IMMEDIATE",
+    }
+else:
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+    if env.bool("DB_POOL", default=False):
+        # Needs psycopg 3 with psycopg_pool, the "pool" extra. Fail here
+        # rather than on the first connection.
+        if find_spec("psycopg") is None or find_spec("psycopg_pool") is None:
+            raise ImproperlyConfigured(
+                "DB_POOL=true needs psycopg 3 and psycopg_pool; install the "
+                'project with its pool extra: pip install -e ".[pool]"'
+            )
+        # The pool replaces persistent connections, which Django then forbids.
+        DATABASES["default"]["CONN_MAX_AGE"] = 0
+        DATABASES["default"].setdefault("OPTIONS", {})["pool"] = {
+            "min_size": env.int("DB_POOL_MIN_SIZE", default=2),
+            "max_size": env.int("DB_POOL_MAX_SIZE", default=10),
+            "timeout": env.int("DB_POOL_TIMEOUT", default=10),
+        }
+    else:
+        DATABASES["default"]["CONN_MAX_AGE"] = env.int("DB_CONN_MAX_AGE", default=60)
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+#
+# CACHE_URL picks the backend (see .env.example):
+#   unset / locmemcache://      Per-process memory. Development and tests;
+#                               nothing is shared between workers.
+#   filecache:///path           Files shared by the workers on one host.
+#   redis://host:6379/1         Redis, shared by every worker and host.
+#                               Needs the redis package.
+# Shared results are read through classcheck.caching.
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+CACHES["default"]["KEY_PREFIX"] = env("CACHE_KEY_PREFIX", default="classcheck")
+# Count hits and misses per namespace for the cache_stats command. Each
+# count is an extra cache round trip on every read, so it is off by default.
+CACHE_STATS = env.bool("CACHE_STATS", default=False)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -144,3 +210,18 @@ EMAIL_USE_TLS = env.bool("EMAIL_USE_TLS", default=True)
 EMAIL_HOST_USER = env("EMAIL_HOST_USER", default="")
 EMAIL_HOST_PASSWORD = env("EMAIL_HOST_PASSWORD", default="")
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "classcheck.profiling": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
+    },
+}
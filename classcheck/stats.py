@@ -0,0 +1,8 @@
+"""Small summary statistics shared by the profiling and benchmark tools."""
+
+
+def percentile(values, pct):
+    """The nearest-rank `pct`th percentile of a non-empty sequence."""
+    ordered = sorted(values)
+    index = max(0, round(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
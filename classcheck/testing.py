@@ -0,0 +1,90 @@
+"""
+Query-count regression checks for view tests.
+
+QueryBudgetMixin seeds a generated institution at two sizes. At each size
+it requests every case returned by query_cases() and asserts two things:
+each request stays within its query budget, and the count does not change
+between the sizes. A view whose queries grow with the data (an N+1 loop,
+a missing select_related) fails at the larger size even when it still
+fits its budget.
+"""
+
+from typing import Any, NamedTuple
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from teacher.synthetic import generate_institution
+
+
+class QueryCase(NamedTuple):
+    name: str
+    user: Any
+    url: str
+    budget: int
+    method: str = "get"
+    data: dict | None = None
+
+
+class QueryBudgetMixin:
+    # generate_institution() arguments for the small and the large data set.
+    DATA_SIZES = [
+        {"departments": 1, "classes": 1, "subjects": 6, "students": 2, "weeks": 1},
+        {"departments": 3, "classes": 3, "subjects": 6, "students": 8, "weeks": 3},
+    ]
+    DATA_PREFIX = "qc"
+
+    def query_cases(self):
+        """QueryCase entries to check against the data generated for DATA_PREFIX."""
+        raise NotImplementedError
+
+    def count_queries(self, case):
+        client = Client()
+        if case.user is not None:
+            client.force_login(case.user)
+        # Measure the uncached path so both sizes do the same work.
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            response = getattr(client, case.method)(case.url, case.data or {})
+            if response.streaming:
+                b"".join(response.streaming_content)
+        self.assertLess(
+            response.status_code,
+            400,
+            f"{case.name}: {case.method.upper()} {case.url} returned {response.status_code}",
+        )
+        return len(ctx.captured_queries)
+
+    def measure_query_counts(self):
+        """
+        ({case name: [count at each size]}, {case name: budget}), with each
+        size seeded and then rolled back.
+        """
+        counts = {}
+        budgets = {}
+        for size in self.DATA_SIZES:
+            with transaction.atomic():
+                generate_institution(prefix=self.DATA_PREFIX, **size)
+                for case in self.query_cases():
+                    counts.setdefault(case.name, []).append(self.count_queries(case))
+                    budgets[case.name] = case.budget
+                transaction.set_rollback(True)
+        return counts, budgets
+
+    def assertQueryBudgets(self):
+        counts, budgets = self.measure_query_counts()
+        for name, per_size in counts.items():
+            with self.subTest(view=name):
+                self.assertLessEqual(
+                    max(per_size),
+                    budgets[name],
+                    f"{name} ran {per_size} queries, over its budget of {budgets[name]}",
+                )
+                self.assertEqual(
+                    len(set(per_size)),
+                    1,
+                    f"{name} query count grows with data: {per_size}",
+                )
+        return counts
@@ -0,0 +1,83 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from classcheck import caching
+
+
+@override_settings(CACHE_STATS=True)
+class CachedTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return self.calls
+
+    def test_computes_once_then_hits(self):
+        self.assertEqual(caching.cached("ns", ["a"], self.compute, 60), 1)
+        self.assertEqual(caching.cached("ns", ["a"], self.compute, 60), 1)
+        self.assertEqual(caching.cached("ns", ["b"], self.compute, 60), 2)
+        self.assertEqual(
+            caching.counters(), {"ns": {"hits": 1, "misses": 2, "hit_rate": 33.3}}
+        )
+
+    def test_bump_invalidates_namespace_only(self):
+        caching.cached("ns", ["a"], self.compute, 60)
+        caching.cached("other", ["a"], self.compute, 60)
+        caching.bump("ns")
+        self.assertEqual(caching.cached("ns", ["a"], self.compute, 60), 3)
+        self.assertEqual(caching.cached("other", ["a"], self.compute, 60), 2)
+
+    def test_version_survives_eviction(self):
+        version = caching.namespace_version("ns")
+        caching.bump("ns")
+        self.assertEqual(caching.namespace_version("ns"), version + 1)
+        cache.clear()
+        self.assertGreater(caching.namespace_version("ns"), version + 1)
+
+    def test_stale_value_served_while_another_worker_recomputes(self):
+        with mock.patch("classcheck.caching.time.time", return_value=1000):
+            caching.cached("ns", ["a"], self.compute, 60)
+        key = caching.make_key("ns", "a")
+        cache.add(caching.LOCK_KEY.format(key), 1)
+
+        with mock.patch("classcheck.caching.time.time", return_value=1070):
+            # Past the soft expiry, but the lock is held elsewhere.
+            self.assertEqual(caching.cached("ns", ["a"], self.compute, 60), 1)
+            cache.delete(caching.LOCK_KEY.format(key))
+            # Lock free: this caller recomputes.
+            self.assertEqual(caching.cached("ns", ["a"], self.compute, 60), 2)
+        self.assertIsNone(cache.get(caching.LOCK_KEY.format(key)))
+
+    def test_cold_read_computes_without_waiting_for_lock_holder(self):
+        key = caching.make_key("ns", "a")
+        cache.add(caching.LOCK_KEY.format(key), 1)
+        with mock.patch("classcheck.caching.time.sleep") as sleep:
+            self.assertEqual(caching.cached("ns", ["a"], self.compute, 60), 1)
+        sleep.assert_not_called()
+        # The other worker's lock is left alone.
+        self.assertEqual(cache.get(caching.LOCK_KEY.format(key)), 1)
+
+    def test_counters_group_per_object_namespaces(self):
+        caching.cached("teacher_dashboard:1", ["classes"], self.compute, 60)
+        caching.cached("teacher_dashboard:2", ["classes"], self.compute, 60)
+        self.assertEqual(caching.counters()["teacher_dashboard"]["misses"], 2)
+
+    @override_settings(CACHE_STATS=False)
+    def test_counters_off_by_setting(self):
+        caching.cached("ns", ["a"], self.compute, 60)
+        caching.cached("ns", ["a"], self.compute, 60)
+        self.assertEqual(caching.counters(), {})
+
+    def test_command(self):
+        caching.cached("ns", ["a"], self.compute, 60)
+        out = StringIO()
+        call_command("cache_stats", "--reset", stdout=out)
+        self.assertIn("ns", out.getvalue())
+        self.assertEqual(caching.counters(), {})
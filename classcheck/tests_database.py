@@ -0,0 +1,73 @@
+import os
+import runpy
+from pathlib import Path
+from unittest import mock, skipUnless
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+SETTINGS_PATH = Path(__file__).with_name("settings.py")
+
+
+def load_settings(**environ):
+    """Evaluate settings.py with `environ` in place of the database variables."""
+    names = [
+        "DATABASE_URL",
+        "DB_POOL",
+        "DB_CONN_MAX_AGE",
+        "DB_POOL_MAX_SIZE",
+        "SQLITE_BUSY_TIMEOUT",
+    ]
+    clean = {k: v for k, v in os.environ.items() if k not in names}
+    with mock.patch.dict(os.environ, {**clean, **environ}, clear=True):
+        return runpy.run_path(str(SETTINGS_PATH))
+
+
+class DatabaseProfileTest(SimpleTestCase):
+    def test_sqlite_default(self):
+        db = load_settings()["DATABASES"]["default"]
+        self.assertEqual(db["ENGINE"], "django.db.backends.sqlite3")
+        self.assertIn("journal_mode=WAL", db["OPTIONS"]["init_command"])
+        self.assertEqual(db["OPTIONS"]["timeout"], 20)
+        self.assertEqual(db["OPTIONS"]["transaction_mode"], "IMMEDIATE")
+
+    def test_postgres_persistent_connections(self):
+        db = load_settings(
+            DATABASE_URL="postgres://u:p@db:5432/classcheck", DB_CONN_MAX_AGE="120"
+        )["DATABASES"]["default"]
+        self.assertEqual(db["ENGINE"], "django.db.backends.postgresql")
+        self.assertEqual(db["HOST"], "db")
+        self.assertEqual(db["CONN_MAX_AGE"], 120)
+        self.assertTrue(db["CONN_HEALTH_CHECKS"])
+        self.assertNotIn("pool", db.get("OPTIONS", {}))
+
+    def test_postgres_pool(self):
+        with mock.patch("importlib.util.find_spec", return_value=object()):
+            db = load_settings(
+                DATABASE_URL="postgres://u:p@db:5432/classcheck",
+                DB_POOL="true",
+                DB_POOL_MAX_SIZE="4",
+            )["DATABASES"]["default"]
+        self.assertEqual(db["CONN_MAX_AGE"], 0)
+        self.assertEqual(db["OPTIONS"]["pool"]["max_size"], 4)
+
+    def test_postgres_pool_without_psycopg_pool(self):
+        def find_spec(name, package=None):
+            return None if name == "psycopg_pool" else object()
+
+        with (
+            mock.patch("importlib.util.find_spec", side_effect=find_spec),
+            self.assertRaisesMessage(ImproperlyConfigured, ".[pool]"),
+        ):
+            load_settings(
+                DATABASE_URL="postgres://u:p@db:5432/classcheck", DB_POOL="true"
+            )
+
+
+@skipUnless(connection.vendor == "sqlite", "SQLite connection tuning")
+class SQLiteConnectionTest(TestCase):
+    def test_busy_timeout_applied(self):
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA busy_timeout")
+            self.assertEqual(cursor.fetchone()[0], 20 * 1000)
@@ -1,11 +1,18 @@
 import datetime
-import uuid
 
 from django.contrib.auth import get_user_model
 from django.test import Client, TestCase
 
 from student.models import Enrollment
-from teacher.models import Attendance, Class, ClassSchedule, ClassSession
+from teacher.models import (
+    AcademicSession,
+    Attendance,
+    ClassSchedule,
+    ClassSession,
+    Department,
+    StudentClass,
+    Subject,
+)
 from user.models import Invitation
 
 User = get_user_model()
@@ -21,97 +28,72 @@ class EndToEndFlowTest(TestCase):
         self.client.force_login(self.superuser)
         response = self.client.post(
             "/invite-teacher/",
-            {"email": "teacher@example.com", "first_name": "John", "last_name": "Doe"},
+            {"emails": "teacher@example.com"},
         )
-        self.assertEqual(response.status_code, 302)  # Should redirect now
+        self.assertEqual(response.status_code, 200)
         invitation = Invitation.objects.get(email="teacher@example.com")
         self.assertEqual(invitation.role, User.Role.TEACHER)
-        self.assertEqual(invitation.first_name, "John")
         self.client.logout()
 
-        # 2. Teacher registers
-        register_url = f"/register/{invitation.token}/"
-        response = self.client.post(
-            register_url,
-            {
-                "email": "teacher@example.com",
-                "password": "password",
-                "password_confirmation": "password",
-            },
-        )
-
-        # Simulating registration by creating user directly as if view did it
+        # 2. Teacher registers (created directly; registration has its own tests)
         teacher = User.objects.create_user(
             email="teacher@example.com", password="password", role=User.Role.TEACHER
         )
         invitation.is_used = True
         invitation.save()
 
-        # 3. Admin assignment of Class (replacing proposal flow)
-        # In real app, Admin uses "manage_structure" views. Here we can use ORM or client.post to admin views.
-        # Let's use ORM for simplicity as we want to test the FLOW after creation.
-        self.client.force_login(self.superuser)
-
-        # Admin creates class directly
-        class_obj = Class.objects.create(
+        # 3. Admin builds the structure and assigns the subject
+        session = AcademicSession.objects.create(year_range="2090-2091", is_active=True)
+        department = Department.objects.create(name="Science", session=session)
+        student_class = StudentClass.objects.create(
+            name="science-1", department=department
+        )
+        subject = Subject.objects.create(
+            name="Math 101",
+            student_class=student_class,
             teacher=teacher,
-            subject="Math 101",
+            days=["Mon", "Wed", "Fri"],
             timing=datetime.time(10, 0),
-            days="Mon,Wed,Fri",
         )
-        self.client.logout()
 
-        # 5. Teacher invites Student
+        # 4. Teacher invites Student
         self.client.force_login(teacher)
         response = self.client.post(
-            f"/teacher/class/{class_obj.id}/invite/", {"email": "student@example.com"}
+            f"/teacher/class/{subject.id}/invite/", {"emails": "student@example.com"}
         )
         self.assertEqual(response.status_code, 200)
         student_invite = Invitation.objects.get(email="student@example.com")
         self.assertEqual(student_invite.role, User.Role.STUDENT)
-        self.assertEqual(student_invite.class_id, class_obj.id)
+        self.assertEqual(student_invite.class_id, subject.id)
         self.client.logout()
 
-        # 6. Student registers
+        # 5. Student registers
         student = User.objects.create_user(
             email="student@example.com", password="password", role=User.Role.STUDENT
         )
         student_invite.is_used = True
         student_invite.save()
-        Enrollment.objects.create(student=student, class_obj=class_obj)
+        Enrollment.objects.create(student=student, subject=subject)
 
-        # 7. Teacher marks attendance
-        # We need to mock time or ensure schedule matches.
-        # Let's create a schedule for TODAY at CURRENT TIME for testing purposes
+        # 6. Teacher marks attendance in a schedule that is open right now
         now = datetime.datetime.now()
-        current_day = now.strftime("%a")
-        start_time = (
-            now - datetime.timedelta(minutes=45)
-        ).time()  # Started 45 mins ago
-        end_time = (
-            now + datetime.timedelta(minutes=15)
-        ).time()  # Ends in 15 mins (Window active)
-
-        # Create a specific schedule for this test
         schedule = ClassSchedule.objects.create(
-            class_obj=class_obj,
-            day_of_week=current_day,
-            start_time=start_time,
-            end_time=end_time,
+            subject=subject,
+            teacher_email=teacher.email,
+            day_of_week=now.strftime("%a"),
+            start_time=(now - datetime.timedelta(minutes=45)).time(),
+            end_time=(now + datetime.timedelta(minutes=15)).time(),
         )
 
         self.client.force_login(teacher)
         response = self.client.post(
-            f"/teacher/class/{class_obj.id}/attendance/",
+            f"/teacher/class/{subject.id}/attendance/",
             {f"student_{student.id}": "on"},
         )
         self.assertEqual(response.status_code, 302)
 
-        # Verify Attendance
-        self.assertTrue(
-            ClassSession.objects.filter(class_obj=class_obj, date=now.date()).exists()
-        )
-        session = ClassSession.objects.get(class_obj=class_obj, date=now.date())
+        session = ClassSession.objects.get(subject=subject, date=now.date())
+        self.assertEqual(session.schedule, schedule)
         self.assertTrue(
             Attendance.objects.filter(
                 session=session, student=student, is_present=True
@@ -0,0 +1,111 @@
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.template import base as template_base
+from django.test import Client, TestCase, override_settings
+
+from classcheck.profiling import (
+    PROFILE_SAMPLES,
+    RequestProfile,
+    profile_table,
+    record_sample,
+    reset_profiles,
+    sql_shape,
+)
+from user.models import Invitation
+
+User = get_user_model()
+
+PROFILED_MIDDLEWARE = [
+    "classcheck.profiling.QueryProfilingMiddleware",
+    *settings.MIDDLEWARE,
+]
+
+
+@override_settings(MIDDLEWARE=PROFILED_MIDDLEWARE, REQUEST_PROFILING_N_PLUS_ONE=3)
+class ProfilingMiddlewareTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.student = User.objects.create_user(
+            "student@example.com", None, role=User.Role.STUDENT
+        )
+        self.client.force_login(self.student)
+
+    def test_server_timing_and_samples(self):
+        with self.assertLogs("classcheck.profiling", "INFO") as logs:
+            response = self.client.get("/student/dashboard/")
+        self.assertEqual(response.status_code, 200)
+        timing = response["Server-Timing"]
+        self.assertIn("db;dur=", timing)
+        self.assertIn("tpl;dur=", timing)
+        self.assertIn("view;dur=", timing)
+        self.assertIn("view=student_dashboard", logs.output[0])
+
+        with self.assertLogs("classcheck.profiling", "INFO"):
+            self.client.get("/student/dashboard/")
+        rows = {row["name"]: row for row in profile_table()}
+        self.assertEqual(rows["student_dashboard"]["count"], 2)
+
+        out = StringIO()
+        call_command("request_profile", "--reset", stdout=out)
+        self.assertIn("student_dashboard", out.getvalue())
+        self.assertEqual(profile_table(), [])
+
+    def test_template_timer_is_scoped_to_requests(self):
+        original = template_base.Template.render
+        with self.assertLogs("classcheck.profiling", "INFO"):
+            response = self.client.get("/student/dashboard/")
+        self.assertNotIn("tpl;dur=0.0", response["Server-Timing"])
+        self.assertIs(template_base.Template.render, original)
+
+
+class SampleStoreTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_concurrent_samples_are_all_kept(self):
+        with ThreadPoolExecutor(8) as pool:
+            list(pool.map(lambda n: record_sample("view", n, 1.0, 2), range(80)))
+        (row,) = profile_table()
+        self.assertEqual((row["name"], row["count"]), ("view", 80))
+        self.assertEqual((row["total_p50"], row["total_p95"]), (39, 75))
+
+    def test_keeps_the_latest_samples(self):
+        for n in range(PROFILE_SAMPLES + 10):
+            record_sample("view", n, 1.0, 2)
+        record_sample("other", 5, 1.0, 2)
+        rows = {row["name"]: row for row in profile_table()}
+        self.assertEqual(rows["view"]["count"], PROFILE_SAMPLES)
+        self.assertEqual(rows["view"]["total_p50"], 109)
+        self.assertEqual(rows["other"]["count"], 1)
+
+        reset_profiles()
+        self.assertEqual(profile_table(), [])
+
+
+class QueryShapeTest(TestCase):
+    def test_repeated_shapes_are_grouped(self):
+        profile = RequestProfile()
+        with connection.execute_wrapper(profile):
+            for n in range(5):
+                Invitation.objects.filter(pk=n).first()
+            list(Invitation.objects.filter(pk__in=[1, 2, 3]))
+            list(Invitation.objects.filter(pk__in=[4, 5]))
+        self.assertEqual(profile.queries, 7)
+        repeated = profile.repeated_queries(3)
+        self.assertEqual(len(repeated), 1)
+        self.assertEqual(repeated[0][1], 5)
+        self.assertEqual(profile.repeated_queries(1)[1][1], 2)
+
+    def test_sql_shape(self):
+        self.assertEqual(
+            sql_shape('SELECT "a" FROM "t" WHERE "id" IN (%s, %s)  LIMIT 21'),
+            'SELECT "a" FROM "t" WHERE "id" IN (...) LIMIT N',
+        )
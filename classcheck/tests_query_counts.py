@@ -0,0 +1,199 @@
+import datetime
+import uuid
+
+from django.test import TestCase
+from django.urls import reverse
+
+from classcheck.testing import QueryBudgetMixin, QueryCase
+from student import urls as student_urls
+from student.models import Enrollment
+from teacher import urls as teacher_urls
+from teacher.models import AcademicSession, ClassSchedule
+from user import urls as user_urls
+from user.models import Invitation, User
+
+
+class QueryBudgetTest(QueryBudgetMixin, TestCase):
+    def query_cases(self):
+        prefix = self.DATA_PREFIX
+        admin = User.objects.get(email=f"{prefix}-admin@example.com")
+        schedule = (
+            ClassSchedule.objects.filter(
+                day_of_week=datetime.date.today().strftime("%a")
+            )
+            .select_related("subject__student_class__department", "subject__teacher")
+            .order_by("pk")
+            .first()
+        )
+        subject = schedule.subject
+        teacher = subject.teacher
+        student_ids = list(
+            Enrollment.objects.filter(subject=subject).values_list(
+                "student_id", flat=True
+            )
+        )
+        student = User.objects.get(pk=student_ids[0])
+        session = AcademicSession.objects.get(year_range=f"{prefix}-1")
+        invitation = Invitation.objects.create(
+            email=f"{prefix}-new@example.com", token=uuid.uuid4()
+        )
+        department = subject.student_class.department
+        s = subject.pk
+
+        return [
+            # user/urls.py
+            QueryCase("landing", None, reverse("landing"), 0),
+            QueryCase("login", None, reverse("login"), 0),
+            QueryCase(
+                "role_based_redirect", teacher, reverse("role_based_redirect"), 2
+            ),
+            QueryCase("invite_teacher", admin, reverse("invite_teacher"), 2),
+            QueryCase("invite_student", admin, reverse("invite_student"), 2),
+            QueryCase(
+                "register", None, reverse("register", args=[invitation.token]), 1
+            ),
+            QueryCase("superuser_dashboard", admin, reverse("superuser_dashboard"), 11),
+            # student/urls.py
+            QueryCase("student_dashboard", student, reverse("student_dashboard"), 3),
+            # teacher/urls.py
+            QueryCase("teacher_dashboard", teacher, reverse("teacher_dashboard"), 3),
+            QueryCase(
+                "invite_student:teacher", teacher, f"/teacher/class/{s}/invite/", 3
+            ),
+            QueryCase("upload_roster", teacher, reverse("upload_roster", args=[s]), 3),
+            QueryCase("class_details", teacher, reverse("class_details", args=[s]), 7),
+            QueryCase(
+                "mark_attendance", teacher, reverse("mark_attendance", args=[s]), 6
+            ),
+            QueryCase(
+                "mark_attendance:post",
+                teacher,
+                reverse("mark_attendance", args=[s]),
+                14,
+                method="post",
+                data={f"student_{pk}": "on" for pk in student_ids[::2]},
+            ),
+            QueryCase(
+                "export_attendance",
+                teacher,
+                reverse("export_attendance", args=["subject", s]),
+                4,
+            ),
+            QueryCase(
+                "export_attendance:session",
+                admin,
+                reverse("export_attendance", args=["session", session.pk]),
+                3,
+            ),
+            QueryCase(
+                "attendance_report",
+                teacher,
+                reverse("attendance_report", args=["subject", s]),
+                9,
+            ),
+            QueryCase(
+                "attendance_report:session",
+                admin,
+                reverse("attendance_report", args=["session", session.pk]),
+                7,
+            ),
+            QueryCase("manage_structure", admin, reverse("manage_structure"), 5),
+            QueryCase(
+                "department_classes",
+                admin,
+                reverse("department_classes", args=[department.pk]),
+                5,
+            ),
+            QueryCase(
+                "department_classes:json",
+                admin,
+                reverse("department_classes", args=[department.pk]),
+                5,
+                data={"format": "json"},
+            ),
+            QueryCase(
+                "class_subjects",
+                admin,
+                reverse("class_subjects", args=[subject.student_class_id]),
+                5,
+            ),
+            QueryCase(
+                "class_subjects:json",
+                admin,
+                reverse("class_subjects", args=[subject.student_class_id]),
+                5,
+                data={"format": "json"},
+            ),
+            QueryCase(
+                "add_department",
+                admin,
+                reverse("add_department"),
+                5,
+                method="post",
+                data={"name": "added", "session_id": session.pk},
+            ),
+            QueryCase(
+                "add_class",
+                admin,
+                reverse("add_class"),
+                8,
+                method="post",
+                data={"department_id": department.pk, "count": "1"},
+            ),
+            QueryCase(
+                "add_subject",
+                admin,
+                reverse("add_subject"),
+                12,
+                method="post",
+                data={
+                    "name": "added",
+                    "class_id": subject.student_class_id,
+                    "days": ["Sun"],
+                    "timing": "23:00",
+                    "teacher_email": teacher.email,
+                },
+            ),
+            # Deactivations go last; they hide data from the cases above.
+            QueryCase(
+                "delete_subject",
+                admin,
+                reverse("delete_subject", args=[s]),
+                6,
+                method="post",
+            ),
+            QueryCase(
+                "delete_class",
+                admin,
+                reverse("delete_class", args=[subject.student_class_id]),
+                8,
+                method="post",
+            ),
+            QueryCase(
+                "delete_department",
+                admin,
+                reverse("delete_department", args=[department.pk]),
+                9,
+                method="post",
+            ),
+            QueryCase(
+                "delete_session",
+                admin,
+                reverse("delete_session", args=[session.pk]),
+                10,
+                method="post",
+            ),
+            QueryCase("logout", teacher, reverse("logout"), 4, method="post"),
+        ]
+
+    def test_query_budgets(self):
+        counts = self.assertQueryBudgets()
+
+        # Every named URL needs at least one case ("name" or "name:variant").
+        named = {
+            pattern.name
+            for module in (user_urls, teacher_urls, student_urls)
+            for pattern in module.urlpatterns
+        }
+        covered = {name.split(":")[0] for name in counts}
+        self.assertEqual(named - covered, set(), "URLs without a query budget")
@@ -0,0 +1,34 @@
+"""
+URL configuration with the async view variants, used when ASYNC_VIEWS is
+set. Deploy it under an ASGI server (classcheck.asgi); under WSGI every
+async view would run through a per-request event loop instead.
+
+The async patterns shadow the sync ones with the same route and name;
+everything else comes from classcheck.urls.
+"""
+
+from django.urls import path
+
+from student import views_async as student_views
+from teacher import views_async as teacher_views
+
+from .urls import urlpatterns as sync_urlpatterns
+
+urlpatterns = [
+    path(
+        "teacher/dashboard/",
+        teacher_views.teacher_dashboard,
+        name="teacher_dashboard",
+    ),
+    path(
+        "teacher/class/<int:class_id>/details/",
+        teacher_views.class_details,
+        name="class_details",
+    ),
+    path(
+        "student/dashboard/",
+        student_views.student_dashboard,
+        name="student_dashboard",
+    ),
+    *sync_urlpatterns,
+]
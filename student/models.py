@@ -3,16 +3,27 @@ from django.db import models
 
 
 class Enrollment(models.Model):
+    # Both foreign keys lead a composite index below.
     student = models.ForeignKey(
-        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="enrollments"
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="enrollments",
+        db_index=False,
     )
     subject = models.ForeignKey(
-        "teacher.Subject", on_delete=models.CASCADE, related_name="enrollments"
+        "teacher.Subject",
+        on_delete=models.CASCADE,
+        related_name="enrollments",
+        db_index=False,
     )
     enrolled_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         unique_together = ("student", "subject")
+        indexes = [
+            # Rosters; the unique key leads with student.
+            models.Index(fields=["subject", "student"], name="enrollment_roster_idx"),
+        ]
 
     def __str__(self):
         return f"{self.student.email} in {self.subject.name}"
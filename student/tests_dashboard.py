@@ -0,0 +1,99 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from student.models import Enrollment
+from teacher.models import (
+    AcademicSession,
+    Attendance,
+    ClassSession,
+    Department,
+    StudentClass,
+    Subject,
+)
+
+User = get_user_model()
+
+
+class StudentDashboardTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.student = User.objects.create_user(
+            email="student@example.com", password="password", role=User.Role.STUDENT
+        )
+        self.client.force_login(self.student)
+
+        self.session = AcademicSession.objects.create(
+            year_range="2090-2091", is_active=True
+        )
+        self.dept = Department.objects.create(name="Science", session=self.session)
+        self.cls = StudentClass.objects.create(name="science-1", department=self.dept)
+        self.monday = datetime.date(2090, 9, 4)
+        self.subject_count = 0
+
+    def add_subject(self, dates, present=None):
+        self.subject_count += 1
+        subject = Subject.objects.create(
+            name=f"Subject {self.subject_count}", student_class=self.cls
+        )
+        Enrollment.objects.create(student=self.student, subject=subject)
+        sessions = []
+        for date in dates:
+            class_session = ClassSession.objects.create(subject=subject, date=date)
+            if present is not None:
+                Attendance.objects.create(
+                    session=class_session, student=self.student, is_present=present
+                )
+            sessions.append(class_session)
+        return subject, sessions
+
+    def test_day_view_statuses(self):
+        _, (present,) = self.add_subject([self.monday], present=True)
+        _, (absent,) = self.add_subject([self.monday], present=False)
+        _, (unmarked,) = self.add_subject([self.monday])
+        other = Subject.objects.create(name="Not Mine", student_class=self.cls)
+        ClassSession.objects.create(subject=other, date=self.monday)
+
+        response = self.client.get(f"/student/dashboard/?date={self.monday}")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.context["attendance_map"],
+            {present.id: "Present", absent.id: "Absent", unmarked.id: "Not Marked"},
+        )
+        self.assertContains(response, "subject 1")
+        self.assertNotContains(response, "not mine")
+
+    def test_week_view(self):
+        tuesday = self.monday + datetime.timedelta(days=1)
+        next_monday = self.monday + datetime.timedelta(days=7)
+        self.add_subject([self.monday, tuesday, next_monday], present=True)
+
+        response = self.client.get(f"/student/dashboard/?date={tuesday}&view=week")
+
+        self.assertEqual(response.context["start"], self.monday)
+        self.assertEqual(
+            [s.date for s in response.context["sessions"]], [self.monday, tuesday]
+        )
+
+    def test_query_count_is_flat(self):
+        url = f"/student/dashboard/?date={self.monday}&view=week"
+        week = [self.monday + datetime.timedelta(days=n) for n in range(5)]
+
+        def count_queries():
+            cache.clear()
+            with CaptureQueriesContext(connection) as ctx:
+                self.client.get(url)
+            return len(ctx.captured_queries)
+
+        self.add_subject(week, present=True)
+        small = count_queries()
+        for _ in range(8):
+            self.add_subject(week, present=False)
+        large = count_queries()
+
+        self.assertEqual(small, large)
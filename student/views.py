@@ -1,33 +1,79 @@
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
+from django.db.models import F, FilteredRelation, Q
 from user.decorators import student_required
-from .models import Enrollment
-from teacher.models import ClassSession, Attendance
+from teacher.models import ClassSession
 import datetime
 
-@student_required
-def student_dashboard(request):
-    date_str = request.GET.get('date')
-    if date_str:
-        date = datetime.datetime.strptime(date_str, '%Y-%m-%d').date()
+MAX_RANGE_DAYS = 31
+
+
+def attendance_timeline(student, start, end):
+    """
+    Sessions held for the student's subjects between start and end (inclusive).
+
+    The student's own Attendance row is LEFT JOINed onto each session, so the
+    whole range costs a single query. Each session gets an `is_present`
+    attribute that is True, False or None when no mark was recorded.
+    """
+    return (
+        ClassSession.objects.filter(
+            subject__enrollments__student=student, date__range=(start, end)
+        )
+        .annotate(
+            own_attendance=FilteredRelation(
+                "attendances", condition=Q(attendances__student=student)
+            ),
+            is_present=F("own_attendance__is_present"),
+        )
+        .select_related("subject", "schedule")
+        .order_by("date", "schedule__start_time", "id")
+    )
+
+
+def _parse_date(value, default):
+    if not value:
+        return default
+    return datetime.datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def _dashboard_range(request):
+    """(date, start, end) for the dashboard query string."""
+    date = _parse_date(request.GET.get('date'), datetime.date.today())
+
+    # ?view=week shows Monday-Sunday around `date`; ?start=&end= an explicit range.
+    if request.GET.get('view') == 'week':
+        start = date - datetime.timedelta(days=date.weekday())
+        end = start + datetime.timedelta(days=6)
     else:
-        date = datetime.date.today()
+        start = _parse_date(request.GET.get('start'), date)
+        end = _parse_date(request.GET.get('end'), start)
+    end = min(max(end, start), start + datetime.timedelta(days=MAX_RANGE_DAYS - 1))
+    return date, start, end
 
-    enrollments = Enrollment.objects.filter(student=request.user)
-    class_ids = enrollments.values_list('class_obj_id', flat=True)
-    
-    sessions = ClassSession.objects.filter(class_obj_id__in=class_ids, date=date).select_related('class_obj', 'schedule').order_by('schedule__start_time')
-    
+
+def _dashboard_context(date, start, end, sessions):
     attendance_map = {}
     for session in sessions:
-        try:
-            att = Attendance.objects.get(session=session, student=request.user)
-            attendance_map[session.id] = 'Present' if att.is_present else 'Absent'
-        except Attendance.DoesNotExist:
+        if session.is_present is None:
             attendance_map[session.id] = 'Not Marked'
+        else:
+            attendance_map[session.id] = 'Present' if session.is_present else 'Absent'
 
-    return render(request, 'student/dashboard.html', {
+    return {
         'date': date,
+        'start': start,
+        'end': end,
+        'is_range': start != end,
         'sessions': sessions,
         'attendance_map': attendance_map
-    })
+    }
+
+
+@student_required
+def student_dashboard(request):
+    date, start, end = _dashboard_range(request)
+    sessions = list(attendance_timeline(request.user, start, end))
+    return render(
+        request, 'student/dashboard.html', _dashboard_context(date, start, end, sessions)
+    )
@@ -0,0 +1,21 @@
+"""Async variant of the student dashboard (see classcheck/urls_async.py)."""
+
+from django.shortcuts import render
+
+from user.decorators import student_required
+
+from .views import _dashboard_context, _dashboard_range, attendance_timeline
+
+
+@student_required
+async def student_dashboard(request):
+    request.user = await request.auser()
+    date, start, end = _dashboard_range(request)
+    sessions = [
+        session async for session in attendance_timeline(request.user, start, end)
+    ]
+    return render(
+        request,
+        "student/dashboard.html",
+        _dashboard_context(date, start, end, sessions),
+    )
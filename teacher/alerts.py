@@ -0,0 +1,302 @@
+"""
+Low-attendance alerts, sent by the send_attendance_alerts command.
+
+Each run scans the Attendance rows written since the previous run, using
+the highest Attendance id seen as a checkpoint, and re-evaluates just the
+(student, subject) pairs those rows touch from their AttendanceSummary
+totals, so a run costs O(new marks) rather than a pass over the table.
+
+Ids are handed out when a row is inserted but become visible when its
+transaction commits, so a mark can appear below a checkpoint that has
+already passed it. Each run therefore re-scans the last RESCAN_WINDOW ids
+before the checkpoint as well. Re-evaluating a pair is idempotent: an
+AttendanceAlert row records every pair that has been alerted and is still
+below the threshold, so a pair alerts when it is below with no record, and
+its record is dropped once it recovers.
+
+Students get one digest of their subjects and teachers one digest of their
+students. The digests are queued in the outbox in the same transaction
+that records the alerts and moves the checkpoint, then delivered in
+batches over a single mail connection; whatever is not delivered, because
+the mail server failed or the run died, stays in the outbox for
+send_queued_mail to retry.
+
+Re-marking an existing row keeps its id, so corrections are not scanned
+themselves; the pair is re-evaluated with its next new mark.
+"""
+
+from collections import defaultdict
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Exists, F, Max, OuterRef, Q
+
+from user.mail import BATCH_SIZE, queue_mass_mail, send_queued_mail
+
+from .analytics import ATTENDANCE_THRESHOLD, NAME_CHUNK_SIZE
+from .models import Attendance, AttendanceAlert, AttendanceSummary, JobCheckpoint
+
+CHECKPOINT_NAME = "attendance_alerts"
+ALERT_MIN_SESSIONS = 5  # a rate over fewer sessions does not alert yet
+SCAN_CHUNK_SIZE = 2000
+RESCAN_WINDOW = 5000  # ids behind the checkpoint scanned again for late commits
+
+
+def scan_new_marks(after):
+    """
+    The (student_id, subject_id) pairs of the Attendance rows with an id
+    above `after`, and the highest id seen (or `after`).
+    """
+    pairs = set()
+    last = after
+    marks = (
+        Attendance.objects.filter(id__gt=after)
+        .order_by("id")
+        .values_list("id", "student_id", "session__subject_id")
+    )
+    for pk, student_id, subject_id in marks.iterator(chunk_size=SCAN_CHUNK_SIZE):
+        pairs.add((student_id, subject_id))
+        last = pk
+    return pairs, last
+
+
+def _below(held, present, threshold, min_sessions):
+    return held >= min_sessions and 100 * present < threshold * held
+
+
+def find_alerts(pairs, threshold=ATTENDANCE_THRESHOLD, min_sessions=ALERT_MIN_SESSIONS):
+    """
+    Re-evaluate `pairs` from their current summaries. Returns one dict per
+    pair that is below `threshold` percent and has not been alerted yet,
+    and the (student_id, subject_id) of the alerted pairs that recovered.
+    """
+    student_ids = sorted({student_id for student_id, _ in pairs})
+    alerts = []
+    recovered = []
+    for i in range(0, len(student_ids), NAME_CHUNK_SIZE):
+        summaries = (
+            AttendanceSummary.objects.filter(
+                student_id__in=student_ids[i : i + NAME_CHUNK_SIZE],
+                student__is_active=True,
+                subject__is_active=True,
+            )
+            .annotate(
+                alerted=Exists(
+                    AttendanceAlert.objects.filter(
+                        student_id=OuterRef("student_id"),
+                        subject_id=OuterRef("subject_id"),
+                    )
+                )
+            )
+            .values_list(
+                "student_id",
+                "subject_id",
+                "sessions_held",
+                "sessions_present",
+                "alerted",
+                "student__email",
+                "subject__name",
+                "subject__student_class__name",
+                "subject__teacher__email",
+            )
+        )
+        for (
+            student_id,
+            subject_id,
+            held,
+            present,
+            alerted,
+            email,
+            subject,
+            class_name,
+            teacher_email,
+        ) in summaries:
+            if (student_id, subject_id) not in pairs:
+                continue
+            below = _below(held, present, threshold, min_sessions)
+            if alerted and not below:
+                recovered.append((student_id, subject_id))
+            if alerted or not below:
+                continue
+            alerts.append(
+                {
+                    "student_id": student_id,
+                    "subject_id": subject_id,
+                    "email": email,
+                    "subject": subject,
+                    "class_name": class_name,
+                    "teacher_email": teacher_email,
+                    "held": held,
+                    "present": present,
+                    "rate": round(100 * present / held, 1),
+                }
+            )
+    alerts.sort(key=lambda alert: (alert["email"], alert["subject"]))
+    return alerts, recovered
+
+
+def build_digests(alerts, threshold=ATTENDANCE_THRESHOLD):
+    """One EmailMessage per student and per teacher with alerts."""
+    by_student = defaultdict(list)
+    by_teacher = defaultdict(list)
+    for alert in alerts:
+        by_student[alert["email"]].append(alert)
+        if alert["teacher_email"]:
+            by_teacher[alert["teacher_email"]].append(alert)
+
+    messages = []
+    for email, rows in by_student.items():
+        lines = "\n".join(
+            f"- {row['subject']} ({row['class_name']}): {row['rate']}% "
+            f"({row['present']} of {row['held']} sessions)"
+            for row in rows
+        )
+        messages.append(
+            EmailMessage(
+                "Your attendance is below the required level",
+                f"Hi,\n\nYour attendance has dropped below {threshold}% in:\n\n"
+                f"{lines}\n\nPlease attend upcoming sessions to bring it back up.\n\n"
+                "Best regards,\nClassCheck Team",
+                settings.DEFAULT_FROM_EMAIL,
+                [email],
+            )
+        )
+    for email, rows in by_teacher.items():
+        lines = "\n".join(
+            f"- {row['email']}, {row['subject']} ({row['class_name']}): "
+            f"{row['rate']}% ({row['present']} of {row['held']} sessions)"
+            for row in rows
+        )
+        messages.append(
+            EmailMessage(
+                f"{len(rows)} student(s) fell below {threshold}% attendance",
+                f"Hi,\n\nThese students have dropped below {threshold}% attendance "
+                f"in your subjects:\n\n{lines}\n\nBest regards,\nClassCheck Team",
+                settings.DEFAULT_FROM_EMAIL,
+                [email],
+            )
+        )
+    return messages
+
+
+def _queue(messages):
+    return queue_mass_mail(
+        (message.subject, message.body, message.from_email, message.to)
+        for message in messages
+    )
+
+
+def _record(alerts, recovered):
+    AttendanceAlert.objects.bulk_create(
+        [
+            AttendanceAlert(
+                student_id=alert["student_id"], subject_id=alert["subject_id"]
+            )
+            for alert in alerts
+        ],
+        ignore_conflicts=True,
+    )
+    chunk = NAME_CHUNK_SIZE // 2  # two parameters per pair
+    for i in range(0, len(recovered), chunk):
+        pairs = recovered[i : i + chunk]
+        AttendanceAlert.objects.filter(
+            reduce(or_, (Q(student_id=s, subject_id=t) for s, t in pairs))
+        ).delete()
+
+
+def _mark_backlog(threshold, min_sessions):
+    """Record every pair already below the threshold as alerted."""
+    below = (
+        AttendanceSummary.objects.filter(sessions_held__gte=min_sessions)
+        .alias(scaled=F("sessions_present") * 100)
+        .filter(scaled__lt=F("sessions_held") * threshold)
+        .values_list("student_id", "subject_id")
+    )
+    AttendanceAlert.objects.bulk_create(
+        (
+            AttendanceAlert(student_id=student_id, subject_id=subject_id)
+            for student_id, subject_id in below.iterator(chunk_size=SCAN_CHUNK_SIZE)
+        ),
+        batch_size=SCAN_CHUNK_SIZE,
+        ignore_conflicts=True,
+    )
+
+
+def deliver(limit, batch_size=BATCH_SIZE, connection=None):
+    """
+    Send up to `limit` due outbox rows in batches of `batch_size` over one
+    mail connection. Rows that fail stay queued for send_queued_mail to
+    retry. Returns the number sent.
+    """
+    connection = connection or get_connection()
+    try:
+        connection.open()
+    except Exception:
+        # Nothing is claimed yet; the rows stay queued for send_queued_mail.
+        return 0
+    sent = handled = 0
+    try:
+        while handled < limit:
+            batch_sent, batch_failed = send_queued_mail(
+                min(batch_size, limit - handled), connection
+            )
+            if not batch_sent + batch_failed:
+                break
+            sent += batch_sent
+            handled += batch_sent + batch_failed
+    finally:
+        connection.close()
+    return sent
+
+
+def send_attendance_alerts(
+    threshold=ATTENDANCE_THRESHOLD,
+    min_sessions=ALERT_MIN_SESSIONS,
+    batch_size=BATCH_SIZE,
+    dry_run=False,
+    skip_backlog=False,
+):
+    """
+    Alert on the marks written since the last run and advance the
+    checkpoint past them. With `dry_run` nothing is sent, recorded or
+    advanced; with `skip_backlog` the checkpoint jumps to the newest mark
+    and pairs already below the threshold are recorded without alerting.
+    Returns a dict of counts.
+    """
+    with transaction.atomic():
+        checkpoint, _ = JobCheckpoint.objects.select_for_update().get_or_create(
+            name=CHECKPOINT_NAME
+        )
+        start = checkpoint.position
+        if skip_backlog:
+            last = Attendance.objects.aggregate(last=Max("id"))["last"] or start
+            pairs, alerts, recovered, messages = set(), [], [], []
+        else:
+            pairs, last = scan_new_marks(max(start - RESCAN_WINDOW, 0))
+            last = max(last, start)
+            alerts, recovered = find_alerts(pairs, threshold, min_sessions)
+            messages = build_digests(alerts, threshold)
+        queued = 0
+        if not dry_run:
+            if skip_backlog:
+                _mark_backlog(threshold, min_sessions)
+            _record(alerts, recovered)
+            queued = _queue(messages) if messages else 0
+            checkpoint.position = last
+            checkpoint.save(update_fields=["position", "updated_at"])
+
+    # Delivered after the commit so the mail server never holds the row
+    # lock; the digests are already safe in the outbox.
+    sent = deliver(queued, batch_size) if queued else 0
+    return {
+        "from": start,
+        "to": last,
+        "pairs": len(pairs),
+        "alerts": len(alerts),
+        "messages": len(messages),
+        "sent": sent,
+        "queued": queued - sent,
+    }
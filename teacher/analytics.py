@@ -0,0 +1,315 @@
+"""
+Attendance analytics for a subject, class, department or academic session.
+
+attendance_report() loads the scope's marks into NumPy arrays with two
+values_list queries, one for the sessions and one for the attendance
+rows, and computes every figure with vectorised grouping (np.unique,
+np.bincount, np.lexsort) rather than a Python loop per mark, so a whole
+academic session stays fast at term scale. Names are looked up
+afterwards, only for the ids that appear in the result.
+"""
+
+import numpy as np
+
+from user.models import User
+
+from .export import EXPORT_CHUNK_SIZE
+from .models import Attendance, Subject
+
+ATTENDANCE_THRESHOLD = 75  # percent
+RECENT_WINDOW = 10  # sessions per student and subject
+NAME_CHUNK_SIZE = 900  # ids per IN (...) lookup, under SQLite's parameter limit
+
+SESSION_DTYPE = np.dtype([("id", "i8"), ("subject", "i8"), ("date", "datetime64[D]")])
+ROW_DTYPE = np.dtype([("session", "i8"), ("student", "i8"), ("present", "?")])
+MARK_DTYPE = np.dtype(
+    [
+        ("student", "i8"),
+        ("session", "i8"),
+        ("subject", "i8"),
+        ("date", "datetime64[D]"),
+        ("present", "?"),
+    ]
+)
+
+
+def load_marks(sessions):
+    """
+    One (student, session, subject, date, present) record per Attendance
+    row of the ClassSession queryset `sessions`, as a structured array.
+    """
+    session_rows = np.fromiter(
+        sessions.values_list("id", "subject_id", "date").iterator(
+            chunk_size=EXPORT_CHUNK_SIZE
+        ),
+        dtype=SESSION_DTYPE,
+    )
+    session_rows.sort(order="id")
+    rows = np.fromiter(
+        Attendance.objects.filter(session__in=sessions)
+        .values_list("session_id", "student_id", "is_present")
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE),
+        dtype=ROW_DTYPE,
+    )
+
+    # Each mark's session, found by binary search over the sorted ids.
+    position = np.searchsorted(session_rows["id"], rows["session"])
+    marks = np.empty(len(rows), dtype=MARK_DTYPE)
+    marks["student"] = rows["student"]
+    marks["session"] = rows["session"]
+    marks["subject"] = session_rows["subject"][position]
+    marks["date"] = session_rows["date"][position]
+    marks["present"] = rows["present"]
+    return marks
+
+
+def _pair_keys(first, second):
+    """One int64 per (first, second) pair; decoded by np.divmod(keys, base)."""
+    base = int(second.max()) + 1 if len(second) else 1
+    return first * base + second, base
+
+
+def _tally(keys, present):
+    """Distinct keys with the number of marks and of presences for each."""
+    unique, inverse = np.unique(keys, return_inverse=True)
+    held = np.bincount(inverse, minlength=len(unique))
+    attended = np.bincount(inverse, weights=present, minlength=len(unique))
+    return unique, held, attended.astype(np.int64)
+
+
+def _roll_up(keys, held, attended):
+    """Totals of already tallied rows, regrouped by `keys`."""
+    unique, inverse = np.unique(keys, return_inverse=True)
+    return (
+        unique,
+        np.bincount(inverse, weights=held, minlength=len(unique)).astype(np.int64),
+        np.bincount(inverse, weights=attended, minlength=len(unique)).astype(np.int64),
+    )
+
+
+def _rates(held, attended):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.round(100 * attended / held, 1)
+
+
+def _histories(keys, dates, sessions, present, window):
+    """
+    Per distinct key, taking its marks in date order: the number of marks
+    and presences, the length and kind of the current run of presences or
+    absences, the longest run of absences, and the rate over the last
+    `window` marks.
+    """
+    if not len(keys):
+        empty = np.empty(0, dtype=np.int64)
+        return {
+            "keys": empty,
+            "held": empty,
+            "present": empty,
+            "streak": empty,
+            "streak_present": empty.astype(bool),
+            "longest_absence": empty,
+            "recent_rate": empty.astype(float),
+        }
+
+    order = np.lexsort((sessions, dates.astype("i8"), keys))
+    keys = keys[order]
+    present = present[order]
+    count = len(keys)
+
+    group_start = np.r_[True, keys[1:] != keys[:-1]]
+    starts = np.flatnonzero(group_start)
+    group = np.cumsum(group_start) - 1
+    group_end = np.r_[starts[1:], count] - 1
+    held = np.diff(np.r_[starts, count])
+    attended = np.add.reduceat(present.astype(np.int64), starts)
+
+    run_start = group_start | np.r_[True, present[1:] != present[:-1]]
+    run = np.cumsum(run_start) - 1
+    run_length = np.bincount(run)
+    run_present = present[run_start]
+    absent_runs = ~run_present
+    longest_absence = np.zeros(len(starts), dtype=np.int64)
+    np.maximum.at(
+        longest_absence, group[run_start][absent_runs], run_length[absent_runs]
+    )
+    current = run[group_end]
+
+    # Marks counted back from the latest one of their key.
+    recent = group_end[group] - np.arange(count) < window
+    recent_held = np.bincount(group[recent], minlength=len(starts))
+    recent_attended = np.bincount(
+        group[recent], weights=present[recent], minlength=len(starts)
+    )
+
+    return {
+        "keys": keys[starts],
+        "held": held,
+        "present": attended,
+        "streak": run_length[current],
+        "streak_present": run_present[current],
+        "longest_absence": longest_absence,
+        "recent_rate": _rates(recent_held, recent_attended),
+    }
+
+
+def _week_starts(dates):
+    """The Monday of each date's week, as datetime64[D]."""
+    days = dates.astype("i8")
+    # 1970-01-01, day 0, was a Thursday.
+    return (days - (days + 3) % 7).astype("datetime64[D]")
+
+
+def _lookup(queryset, ids, *fields):
+    """values_list(*fields) of the rows of `queryset` with the given ids."""
+    ids = [int(pk) for pk in ids]
+    rows = []
+    for i in range(0, len(ids), NAME_CHUNK_SIZE):
+        rows.extend(
+            queryset.filter(id__in=ids[i : i + NAME_CHUNK_SIZE])
+            .values_list(*fields)
+            .order_by()
+        )
+    return rows
+
+
+def _summary_rows(ids, held, attended, names):
+    rates = _rates(held, attended)
+    return [
+        {
+            "id": int(pk),
+            "name": names.get(int(pk), ""),
+            "held": int(h),
+            "present": int(a),
+            "rate": float(r),
+        }
+        for pk, h, a, r in zip(ids, held, attended, rates)
+    ]
+
+
+def attendance_report(sessions, threshold=ATTENDANCE_THRESHOLD, window=RECENT_WINDOW):
+    """
+    Attendance figures for the ClassSession queryset `sessions`:
+
+    - overall: marks, presences and rate across the whole scope.
+    - departments, classes, subjects: the same per group, by name.
+    - students: each student across all their subjects, lowest rate first.
+    - student_subjects: each student in each subject, with the current
+      streak, the longest run of absences and the rate over the last
+      `window` sessions, lowest rate first.
+    - below_threshold / students_below_threshold: the rows of the two
+      lists above whose rate is under `threshold` percent.
+    - weeks: marks, presences and rate per calendar week.
+
+    Rates are percentages rounded to one decimal.
+    """
+    marks = load_marks(sessions)
+    present = marks["present"]
+
+    subjects = {
+        pk: (name, class_id, class_name, department_id, department_name)
+        for pk, name, class_id, class_name, department_id, department_name in (
+            _lookup(
+                Subject.objects,
+                np.unique(marks["subject"]),
+                "id",
+                "name",
+                "student_class_id",
+                "student_class__name",
+                "student_class__department_id",
+                "student_class__department__name",
+            )
+        )
+    }
+    subject_ids = np.array(sorted(subjects), dtype=np.int64)
+    subject_position = np.searchsorted(subject_ids, marks["subject"])
+    class_of = np.array([subjects[pk][1] for pk in subject_ids], dtype=np.int64)
+    department_of = np.array([subjects[pk][3] for pk in subject_ids], dtype=np.int64)
+
+    # Subjects are tallied from the marks; classes and departments from
+    # the subject totals.
+    held = np.bincount(subject_position, minlength=len(subject_ids))
+    attended = np.bincount(
+        subject_position, weights=present, minlength=len(subject_ids)
+    ).astype(np.int64)
+    groups = {}
+    for name, ids, names in (
+        ("subjects", subject_ids, {pk: row[0] for pk, row in subjects.items()}),
+        ("classes", class_of, {row[1]: row[2] for row in subjects.values()}),
+        ("departments", department_of, {row[3]: row[4] for row in subjects.values()}),
+    ):
+        groups[name] = sorted(
+            _summary_rows(*_roll_up(ids, held, attended), names),
+            key=lambda row: (row["name"], row["id"]),
+        )
+
+    student_ids, held, attended = _tally(marks["student"], present)
+    emails = dict(_lookup(User.objects, student_ids, "id", "email"))
+    students = sorted(
+        _summary_rows(student_ids, held, attended, emails),
+        key=lambda row: (row["rate"], row["name"]),
+    )
+
+    pair_keys, base = _pair_keys(marks["student"], marks["subject"])
+    histories = _histories(pair_keys, marks["date"], marks["session"], present, window)
+    pair_students, pair_subjects = np.divmod(histories["keys"], base)
+    held, attended = histories["held"], histories["present"]
+    rates = _rates(held, attended)
+    student_subjects = sorted(
+        (
+            {
+                "student": int(student),
+                "email": emails.get(int(student), ""),
+                "subject": int(subject),
+                "subject_name": subjects[int(subject)][0],
+                "class_name": subjects[int(subject)][2],
+                "held": int(h),
+                "present": int(a),
+                "rate": float(rate),
+                "recent_rate": float(recent),
+                "streak": int(streak),
+                "streak_present": bool(streak_present),
+                "longest_absence": int(longest),
+            }
+            for student, subject, h, a, rate, recent, streak, streak_present, longest in zip(
+                pair_students,
+                pair_subjects,
+                held,
+                attended,
+                rates,
+                histories["recent_rate"],
+                histories["streak"],
+                histories["streak_present"],
+                histories["longest_absence"],
+            )
+        ),
+        key=lambda row: (row["rate"], row["email"], row["subject_name"]),
+    )
+
+    weeks, held, attended = _tally(_week_starts(marks["date"]), present)
+    total_held = len(marks)
+    total_present = int(np.count_nonzero(present))
+    return {
+        "threshold": threshold,
+        "window": window,
+        "overall": {
+            "held": total_held,
+            "present": total_present,
+            "rate": round(100 * total_present / total_held, 1) if total_held else None,
+        },
+        **groups,
+        "students": students,
+        "students_below_threshold": [
+            row for row in students if row["rate"] < threshold
+        ],
+        "student_subjects": student_subjects,
+        "below_threshold": [row for row in student_subjects if row["rate"] < threshold],
+        "weeks": [
+            {
+                "week": week.item(),
+                "held": int(h),
+                "present": int(a),
+                "rate": float(rate),
+            }
+            for week, h, a, rate in zip(weeks, held, attended, _rates(held, attended))
+        ],
+    }
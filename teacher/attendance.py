@@ -0,0 +1,275 @@
+import asyncio
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, Max, Q
+
+from student.models import Enrollment
+
+from .models import Attendance, AttendanceSummary, ClassSession
+
+PRESENT = "Present"
+ABSENT = "Absent"
+NOT_APPLICABLE = "N/A"
+
+ATTENDANCE_BATCH_SIZE = 500
+
+
+def day_sessions(subject_ids, date):
+    """Sessions of `subject_ids` held on `date`, in timetable order."""
+    return (
+        ClassSession.objects.filter(subject_id__in=subject_ids, date=date)
+        .select_related("subject", "schedule")
+        .order_by("schedule__start_time", "id")
+    )
+
+
+def roster_marks(sessions, student_ids):
+    """(session_id, student_id, is_present) of `student_ids` in `sessions`."""
+    return Attendance.objects.filter(
+        session__in=sessions, student_id__in=student_ids
+    ).values_list("session_id", "student_id", "is_present")
+
+
+def build_attendance_grid(subject, date):
+    """
+    Build the class_details matrix for every student enrolled in `subject`.
+
+    Columns are all sessions held on `date` for any subject those students
+    take, so a teacher can see the rest of their students' day. The whole
+    grid is loaded with four queries regardless of roster or session count:
+    roster, memberships, sessions and attendance.
+
+    Returns (sessions, student_data) where student_data is a list of
+    {"student": user, "attendance": {session_id: "Present"|"Absent"|"N/A"}}.
+    """
+    roster = Enrollment.objects.filter(subject=subject)
+    students = [
+        enrollment.student
+        for enrollment in roster.select_related("student").order_by("id")
+    ]
+    if not students:
+        return [], []
+
+    roster_student_ids = roster.values("student_id")
+
+    # Every subject taken by anyone on the roster, grouped per student.
+    subjects_by_student = defaultdict(set)
+    for student_id, subject_id in Enrollment.objects.filter(
+        student_id__in=roster_student_ids
+    ).values_list("student_id", "subject_id"):
+        subjects_by_student[student_id].add(subject_id)
+
+    subject_ids = set().union(*subjects_by_student.values())
+    sessions = list(day_sessions(subject_ids, date))
+    if not sessions:
+        return [], [{"student": student, "attendance": {}} for student in students]
+
+    marked = {
+        (session_id, student_id): is_present
+        for session_id, student_id, is_present in roster_marks(
+            [session.id for session in sessions], roster_student_ids
+        )
+    }
+    return sessions, _grid_rows(students, subjects_by_student, sessions, marked)
+
+
+async def abuild_attendance_grid(subject, date):
+    """
+    Async build_attendance_grid. The four queries do not depend on each
+    other's results here: sessions and marks find the roster's subjects
+    through a subquery instead of the memberships result. So they are
+    issued together with asyncio.gather.
+    """
+    roster = Enrollment.objects.filter(subject=subject)
+    roster_student_ids = roster.values("student_id")
+    memberships = Enrollment.objects.filter(student_id__in=roster_student_ids)
+    roster_subject_ids = memberships.values("subject_id")
+    held = day_sessions(roster_subject_ids, date)
+
+    async def fetch(queryset):
+        return [row async for row in queryset]
+
+    enrollments, membership_rows, sessions, marks = await asyncio.gather(
+        fetch(roster.select_related("student").order_by("id")),
+        fetch(memberships.values_list("student_id", "subject_id")),
+        fetch(held),
+        fetch(roster_marks(held, roster_student_ids)),
+    )
+    students = [enrollment.student for enrollment in enrollments]
+    if not students:
+        return [], []
+    if not sessions:
+        return [], [{"student": student, "attendance": {}} for student in students]
+
+    subjects_by_student = defaultdict(set)
+    for student_id, subject_id in membership_rows:
+        subjects_by_student[student_id].add(subject_id)
+    marked = {
+        (session_id, student_id): is_present
+        for session_id, student_id, is_present in marks
+    }
+    return sessions, _grid_rows(students, subjects_by_student, sessions, marked)
+
+
+def _grid_rows(students, subjects_by_student, sessions, marked):
+    student_data = []
+    for student in students:
+        enrolled = subjects_by_student[student.id]
+        attendance_map = {}
+        for session in sessions:
+            if session.subject_id not in enrolled:
+                attendance_map[session.id] = NOT_APPLICABLE
+            elif marked.get((session.id, student.id)):
+                attendance_map[session.id] = PRESENT
+            else:
+                # A session row only exists once attendance has been taken,
+                # so a missing mark means the student was not ticked.
+                attendance_map[session.id] = ABSENT
+        student_data.append({"student": student, "attendance": attendance_map})
+    return student_data
+
+
+def save_attendance(session, present_ids):
+    """
+    Record attendance for the whole roster of `session.subject` at once.
+
+    Every enrolled student gets a row: present if their id is in
+    `present_ids`, absent otherwise. Rows are written with a single
+    upsert on the (session, student) unique key inside one transaction,
+    so a roster costs a fixed number of statements rather than a
+    read-and-write per student. The matching AttendanceSummary rows are
+    adjusted in the same transaction.
+
+    The session row is locked before the existing marks are read, so two
+    saves of the same session run one after the other and the second sees
+    the first's marks instead of counting them again.
+
+    Returns (created, updated) row counts.
+    """
+    present_ids = set(present_ids)
+    with transaction.atomic():
+        ClassSession.objects.select_for_update().get(pk=session.pk)
+        roster_ids = list(
+            Enrollment.objects.filter(subject_id=session.subject_id).values_list(
+                "student_id", flat=True
+            )
+        )
+        if not roster_ids:
+            return 0, 0
+
+        previous = dict(
+            Attendance.objects.filter(session=session).values_list(
+                "student_id", "is_present"
+            )
+        )
+        Attendance.objects.bulk_create(
+            [
+                Attendance(
+                    session=session,
+                    student_id=student_id,
+                    is_present=student_id in present_ids,
+                )
+                for student_id in roster_ids
+            ],
+            batch_size=ATTENDANCE_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["session", "student"],
+            update_fields=["is_present"],
+        )
+        _update_summaries(session, roster_ids, present_ids, previous)
+
+    updated = len(previous.keys() & set(roster_ids))
+    return len(roster_ids) - updated, updated
+
+
+def _update_summaries(session, roster_ids, present_ids, previous):
+    """Apply one session's attendance changes to the per-student summaries."""
+    totals = {
+        student_id: (held, present, last_date)
+        for student_id, held, present, last_date in (
+            AttendanceSummary.objects.select_for_update()
+            .filter(subject_id=session.subject_id, student_id__in=roster_ids)
+            .values_list(
+                "student_id", "sessions_held", "sessions_present", "last_session_date"
+            )
+        )
+    }
+    changed = []
+    for student_id in roster_ids:
+        held, present, last_date = totals.get(student_id, (0, 0, None))
+        is_present = student_id in present_ids
+        if student_id in previous:
+            if previous[student_id] == is_present:
+                continue
+            present += 1 if is_present else -1
+        else:
+            held += 1
+            present += int(is_present)
+            if last_date is None or last_date < session.date:
+                last_date = session.date
+        # Always build unsaved instances so the upsert is a single statement.
+        changed.append(
+            AttendanceSummary(
+                student_id=student_id,
+                subject_id=session.subject_id,
+                sessions_held=held,
+                sessions_present=present,
+                last_session_date=last_date,
+            )
+        )
+
+    AttendanceSummary.objects.bulk_create(
+        changed,
+        batch_size=ATTENDANCE_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=["student", "subject"],
+        update_fields=["sessions_held", "sessions_present", "last_session_date"],
+    )
+
+
+def rebuild_attendance_summaries(subject_ids=None):
+    """
+    Recompute AttendanceSummary from scratch out of the Attendance table.
+
+    Restricted to `subject_ids` when given. Aggregates are streamed and
+    written in batches so memory stays bounded on a full term. Returns the
+    number of summary rows written.
+    """
+    attendance = Attendance.objects.all()
+    summaries = AttendanceSummary.objects.all()
+    if subject_ids is not None:
+        attendance = attendance.filter(session__subject_id__in=subject_ids)
+        summaries = summaries.filter(subject_id__in=subject_ids)
+
+    totals = (
+        attendance.values("student_id", "session__subject_id")
+        .annotate(
+            held=Count("id"),
+            present=Count("id", filter=Q(is_present=True)),
+            last_date=Max("session__date"),
+        )
+        .order_by()
+    )
+
+    written = 0
+    batch = []
+    with transaction.atomic():
+        summaries.delete()
+        for row in totals.iterator(chunk_size=ATTENDANCE_BATCH_SIZE):
+            batch.append(
+                AttendanceSummary(
+                    student_id=row["student_id"],
+                    subject_id=row["session__subject_id"],
+                    sessions_held=row["held"],
+                    sessions_present=row["present"],
+                    last_session_date=row["last_date"],
+                )
+            )
+            if len(batch) >= ATTENDANCE_BATCH_SIZE:
+                AttendanceSummary.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        AttendanceSummary.objects.bulk_create(batch)
+        written += len(batch)
+    return written
@@ -0,0 +1,185 @@
+"""
+Repeatable view benchmarks over generated data.
+
+run_benchmark() drives the key views through the Django test client as the
+users created by teacher.synthetic.generate_institution. It records each
+view's query count and latency percentiles. Everything runs inside a
+transaction that is rolled back, so mark_attendance POSTs leave the data
+set unchanged between runs.
+"""
+
+import datetime
+import platform
+import statistics
+import time
+
+import django
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import (
+    CaptureQueriesContext,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.urls import reverse
+
+from classcheck.stats import percentile
+from student.models import Enrollment
+from user.models import User
+
+from .models import ClassSchedule, Subject
+
+VIEWS = [
+    "teacher_dashboard",
+    "class_details",
+    "mark_attendance",
+    "manage_structure",
+    "superuser_dashboard",
+    "student_dashboard",
+]
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+def targets(prefix):
+    """(name, user, method, url, data) for each benchmarked view."""
+    admin = User.objects.filter(email=f"{prefix}-admin@example.com").first()
+    if admin is None:
+        raise BenchmarkError(
+            f"No data with prefix '{prefix}'; run generate_institution first."
+        )
+
+    # mark_attendance needs a subject that meets today.
+    today = datetime.date.today().strftime("%a")
+    schedule = (
+        ClassSchedule.objects.filter(
+            subject__teacher__email__startswith=f"{prefix}-", day_of_week=today
+        )
+        .select_related("subject__teacher")
+        .order_by("pk")
+        .first()
+    )
+    if schedule is None:
+        raise BenchmarkError(f"No generated subject meets on {today}.")
+    subject = schedule.subject
+    teacher = subject.teacher
+    enrolled = list(
+        Enrollment.objects.filter(subject=subject).values_list("student_id", flat=True)
+    )
+    student = User.objects.get(pk=enrolled[0])
+    present = {f"student_{pk}": "on" for pk in enrolled[::2]}
+
+    return [
+        ("teacher_dashboard", teacher, "get", reverse("teacher_dashboard"), None),
+        (
+            "class_details",
+            teacher,
+            "get",
+            reverse("class_details", args=[subject.pk]),
+            None,
+        ),
+        (
+            "mark_attendance",
+            teacher,
+            "post",
+            reverse("mark_attendance", args=[subject.pk]),
+            present,
+        ),
+        ("manage_structure", admin, "get", reverse("manage_structure"), None),
+        ("superuser_dashboard", admin, "get", reverse("superuser_dashboard"), None),
+        ("student_dashboard", student, "get", reverse("student_dashboard"), None),
+    ]
+
+
+def _measure(client, method, url, data, iterations):
+    timings = []
+    queries = []
+    for _ in range(iterations):
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            response = getattr(client, method)(url, data)
+            timings.append((time.perf_counter() - started) * 1000)
+        queries.append(len(ctx.captured_queries))
+        if response.status_code >= 400:
+            raise BenchmarkError(
+                f"{method.upper()} {url} returned {response.status_code}"
+            )
+    return {
+        "status": response.status_code,
+        "queries": max(queries),
+        "mean_ms": round(statistics.fmean(timings), 2),
+        "p50_ms": round(percentile(timings, 50), 2),
+        "p95_ms": round(percentile(timings, 95), 2),
+        "max_ms": round(max(timings), 2),
+    }
+
+
+def run_benchmark(prefix="synth", iterations=20, warmup=2, views=None):
+    """
+    Time each view `iterations` times after `warmup` untimed requests and
+    return a JSON-serialisable result dict.
+    """
+    try:
+        setup_test_environment()
+        own_environment = True
+    except RuntimeError:
+        # Already inside a test run.
+        own_environment = False
+
+    results = {}
+    try:
+        with transaction.atomic():
+            for name, user, method, url, data in targets(prefix):
+                if views and name not in views:
+                    continue
+                client = Client()
+                client.force_login(user)
+                if warmup:
+                    _measure(client, method, url, data, warmup)
+                results[name] = _measure(client, method, url, data, iterations)
+            transaction.set_rollback(True)
+    finally:
+        if own_environment:
+            teardown_test_environment()
+
+    return {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "prefix": prefix,
+            "iterations": iterations,
+            "database": connection.vendor,
+            "django": django.get_version(),
+            "python": platform.python_version(),
+            "subjects": Subject.objects.filter(
+                teacher__email__startswith=f"{prefix}-"
+            ).count(),
+        },
+        "views": results,
+    }
+
+
+def compare(baseline, current):
+    """Per-view change in p95 latency and query count against a baseline result."""
+    rows = []
+    for name, now in current["views"].items():
+        before = baseline.get("views", {}).get(name)
+        if before is None:
+            continue
+        rows.append(
+            {
+                "name": name,
+                "p95_ms": now["p95_ms"],
+                "p95_change": (
+                    round(
+                        100 * (now["p95_ms"] - before["p95_ms"]) / before["p95_ms"], 1
+                    )
+                    if before["p95_ms"]
+                    else None
+                ),
+                "queries": now["queries"],
+                "queries_change": now["queries"] - before["queries"],
+            }
+        )
+    return rows
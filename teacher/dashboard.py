@@ -0,0 +1,63 @@
+from django.template.loader import render_to_string
+
+from classcheck.caching import bump, cached, namespace_version
+
+from .models import Subject
+
+DASHBOARD_NAMESPACE = "teacher_dashboard:{}"
+DASHBOARD_FRAGMENT_TTL = 60 * 60  # seconds
+
+
+def dashboard_namespace(teacher_id):
+    """Cache namespace of one teacher's rendered class list."""
+    return DASHBOARD_NAMESPACE.format(teacher_id)
+
+
+def dashboard_version(teacher_id):
+    return namespace_version(dashboard_namespace(teacher_id))
+
+
+def teacher_dashboard_subjects(teacher):
+    """The teacher's subjects whose whole chain up to the session is active."""
+    return (
+        Subject.objects.filter(
+            teacher=teacher,
+            is_active=True,
+            student_class__is_active=True,
+            student_class__department__is_active=True,
+            student_class__department__session__is_active=True,
+        )
+        .select_related("student_class", "student_class__department")
+        .order_by("student_class__department__name", "student_class__name", "name")
+    )
+
+
+def render_class_list(teacher):
+    """
+    The teacher's active subjects grouped by department and class, rendered
+    to HTML. Served from the shared cache until a structure change bumps
+    the teacher's namespace.
+    """
+
+    def render():
+        classes = teacher_dashboard_subjects(teacher)
+        return render_to_string("teacher/_dashboard_classes.html", {"classes": classes})
+
+    return cached(
+        dashboard_namespace(teacher.pk), ["classes"], render, DASHBOARD_FRAGMENT_TTL
+    )
+
+
+def invalidate_teacher_dashboards(teacher_ids):
+    """
+    Bump the dashboard namespace of each teacher whose class list changed.
+    Fragments cached under older versions are never read again and expire
+    on their own.
+    """
+    bump(
+        *(
+            dashboard_namespace(teacher_id)
+            for teacher_id in set(teacher_ids)
+            if teacher_id is not None
+        )
+    )
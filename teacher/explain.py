@@ -0,0 +1,127 @@
+"""
+Query plans for the lookups the busiest views run.
+
+hot_queries() rebuilds each lookup as the views issue it, for one sample
+teacher, student and subject. explain_hot_queries() runs EXPLAIN on every
+one of them, so index use can be checked on SQLite and PostgreSQL after a
+migration or a change to a view's filters.
+"""
+
+import datetime
+
+from django.db import connection
+from django.utils import timezone
+
+from student.models import Enrollment
+from student.views import attendance_timeline
+from user.invitations import existing_invitations
+from user.mail import due_mail
+from user.models import User
+
+from .attendance import day_sessions, roster_marks
+from .dashboard import teacher_dashboard_subjects
+from .models import Attendance, AttendanceSummary, Subject
+from .structure import (
+    live_classes,
+    live_departments,
+    live_subjects,
+    unclaimed_subjects,
+)
+from .timetable import find_conflicts
+
+
+def _sample():
+    """A subject with a teacher and a student, or placeholder ids on an empty database."""
+    subject = (
+        Subject.objects.filter(teacher__isnull=False, enrollments__isnull=False)
+        .select_related("student_class__department")
+        .order_by("pk")
+        .first()
+    )
+    if subject is None:
+        return {
+            "teacher_id": 0,
+            "teacher_email": "teacher@example.com",
+            "student_id": 0,
+            "subject_id": 0,
+            "class_id": 0,
+            "department_id": 0,
+            "session_id": 0,
+        }
+    return {
+        "teacher_id": subject.teacher_id,
+        "teacher_email": subject.teacher_email or "teacher@example.com",
+        "student_id": subject.enrollments.values_list("student_id", flat=True)[0],
+        "subject_id": subject.pk,
+        "class_id": subject.student_class_id,
+        "department_id": subject.student_class.department_id,
+        "session_id": subject.student_class.department.session_id,
+    }
+
+
+def hot_queries():
+    """
+    (name, queryset) for each hot lookup, filtered on sample ids.
+
+    The querysets come from the same builders the views call, so a change
+    to a view's filters shows up here. student_history and
+    attendance_summary have no builder of their own; they probe the
+    student and summary indexes directly.
+    """
+    ids = _sample()
+    today = datetime.date.today()
+    teacher = User(pk=ids["teacher_id"])
+    student = User(pk=ids["student_id"])
+    roster = Enrollment.objects.filter(subject_id=ids["subject_id"])
+    sessions = day_sessions([ids["subject_id"]], today)
+
+    return [
+        ("teacher_dashboard", teacher_dashboard_subjects(teacher)),
+        ("register_pending_subjects", unclaimed_subjects(ids["teacher_email"])),
+        ("manage_structure_departments", live_departments(ids["session_id"])),
+        ("department_classes", live_classes(ids["department_id"])),
+        ("class_subjects", live_subjects(ids["class_id"])),
+        (
+            "schedule_conflicts",
+            find_conflicts(ids["teacher_email"], ["Mon", "Wed"], "10:00"),
+        ),
+        ("roster", roster.values_list("student_id", flat=True)),
+        ("attendance_grid_sessions", sessions),
+        (
+            "attendance_grid_marks",
+            roster_marks(sessions, roster.values("student_id")),
+        ),
+        (
+            "student_timeline",
+            attendance_timeline(student, today - datetime.timedelta(days=6), today),
+        ),
+        (
+            "student_history",
+            Attendance.objects.filter(student_id=ids["student_id"]).values_list(
+                "session_id", "is_present"
+            ),
+        ),
+        (
+            "attendance_summary",
+            AttendanceSummary.objects.filter(subject_id=ids["subject_id"]),
+        ),
+        (
+            "invitations",
+            existing_invitations(["a@example.com", "b@example.com"]),
+        ),
+        ("outbox_due", due_mail(timezone.now())),
+    ]
+
+
+def explain_hot_queries(names=None, analyze=False):
+    """
+    [(name, sql, plan)] for each hot query. `analyze` runs the query for
+    real timings and is only passed through on PostgreSQL.
+    """
+    options = {"analyze": True} if analyze and connection.vendor == "postgresql" else {}
+    results = []
+    for name, queryset in hot_queries():
+        if names and name not in names:
+            continue
+        results.append((name, str(queryset.query), queryset.explain(**options)))
+    return results
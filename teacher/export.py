@@ -0,0 +1,112 @@
+import csv
+
+from .models import Attendance, ClassSession
+
+EXPORT_CHUNK_SIZE = 2000
+
+# URL scope -> lookup from ClassSession to the scoped object.
+SCOPES = {
+    "subject": "subject_id",
+    "class": "subject__student_class_id",
+    "department": "subject__student_class__department_id",
+    "session": "subject__student_class__department__session_id",
+}
+
+
+class Echo:
+    """File-like object whose write() hands the line back to csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def scoped_sessions(scope, pk, start=None, end=None):
+    sessions = ClassSession.objects.filter(**{SCOPES[scope]: pk})
+    if start:
+        sessions = sessions.filter(date__gte=start)
+    if end:
+        sessions = sessions.filter(date__lte=end)
+    return sessions
+
+
+def long_rows(sessions):
+    """
+    One CSV row per attendance mark, streamed session by session.
+
+    Ordered by (session_id, student_id), the Attendance unique key, so the
+    database walks the index instead of sorting every mark before the
+    first row; sessions are numbered as they are held, which keeps the
+    rows in date order in practice.
+    """
+    yield ["date", "department", "class", "subject", "student", "status"]
+    marks = (
+        Attendance.objects.filter(session__in=sessions)
+        .order_by("session_id", "student_id")
+        .values_list(
+            "session__date",
+            "session__subject__student_class__department__name",
+            "session__subject__student_class__name",
+            "session__subject__name",
+            "student__email",
+            "is_present",
+        )
+    )
+    for date, department, class_name, subject, email, is_present in marks.iterator(
+        chunk_size=EXPORT_CHUNK_SIZE
+    ):
+        yield [
+            date.isoformat(),
+            department,
+            class_name,
+            subject,
+            email,
+            "Present" if is_present else "Absent",
+        ]
+
+
+def matrix_rows(sessions):
+    """
+    One CSV row per student with a column per session.
+
+    Only the session header is held in memory; marks are streamed ordered
+    by student_id, which the database reads off the student index instead
+    of sorting by email, so each row is written as soon as the next student
+    starts. Students therefore appear in registration order. Cells are P, A or empty when the student has no mark for that session.
+    Marks of sessions created after the header was read are skipped, along
+    with students who only have such marks.
+    """
+    columns = list(
+        sessions.order_by("date", "schedule__start_time", "id").values_list(
+            "id", "date", "subject__name"
+        )
+    )
+    position = {session_id: i for i, (session_id, _, _) in enumerate(columns)}
+    yield ["student"] + [f"{date.isoformat()} {name}" for _, date, name in columns]
+
+    marks = (
+        Attendance.objects.filter(session__in=sessions)
+        .order_by("student_id")
+        .values_list("student_id", "student__email", "session_id", "is_present")
+    )
+    current = None
+    row = None
+    for student_id, email, session_id, is_present in marks.iterator(
+        chunk_size=EXPORT_CHUNK_SIZE
+    ):
+        column = position.get(session_id)
+        if column is None:
+            continue
+        if student_id != current:
+            if row is not None:
+                yield row
+            current = student_id
+            row = [email] + [""] * len(columns)
+        row[column + 1] = "P" if is_present else "A"
+    if row is not None:
+        yield row
+
+
+def csv_lines(rows):
+    writer = csv.writer(Echo())
+    for row in rows:
+        yield writer.writerow(row)
@@ -3,3 +3,10 @@ from user.models import Invitation
 
 class InviteStudentForm(forms.Form):
     emails = forms.CharField(widget=forms.HiddenInput(), required=False)
+
+
+class RosterUploadForm(forms.Form):
+    file = forms.FileField(
+        help_text="CSV or XLSX with an 'email' column and optional "
+        "'first_name' and 'last_name' columns."
+    )
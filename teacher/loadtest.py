@@ -0,0 +1,182 @@
+"""
+In-process load test of the WSGI and ASGI request paths.
+
+run_load_test() sends GET requests for each async-capable view with a fixed
+number in flight at once, as the users created by
+teacher.synthetic.generate_institution:
+
+- wsgi: Django's WSGIHandler on a thread pool, like gunicorn's gthread
+  workers, routed through classcheck.urls (sync views).
+- asgi: ASGIHandler on one event loop, like a uvicorn worker, routed
+  through classcheck.urls_async (async views).
+
+Both run in this process against the configured database, so the numbers
+compare the two handler stacks and view variants rather than full network
+servers.
+"""
+
+import asyncio
+import io
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.test import Client
+from django.test.utils import (
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+
+from classcheck.stats import percentile
+
+from .benchmark import BenchmarkError, targets
+
+LOAD_TEST_VIEWS = ["teacher_dashboard", "class_details", "student_dashboard"]
+MODES = {"wsgi": "classcheck.urls", "asgi": "classcheck.urls_async"}
+HOST = "testserver"
+
+
+def _session_cookie(user):
+    client = Client()
+    client.force_login(user)
+    cookie = client.cookies[settings.SESSION_COOKIE_NAME]
+    return f"{settings.SESSION_COOKIE_NAME}={cookie.value}"
+
+
+def _wsgi_request(handler, path, query, cookie):
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "QUERY_STRING": query,
+        "SERVER_NAME": HOST,
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_HOST": HOST,
+        "HTTP_COOKIE": cookie,
+        "wsgi.input": io.BytesIO(),
+        "wsgi.errors": sys.stderr,
+        "wsgi.url_scheme": "http",
+    }
+    status = []
+    started = time.perf_counter()
+    response = handler(
+        environ, lambda line, headers, exc_info=None: status.append(line)
+    )
+    b"".join(response)
+    response.close()
+    return int(status[0].split()[0]), (time.perf_counter() - started) * 1000
+
+
+def _run_wsgi(path, query, cookie, requests, concurrency):
+    handler = WSGIHandler()
+    with ThreadPoolExecutor(concurrency) as pool:
+        started = time.perf_counter()
+        results = list(
+            pool.map(
+                lambda _: _wsgi_request(handler, path, query, cookie), range(requests)
+            )
+        )
+    return results, time.perf_counter() - started
+
+
+async def _asgi_request(handler, path, query, cookie):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"host", HOST.encode()), (b"cookie", cookie.encode())],
+        "client": ("127.0.0.1", 0),
+        "server": (HOST, 80),
+    }
+    body_sent = False
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # The client never disconnects; Django cancels this wait when done.
+        await asyncio.Event().wait()
+
+    status = []
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    started = time.perf_counter()
+    await handler(scope, receive, send)
+    return status[0], (time.perf_counter() - started) * 1000
+
+
+async def _run_asgi(path, query, cookie, requests, concurrency):
+    handler = ASGIHandler()
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with slots:
+            return await _asgi_request(handler, path, query, cookie)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(one() for _ in range(requests)))
+    return results, time.perf_counter() - started
+
+
+def _summary(results, elapsed):
+    timings = [ms for _, ms in results]
+    return {
+        "requests": len(results),
+        "errors": sum(1 for status, _ in results if status >= 400),
+        "rps": round(len(results) / elapsed, 1),
+        "p50_ms": round(percentile(timings, 50), 2),
+        "p95_ms": round(percentile(timings, 95), 2),
+        "max_ms": round(max(timings), 2),
+    }
+
+
+def run_load_test(
+    prefix="synth", requests=200, concurrency=20, views=None, modes=("wsgi", "asgi")
+):
+    """{view: {mode: summary}} for each view in LOAD_TEST_VIEWS (or `views`)."""
+    try:
+        setup_test_environment()
+        own_environment = True
+    except RuntimeError:
+        # Already inside a test run.
+        own_environment = False
+
+    results = {}
+    try:
+        for name, user, method, url, data in targets(prefix):
+            if name not in LOAD_TEST_VIEWS or (views and name not in views):
+                continue
+            path, _, query = url.partition("?")
+            query = query or urlencode(data or {})
+            cookie = _session_cookie(user)
+            results[name] = {}
+            for mode in modes:
+                with override_settings(ROOT_URLCONF=MODES[mode]):
+                    if mode == "wsgi":
+                        run = _run_wsgi(path, query, cookie, requests, concurrency)
+                    else:
+                        run = asyncio.run(
+                            _run_asgi(path, query, cookie, requests, concurrency)
+                        )
+                results[name][mode] = _summary(*run)
+                if results[name][mode]["errors"] == requests:
+                    raise BenchmarkError(f"Every {mode} request to {url} failed.")
+    finally:
+        if own_environment:
+            teardown_test_environment()
+    return results
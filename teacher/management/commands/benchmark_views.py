@@ -0,0 +1,64 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from teacher.benchmark import VIEWS, BenchmarkError, compare, run_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the key views against generate_institution data and write query "
+        "counts and latency percentiles to JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--prefix", default="synth")
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument(
+            "--view",
+            action="append",
+            choices=VIEWS,
+            dest="views",
+            help="Only benchmark this view (repeatable).",
+        )
+        parser.add_argument("--output", help="Write the results to this JSON file.")
+        parser.add_argument(
+            "--compare", help="Baseline JSON file from an earlier run to diff against."
+        )
+
+    def handle(self, *args, **options):
+        try:
+            result = run_benchmark(
+                prefix=options["prefix"],
+                iterations=options["iterations"],
+                warmup=options["warmup"],
+                views=options["views"],
+            )
+        except BenchmarkError as e:
+            raise CommandError(str(e))
+
+        for name, row in result["views"].items():
+            self.stdout.write(
+                f"{name:<22} {row['queries']:>4} queries  "
+                f"p50 {row['p50_ms']:>8.1f} ms  p95 {row['p95_ms']:>8.1f} ms"
+            )
+
+        if options["compare"]:
+            with open(options["compare"]) as f:
+                baseline = json.load(f)
+            self.stdout.write("\nAgainst baseline:")
+            for row in compare(baseline, result):
+                change = (
+                    f"{row['p95_change']:+.1f}%"
+                    if row["p95_change"] is not None
+                    else "n/a"
+                )
+                self.stdout.write(
+                    f"{row['name']:<22} p95 {change:>8}  queries {row['queries_change']:+d}"
+                )
+
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(result, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}."))
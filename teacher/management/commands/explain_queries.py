@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from teacher.explain import explain_hot_queries, hot_queries
+
+
+class Command(BaseCommand):
+    help = "Print the query plan of each hot view query, to check index use."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--query",
+            action="append",
+            help="Only explain this query (repeatable).",
+        )
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="Run the queries for actual timings (PostgreSQL only).",
+        )
+        parser.add_argument(
+            "--sql", action="store_true", help="Also print each query's SQL."
+        )
+
+    def handle(self, *args, **options):
+        names = options["query"]
+        if names:
+            unknown = set(names) - {name for name, _ in hot_queries()}
+            if unknown:
+                raise CommandError(f"Unknown query: {', '.join(sorted(unknown))}")
+
+        for name, sql, plan in explain_hot_queries(names, options["analyze"]):
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            if options["sql"]:
+                self.stdout.write(sql)
+            self.stdout.write(plan)
+            self.stdout.write("")
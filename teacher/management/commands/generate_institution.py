@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from teacher.models import AcademicSession
+from teacher.synthetic import generate_institution
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a synthetic institution (sessions, departments, classes, "
+        "subjects, students and a term of attendance) for benchmarking."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--prefix",
+            default="synth",
+            help="Tag for generated emails and session names (default: %(default)s).",
+        )
+        parser.add_argument("--sessions", type=int, default=1)
+        parser.add_argument("--departments", type=int, default=2)
+        parser.add_argument("--classes", type=int, default=3, help="Per department.")
+        parser.add_argument("--subjects", type=int, default=6, help="Per class.")
+        parser.add_argument("--students", type=int, default=30, help="Per class.")
+        parser.add_argument(
+            "--weeks", type=int, default=12, help="Length of the recorded term."
+        )
+        parser.add_argument("--attendance-rate", type=float, default=0.85)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        prefix = options["prefix"]
+        if AcademicSession.objects.filter(year_range__startswith=f"{prefix}-").exists():
+            raise CommandError(
+                f"Data with prefix '{prefix}' already exists; pick another --prefix."
+            )
+
+        started = time.perf_counter()
+        counts = generate_institution(
+            prefix=prefix,
+            sessions=options["sessions"],
+            departments=options["departments"],
+            classes=options["classes"],
+            subjects=options["subjects"],
+            students=options["students"],
+            weeks=options["weeks"],
+            attendance_rate=options["attendance_rate"],
+            seed=options["seed"],
+            progress=self.stdout.write,
+        )
+        elapsed = time.perf_counter() - started
+        summary = ", ".join(f"{count} {name}" for name, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Generated {summary} in {elapsed:.1f}s."))
@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from teacher.models import Subject
+from teacher.roster import RosterImportError, import_roster, read_roster
+
+
+class Command(BaseCommand):
+    help = "Invite or enroll students into a subject from a CSV or XLSX roster."
+
+    def add_arguments(self, parser):
+        parser.add_argument("subject_id", type=int)
+        parser.add_argument("path", help="Path to a .csv or .xlsx file.")
+        parser.add_argument(
+            "--base-url",
+            help="Site URL (e.g. https://classcheck.example.com) used to build "
+            "registration links. Invitation emails are only queued when set.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            subject = Subject.objects.get(id=options["subject_id"])
+        except Subject.DoesNotExist:
+            raise CommandError(f"Subject {options['subject_id']} does not exist.")
+
+        link_builder = None
+        if options["base_url"]:
+            base_url = options["base_url"].rstrip("/")
+
+            def link_builder(token):
+                return f"{base_url}/register/{token}/"
+
+        def progress(report):
+            self.stdout.write(
+                f"{report.rows} rows: {report.invited} invited, "
+                f"{report.enrolled} enrolled, {report.error_count} errors"
+            )
+
+        try:
+            with open(options["path"], "rb") as fileobj:
+                report = import_roster(
+                    subject,
+                    read_roster(fileobj, options["path"]),
+                    link_builder=link_builder,
+                    progress=progress,
+                )
+        except (OSError, RosterImportError) as e:
+            raise CommandError(str(e))
+
+        for error in report.errors:
+            self.stderr.write(
+                f"line {error['line']} ({error['email']}): {error['reason']}"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {report.invited + report.enrolled} of {report.rows} rows."
+            )
+        )
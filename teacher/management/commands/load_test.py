@@ -0,0 +1,64 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from teacher.benchmark import BenchmarkError
+from teacher.loadtest import LOAD_TEST_VIEWS, MODES, run_load_test
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive the async-capable views concurrently through the WSGI handler "
+        "(sync views on a thread pool) and the ASGI handler (async views on an "
+        "event loop) and compare throughput and latency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--prefix", default="synth")
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=20,
+            help="Requests in flight at once (WSGI threads / ASGI tasks).",
+        )
+        parser.add_argument(
+            "--view",
+            action="append",
+            choices=LOAD_TEST_VIEWS,
+            dest="views",
+            help="Only load test this view (repeatable).",
+        )
+        parser.add_argument(
+            "--mode",
+            action="append",
+            choices=list(MODES),
+            dest="modes",
+            help="Only run this handler (repeatable).",
+        )
+        parser.add_argument("--output", help="Write the results to this JSON file.")
+
+    def handle(self, *args, **options):
+        try:
+            result = run_load_test(
+                prefix=options["prefix"],
+                requests=options["requests"],
+                concurrency=options["concurrency"],
+                views=options["views"],
+                modes=options["modes"] or list(MODES),
+            )
+        except BenchmarkError as e:
+            raise CommandError(str(e))
+
+        for name, modes in result.items():
+            for mode, row in modes.items():
+                self.stdout.write(
+                    f"{name:<18} {mode:<5} {row['rps']:>8.1f} req/s  "
+                    f"p50 {row['p50_ms']:>8.1f} ms  p95 {row['p95_ms']:>8.1f} ms  "
+                    f"errors {row['errors']}"
+                )
+
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(result, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}."))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from teacher.attendance import rebuild_attendance_summaries
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-student attendance summary table from Attendance rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--subject",
+            type=int,
+            action="append",
+            dest="subject_ids",
+            help="Only rebuild summaries for this subject id (repeatable).",
+        )
+
+    def handle(self, *args, **options):
+        written = rebuild_attendance_summaries(options["subject_ids"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} summary rows."))
@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand
+
+from teacher.alerts import (
+    ALERT_MIN_SESSIONS,
+    ATTENDANCE_THRESHOLD,
+    send_attendance_alerts,
+)
+from user.mail import BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = (
+        "Email students who fell below the attendance threshold, and their "
+        "teachers, based on the marks written since the previous run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threshold", type=int, default=ATTENDANCE_THRESHOLD)
+        parser.add_argument(
+            "--min-sessions",
+            type=int,
+            default=ALERT_MIN_SESSIONS,
+            help="Sessions a student must have had before a low rate alerts.",
+        )
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report what would be sent without sending, recording or moving "
+            "the checkpoint.",
+        )
+        parser.add_argument(
+            "--skip-backlog",
+            action="store_true",
+            help="Move the checkpoint to the newest mark and record students "
+            "already below the threshold without alerting them, e.g. before the "
+            "first run on an existing database.",
+        )
+
+    def handle(self, *args, **options):
+        result = send_attendance_alerts(
+            threshold=options["threshold"],
+            min_sessions=options["min_sessions"],
+            batch_size=options["batch_size"],
+            dry_run=options["dry_run"],
+            skip_backlog=options["skip_backlog"],
+        )
+        if result["to"] > result["from"]:
+            marks = f"Marks {result['from'] + 1}-{result['to']}"
+        else:
+            marks = "No new marks"
+        self.stdout.write(
+            f"{marks}: {result['pairs']} student/subject pairs re-checked, "
+            f"{result['alerts']} alerts, {result['messages']} digests."
+        )
+        if options["dry_run"]:
+            self.stdout.write("Dry run: nothing sent, checkpoint unchanged.")
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Done: {result['sent']} sent, {result['queued']} left in the outbox."
+                )
+            )
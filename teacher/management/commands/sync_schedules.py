@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from teacher.models import Subject
+from teacher.timetable import sync_schedules
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = "Rebuild ClassSchedule rows from every subject's days and timing."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help="Subjects synced per batch (default: %(default)s).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        subjects = Subject.objects.only("days", "timing", "teacher_email").order_by(
+            "pk"
+        )
+        synced = 0
+        last_pk = 0
+        while True:
+            batch = list(subjects.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            sync_schedules(batch)
+            synced += len(batch)
+            last_pk = batch[-1].pk
+        self.stdout.write(
+            self.style.SUCCESS(f"Synced schedules for {synced} subjects.")
+        )
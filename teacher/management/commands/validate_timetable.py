@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from teacher.models import AcademicSession
+from teacher.timetable import session_slots, validate_timetable
+
+
+class Command(BaseCommand):
+    help = "Report teachers booked for overlapping classes in an academic session."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--session",
+            help="Year range of the session to check (defaults to the active one).",
+        )
+
+    def handle(self, *args, **options):
+        sessions = AcademicSession.objects.all()
+        if options["session"]:
+            sessions = sessions.filter(year_range=options["session"])
+        else:
+            sessions = sessions.filter(is_active=True)
+        session = sessions.order_by("-created_at").first()
+        if session is None:
+            raise CommandError("No matching academic session.")
+
+        conflicts = validate_timetable(session_slots(session))
+        for conflict in conflicts:
+            self.stdout.write(str(conflict))
+        if conflicts:
+            raise CommandError(
+                f"{len(conflicts)} timetable conflicts in {session.year_range}."
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f"No timetable conflicts in {session.year_range}.")
+        )
@@ -0,0 +1,338 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AcademicSession",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("year_range", models.CharField(max_length=20, unique=True)),
+                ("is_active", models.BooleanField(default=False)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ClassSchedule",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "teacher_email",
+                    models.EmailField(blank=True, max_length=254, null=True),
+                ),
+                ("day_of_week", models.CharField(max_length=10)),
+                ("start_time", models.TimeField()),
+                ("end_time", models.TimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name="Department",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100)),
+                ("is_active", models.BooleanField(default=True)),
+                ("is_dead", models.BooleanField(default=False)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "session",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="departments",
+                        to="teacher.academicsession",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="StudentClass",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100)),
+                ("is_active", models.BooleanField(default=True)),
+                ("is_dead", models.BooleanField(default=False)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "department",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="classes",
+                        to="teacher.department",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="Subject",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100)),
+                ("is_active", models.BooleanField(default=True)),
+                ("is_dead", models.BooleanField(default=False)),
+                ("days", models.JSONField(default=list)),
+                ("timing", models.TimeField(blank=True, null=True)),
+                (
+                    "teacher_email",
+                    models.EmailField(blank=True, max_length=254, null=True),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "student_class",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="subjects",
+                        to="teacher.studentclass",
+                    ),
+                ),
+                (
+                    "teacher",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="subjects",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ClassSession",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "schedule",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to="teacher.classschedule",
+                    ),
+                ),
+                (
+                    "subject",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="sessions",
+                        to="teacher.subject",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="classschedule",
+            name="subject",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="schedules",
+                to="teacher.subject",
+            ),
+        ),
+        migrations.CreateModel(
+            name="AttendanceSummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("sessions_held", models.PositiveIntegerField(default=0)),
+                ("sessions_present", models.PositiveIntegerField(default=0)),
+                ("last_session_date", models.DateField(blank=True, null=True)),
+                (
+                    "student",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="attendance_summaries",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "subject",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="attendance_summaries",
+                        to="teacher.subject",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="Attendance",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("is_present", models.BooleanField(default=False)),
+                (
+                    "student",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="attendances",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "session",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="attendances",
+                        to="teacher.classsession",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["student", "session"], name="attendance_student_idx"
+                    )
+                ],
+                "unique_together": {("session", "student")},
+            },
+        ),
+        migrations.AddIndex(
+            model_name="department",
+            index=models.Index(
+                condition=models.Q(("is_dead", False)),
+                fields=["session", "name"],
+                name="department_live_idx",
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="department",
+            unique_together={("name", "session")},
+        ),
+        migrations.AddIndex(
+            model_name="studentclass",
+            index=models.Index(
+                condition=models.Q(("is_dead", False)),
+                fields=["department", "created_at"],
+                name="class_live_idx",
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="studentclass",
+            unique_together={("name", "department")},
+        ),
+        migrations.AddIndex(
+            model_name="subject",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["teacher"],
+                name="subject_teacher_active_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="subject",
+            index=models.Index(
+                condition=models.Q(("teacher__isnull", True)),
+                fields=["teacher_email"],
+                name="subject_pending_teacher_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="subject",
+            index=models.Index(
+                condition=models.Q(("is_dead", False)),
+                fields=["student_class", "name"],
+                name="subject_live_idx",
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="subject",
+            unique_together={("name", "student_class")},
+        ),
+        migrations.AlterUniqueTogether(
+            name="classsession",
+            unique_together={("subject", "date", "schedule")},
+        ),
+        migrations.AddIndex(
+            model_name="classschedule",
+            index=models.Index(
+                fields=["teacher_email", "day_of_week", "start_time", "end_time"],
+                name="schedule_teacher_slot_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="classschedule",
+            index=models.Index(
+                fields=["subject", "day_of_week", "end_time"],
+                name="schedule_subject_end_idx",
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="attendancesummary",
+            unique_together={("student", "subject")},
+        ),
+    ]
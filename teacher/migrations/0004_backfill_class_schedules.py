@@ -0,0 +1,51 @@
+import datetime
+
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+
+def backfill_class_schedules(apps, schema_editor):
+    """
+    Create the missing ClassSchedule rows of subjects saved before the
+    timetable was kept in sync, one per (subject, day), lasting an hour.
+    """
+    ClassSchedule = apps.get_model("teacher", "ClassSchedule")
+    Subject = apps.get_model("teacher", "Subject")
+
+    existing = set(ClassSchedule.objects.values_list("subject_id", "day_of_week"))
+    rows = []
+    subjects = Subject.objects.filter(timing__isnull=False).values_list(
+        "id", "days", "timing", "teacher_email"
+    )
+    for subject_id, days, start, teacher_email in subjects.iterator(
+        chunk_size=BATCH_SIZE
+    ):
+        end = datetime.datetime.combine(datetime.date.min, start) + datetime.timedelta(
+            hours=1
+        )
+        end = datetime.time.max if end.date() > datetime.date.min else end.time()
+        for day in dict.fromkeys(days or []):
+            if (subject_id, day) in existing:
+                continue
+            rows.append(
+                ClassSchedule(
+                    subject_id=subject_id,
+                    teacher_email=teacher_email,
+                    day_of_week=day,
+                    start_time=start,
+                    end_time=end,
+                )
+            )
+    ClassSchedule.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teacher', '0003_attendance_alert'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_class_schedules, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:04
+
+from django.db import migrations, models
+
+
+def mark_cascaded_rows(apps, schema_editor):
+    """
+    Before this field, restoring a parent brought back everything below it.
+    Keep that for rows that are inactive under an inactive parent, the ones
+    a cascade most likely switched off.
+    """
+    for model_name, parent in (
+        ("Department", "session"),
+        ("StudentClass", "department"),
+        ("Subject", "student_class"),
+    ):
+        apps.get_model("teacher", model_name).objects.filter(
+            is_active=False, **{f"{parent}__is_active": False}
+        ).update(deactivated_with_parent=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teacher', '0004_backfill_class_schedules'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='department',
+            name='deactivated_with_parent',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='studentclass',
+            name='deactivated_with_parent',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='subject',
+            name='deactivated_with_parent',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(mark_cascaded_rows, migrations.RunPython.noop),
+    ]
@@ -1,17 +1,64 @@
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
+
+
+def taken_serials(queryset, base, include_base=False):
+    """
+    Numeric suffixes already used by names of the form "{base}-{n}" in
+    `queryset`, fetched with a single query. With `include_base`, a bare
+    "{base}" counts as serial 0.
+    """
+    prefix = f"{base}-"
+    names = models.Q(name__startswith=prefix)
+    if include_base:
+        names |= models.Q(name=base)
+    taken = set()
+    for name in queryset.filter(names).values_list("name", flat=True):
+        if name == base:
+            taken.add(0)
+            continue
+        suffix = name[len(prefix) :]
+        if suffix.isdigit():
+            taken.add(int(suffix))
+    return taken
+
+
+def free_serials(taken, count):
+    """The `count` lowest positive integers not in `taken`."""
+    serials = []
+    n = 1
+    while len(serials) < count:
+        if n not in taken:
+            serials.append(n)
+        n += 1
+    return serials
 
 
 class ClassSchedule(models.Model):
     subject = models.ForeignKey(
         "Subject", on_delete=models.CASCADE, related_name="schedules"
     )
+    # Copied from the subject so teacher conflicts can be found from the
+    # index alone, without joining through Subject.
+    teacher_email = models.EmailField(null=True, blank=True)
     day_of_week = models.CharField(max_length=10)  # Mon, Tue, etc.
     start_time = models.TimeField()
     end_time = (
         models.TimeField()
     )  # Calculated based on duration (assuming 1 hour for now)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["teacher_email", "day_of_week", "start_time", "end_time"],
+                name="schedule_teacher_slot_idx",
+            ),
+            models.Index(
+                fields=["subject", "day_of_week", "end_time"],
+                name="schedule_subject_end_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.subject.name} on {self.day_of_week} at {self.start_time}"
 
@@ -34,21 +81,105 @@ class ClassSession(models.Model):
 
 
 class Attendance(models.Model):
+    # Both foreign keys lead a composite index below; separate single-column
+    # indexes would only slow down the bulk attendance upserts.
     session = models.ForeignKey(
-        ClassSession, on_delete=models.CASCADE, related_name="attendances"
+        ClassSession,
+        on_delete=models.CASCADE,
+        related_name="attendances",
+        db_index=False,
     )
     student = models.ForeignKey(
-        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="attendances"
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="attendances",
+        db_index=False,
     )
     is_present = models.BooleanField(default=False)
 
     class Meta:
         unique_together = ("session", "student")
+        indexes = [
+            # A student's own history; the unique key leads with session.
+            models.Index(fields=["student", "session"], name="attendance_student_idx"),
+        ]
 
     def __str__(self):
         return f"{self.student.email} - {self.session} - {'Present' if self.is_present else 'Absent'}"
 
 
+class AttendanceSummary(models.Model):
+    """
+    Running attendance totals for one student in one subject.
+
+    Maintained incrementally by teacher.attendance.save_attendance and
+    rebuilt from Attendance by the rebuild_attendance_summary command.
+    """
+
+    student = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="attendance_summaries",
+    )
+    subject = models.ForeignKey(
+        "Subject", on_delete=models.CASCADE, related_name="attendance_summaries"
+    )
+    sessions_held = models.PositiveIntegerField(default=0)
+    sessions_present = models.PositiveIntegerField(default=0)
+    last_session_date = models.DateField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ("student", "subject")
+
+    def __str__(self):
+        return f"{self.student.email} - {self.subject.name}: {self.sessions_present}/{self.sessions_held}"
+
+    @property
+    def percentage(self):
+        if not self.sessions_held:
+            return None
+        return round(100 * self.sessions_present / self.sessions_held, 1)
+
+
+class JobCheckpoint(models.Model):
+    """
+    High-water mark of an incremental batch job, so each run resumes where
+    the previous one stopped (see teacher.alerts).
+    """
+
+    name = models.CharField(max_length=100, unique=True)
+    position = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} @ {self.position}"
+
+
+class AttendanceAlert(models.Model):
+    """
+    A low-attendance alert already sent for one student in one subject.
+
+    Written by teacher.alerts when the pair drops below the threshold and
+    deleted when it recovers, so each drop alerts exactly once.
+    """
+
+    student = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="attendance_alerts",
+    )
+    subject = models.ForeignKey(
+        "Subject", on_delete=models.CASCADE, related_name="attendance_alerts"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("student", "subject")
+
+    def __str__(self):
+        return f"{self.student.email} - {self.subject.name}"
+
+
 class AcademicSession(models.Model):
     year_range = models.CharField(max_length=20, unique=True)  # e.g., "2025-2026"
     is_active = models.BooleanField(default=False)
@@ -64,11 +195,22 @@ class Department(models.Model):
         AcademicSession, on_delete=models.CASCADE, related_name="departments"
     )
     is_active = models.BooleanField(default=True)
+    # Switched off by a parent's deactivation rather than on its own; only
+    # these rows come back when the parent is restored.
+    deactivated_with_parent = models.BooleanField(default=False)
     is_dead = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         unique_together = ("name", "session")
+        indexes = [
+            # manage_structure: live departments of a session, by name.
+            models.Index(
+                fields=["session", "name"],
+                condition=models.Q(is_dead=False),
+                name="department_live_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.session})"
@@ -91,11 +233,22 @@ class StudentClass(
         Department, on_delete=models.CASCADE, related_name="classes"
     )
     is_active = models.BooleanField(default=True)
+    # Switched off by a parent's deactivation rather than on its own; only
+    # these rows come back when the parent is restored.
+    deactivated_with_parent = models.BooleanField(default=False)
     is_dead = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         unique_together = ("name", "department")
+        indexes = [
+            # department_classes: live classes of a department, oldest first.
+            models.Index(
+                fields=["department", "created_at"],
+                condition=models.Q(is_dead=False),
+                name="class_live_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.department.name}"
@@ -103,20 +256,28 @@ class StudentClass(
     def save(self, *args, **kwargs):
         # Strict naming: {department.name}-{serial}
         # We ignore provided name or overwrite it.
-        base_name = self.department.name.lower()
-        counter = 1
-        new_name = f"{base_name}-{counter}"
-
-        while (
-            StudentClass.objects.filter(name=new_name, department=self.department)
-            .exclude(pk=self.pk)
-            .exists()
-        ):
-            counter += 1
-            new_name = f"{base_name}-{counter}"
-
-        self.name = new_name
-        super().save(*args, **kwargs)
+        if not self._state.adding:
+            super().save(*args, **kwargs)
+            return
+
+        with transaction.atomic():
+            # Locking the department row serialises concurrent allocations.
+            base_name = (
+                Department.objects.select_for_update()
+                .values_list("name", flat=True)
+                .get(pk=self.department_id)
+                .lower()
+            )
+            taken = taken_serials(
+                StudentClass.objects.filter(department_id=self.department_id),
+                base_name,
+            )
+            self.name = f"{base_name}-{free_serials(taken, 1)[0]}"
+            super().save(*args, **kwargs)
+
+
+# Subject fields that ClassSchedule rows are derived from.
+SCHEDULE_FIELDS = {"days", "timing", "teacher_email"}
 
 
 class Subject(models.Model):
@@ -125,6 +286,9 @@ class Subject(models.Model):
         StudentClass, on_delete=models.CASCADE, related_name="subjects"
     )
     is_active = models.BooleanField(default=True)
+    # Switched off by a parent's deactivation rather than on its own; only
+    # these rows come back when the parent is restored.
+    deactivated_with_parent = models.BooleanField(default=False)
     is_dead = models.BooleanField(default=False)
     days = models.JSONField(default=list)
     timing = models.TimeField(null=True, blank=True)
@@ -140,6 +304,26 @@ class Subject(models.Model):
 
     class Meta:
         unique_together = ("name", "student_class")
+        indexes = [
+            # teacher_dashboard: a teacher's active subjects.
+            models.Index(
+                fields=["teacher"],
+                condition=models.Q(is_active=True),
+                name="subject_teacher_active_idx",
+            ),
+            # register: subjects waiting for a teacher with this email.
+            models.Index(
+                fields=["teacher_email"],
+                condition=models.Q(teacher__isnull=True),
+                name="subject_pending_teacher_idx",
+            ),
+            # class_subjects: live subjects of a class, by name.
+            models.Index(
+                fields=["student_class", "name"],
+                condition=models.Q(is_dead=False),
+                name="subject_live_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.student_class.name})"
@@ -148,15 +332,25 @@ class Subject(models.Model):
         if self.name:
             self.name = self.name.lower()
 
-        # Deduplication logic
-        original_name = self.name
-        counter = 1
-        while (
-            Subject.objects.filter(name=self.name, student_class=self.student_class)
-            .exclude(pk=self.pk)
-            .exists()
-        ):
-            self.name = f"{original_name}-{counter}"
-            counter += 1
-
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            # Deduplication: "name", then "name-1", "name-2", ... under a lock
+            # on the class row so concurrent admins cannot pick the same one.
+            StudentClass.objects.select_for_update().filter(
+                pk=self.student_class_id
+            ).first()
+            taken = taken_serials(
+                Subject.objects.filter(student_class_id=self.student_class_id).exclude(
+                    pk=self.pk
+                ),
+                self.name,
+                include_base=True,
+            )
+            if 0 in taken:
+                self.name = f"{self.name}-{free_serials(taken, 1)[0]}"
+            super().save(*args, **kwargs)
+
+            update_fields = kwargs.get("update_fields")
+            if update_fields is None or SCHEDULE_FIELDS.intersection(update_fields):
+                from .timetable import sync_schedules
+
+                sync_schedules([self])
@@ -0,0 +1,235 @@
+import csv
+from itertools import islice
+
+from django.contrib.auth.base_user import BaseUserManager
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+
+from student.models import Enrollment
+from user.invitations import create_invitations
+from user.mail import queue_mass_mail
+from user.models import User
+
+CHUNK_SIZE = 500
+NAME_MAX_LENGTH = 150
+# Errors kept on the report; the counters keep going past this.
+MAX_REPORTED_ERRORS = 1000
+
+
+class RosterImportError(Exception):
+    """The file as a whole cannot be imported (bad header, unknown format)."""
+
+
+class RosterReport:
+    def __init__(self):
+        self.rows = 0
+        self.invited = 0
+        self.enrolled = 0
+        self.error_count = 0
+        self.errors = []
+
+    def add_error(self, line, email, reason):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "email": email, "reason": reason})
+
+
+def invitation_email(subject, invite_link):
+    """Subject line and body inviting a student to `subject`."""
+    return (
+        f"Invitation to join {subject.name}",
+        f"Hi,\n\nYou have been invited to join the class '{subject.name}' on ClassCheck. Please click the link below to set your password and activate your account:\n\n{invite_link}\n\nThis link is valid for 72 hours.\n\nBest regards,\nClassCheck Team",
+    )
+
+
+def _header_index(header):
+    columns = [str(c or "").strip().lower() for c in header]
+    if "email" not in columns:
+        raise RosterImportError("The first row must contain an 'email' column.")
+    return {name: columns.index(name) for name in columns if name}
+
+
+def _records(rows):
+    """Turn raw rows (header first) into (line, email, first, last) tuples."""
+    rows = iter(rows)
+    try:
+        index = _header_index(next(rows))
+    except StopIteration:
+        raise RosterImportError("The file is empty.")
+
+    def cell(row, name):
+        position = index.get(name)
+        if position is None or position >= len(row) or row[position] is None:
+            return ""
+        return str(row[position]).strip()
+
+    for line, row in enumerate(rows, start=2):
+        if not any(str(value or "").strip() for value in row):
+            continue
+        yield (
+            line,
+            cell(row, "email"),
+            cell(row, "first_name"),
+            cell(row, "last_name"),
+        )
+
+
+def _csv_rows(fileobj):
+    # Iterating a file (or a Django UploadedFile) yields one line at a time,
+    # so the upload is decoded and parsed without being read into memory.
+    def lines():
+        for line in fileobj:
+            if isinstance(line, bytes):
+                try:
+                    line = line.decode("utf-8-sig")
+                except UnicodeDecodeError:
+                    raise RosterImportError("CSV files must be UTF-8 encoded.")
+            yield line
+
+    return csv.reader(lines())
+
+
+def _xlsx_rows(fileobj):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise RosterImportError("XLSX import requires the openpyxl package.")
+    workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def read_roster(fileobj, filename):
+    """Stream (line, email, first_name, last_name) records from a CSV or XLSX."""
+    name = filename.lower()
+    if name.endswith(".csv"):
+        return _records(_csv_rows(fileobj))
+    if name.endswith(".xlsx"):
+        return _records(_xlsx_rows(fileobj))
+    raise RosterImportError("Only .csv and .xlsx files are supported.")
+
+
+def _import_chunk(subject, chunk, report, link_builder):
+    emails = {email for _, email, _, _ in chunk}
+    accounts = dict(User.objects.filter(email__in=emails).values_list("email", "role"))
+    enrolled = set(
+        Enrollment.objects.filter(
+            subject=subject, student__email__in=emails
+        ).values_list("student__email", flat=True)
+    )
+
+    to_enroll = []
+    to_invite = []
+    lines = {}
+    names = {}
+    for line, email, first_name, last_name in chunk:
+        if email in enrolled:
+            report.add_error(line, email, "Already enrolled")
+        elif email in accounts:
+            if accounts[email] == User.Role.STUDENT:
+                to_enroll.append(email)
+            else:
+                report.add_error(line, email, "Not a student account")
+        else:
+            to_invite.append(email)
+            lines[email] = line
+            names[email] = (first_name, last_name)
+
+    with transaction.atomic():
+        if to_enroll:
+            student_ids = list(
+                User.objects.filter(email__in=to_enroll).values_list("id", flat=True)
+            )
+            enrollments = Enrollment.objects.filter(
+                subject=subject, student_id__in=student_ids
+            )
+            # A concurrent import may have enrolled some of them since the
+            # check above; the conflicting rows are skipped, so count the
+            # rows this insert actually added.
+            before = enrollments.count()
+            Enrollment.objects.bulk_create(
+                [
+                    Enrollment(student_id=student_id, subject=subject)
+                    for student_id in student_ids
+                ],
+                ignore_conflicts=True,
+            )
+            report.enrolled += enrollments.count() - before
+        invitations, failures = create_invitations(
+            to_invite, User.Role.STUDENT, class_id=subject.id, names=names
+        )
+        if link_builder:
+            queue_mass_mail(
+                (
+                    *invitation_email(subject, link_builder(invitation.token)),
+                    None,
+                    [invitation.email],
+                )
+                for invitation in invitations
+            )
+
+    report.invited += len(invitations)
+    for failure in failures:
+        reason = failure.get("detail", failure["reason"])
+        if reason == "Already invited to another class":
+            # Invitation emails are unique, so one pending invitation holds
+            # the address until the student registers.
+            reason += (
+                "; invitations are one class at a time, so import them again "
+                "once they have registered to enroll them here"
+            )
+        report.add_error(lines[failure["email"]], failure["email"], reason)
+
+
+def import_roster(subject, records, link_builder=None, progress=None):
+    """
+    Invite or enroll every student listed in `records` into `subject`.
+
+    `records` is any iterable of (line, email, first_name, last_name), usually
+    read_roster(). Rows are validated and written CHUNK_SIZE at a time, each
+    chunk in its own transaction, so memory stays bounded by the chunk and
+    the set of addresses already seen. Existing student accounts are enrolled
+    directly; new addresses get an Invitation tied to the subject and, when
+    `link_builder` maps a token to a registration URL, a queued email. An
+    address with a pending invitation to another subject is reported, not
+    re-invited: an invitation holds one class, and importing the roster
+    again after the student registers enrolls them.
+
+    `progress(report)` is called after every chunk. Returns a RosterReport.
+    """
+    report = RosterReport()
+    seen = set()
+    records = iter(records)
+
+    while True:
+        batch = list(islice(records, CHUNK_SIZE))
+        if not batch:
+            break
+
+        chunk = []
+        for line, email, first_name, last_name in batch:
+            report.rows += 1
+            email = BaseUserManager.normalize_email(email)
+            try:
+                validate_email(email)
+            except ValidationError:
+                report.add_error(line, email, "Invalid email")
+                continue
+            if len(first_name) > NAME_MAX_LENGTH or len(last_name) > NAME_MAX_LENGTH:
+                report.add_error(line, email, "Name is too long")
+                continue
+            if email in seen:
+                report.add_error(line, email, "Duplicate row")
+                continue
+            seen.add(email)
+            chunk.append((line, email, first_name, last_name))
+
+        if chunk:
+            _import_chunk(subject, chunk, report, link_builder)
+        if progress:
+            progress(report)
+
+    return report
@@ -0,0 +1,39 @@
+"""Scope access and date parsing shared by the export and report views."""
+
+import datetime
+
+from django.core.exceptions import PermissionDenied
+from django.http import Http404
+
+from .export import SCOPES
+from .models import AcademicSession, Department, StudentClass, Subject
+
+SCOPE_MODELS = {
+    "subject": Subject,
+    "class": StudentClass,
+    "department": Department,
+    "session": AcademicSession,
+}
+
+
+def parse_date(value):
+    """A YYYY-MM-DD query parameter as a date, or None when it is empty."""
+    if not value:
+        return None
+    try:
+        return datetime.datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise Http404("Dates must be YYYY-MM-DD.")
+
+
+def check_scope(user, scope, pk):
+    """Admins may read any scope; teachers only their own subjects."""
+    if scope not in SCOPES:
+        raise Http404("Unknown scope.")
+    if not user.is_admin():
+        if not (
+            user.is_teacher()
+            and scope == "subject"
+            and Subject.objects.filter(id=pk, teacher=user).exists()
+        ):
+            raise PermissionDenied
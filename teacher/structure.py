@@ -0,0 +1,157 @@
+from django.db import transaction
+from django.db.models import Count, Q
+
+from .models import (
+    AcademicSession,
+    Department,
+    StudentClass,
+    Subject,
+    free_serials,
+    taken_serials,
+)
+
+# For each root model, every level of the subtree below it (root included)
+# with the lookup that ties that level back to the root's id.
+SUBTREES = {
+    AcademicSession: [
+        (AcademicSession, "id"),
+        (Department, "session_id"),
+        (StudentClass, "department__session_id"),
+        (Subject, "student_class__department__session_id"),
+    ],
+    Department: [
+        (Department, "id"),
+        (StudentClass, "department_id"),
+        (Subject, "student_class__department_id"),
+    ],
+    StudentClass: [
+        (StudentClass, "id"),
+        (Subject, "student_class_id"),
+    ],
+    Subject: [
+        (Subject, "id"),
+    ],
+}
+
+
+# The field tying each level to the one above it.
+PARENTS = {
+    Department: "session",
+    StudentClass: "department",
+    Subject: "student_class",
+}
+
+
+def set_active(obj, is_active):
+    """
+    Deactivate or restore `obj` together with everything below it.
+
+    Deactivating marks the rows it switches off below `obj` as
+    deactivated_with_parent; rows that were already inactive keep their
+    own state. Restoring brings back `obj` and, level by level, only the
+    marked rows whose parent is active again, so a class deactivated on its
+    own stays inactive, with its subjects, when its department is restored.
+
+    Runs one UPDATE per level of the hierarchy inside a single transaction,
+    however many classes and subjects the subtree holds. Rows marked dead
+    are left alone on restore. Model save() is bypassed, so the naming
+    logic in StudentClass.save and Subject.save is not re-run.
+
+    Returns the number of rows changed.
+    """
+    changed = 0
+    with transaction.atomic():
+        for model, lookup in SUBTREES[type(obj)]:
+            rows = model.objects.filter(**{lookup: obj.pk})
+            values = {"is_active": is_active}
+            if model is not AcademicSession:
+                # The root changes on its own; everything below with it.
+                values["deactivated_with_parent"] = not is_active and model is not type(
+                    obj
+                )
+                if is_active:
+                    rows = rows.filter(is_dead=False)
+            if model is type(obj):
+                rows = rows.exclude(**values)
+            elif is_active:
+                rows = rows.filter(
+                    deactivated_with_parent=True,
+                    **{f"{PARENTS[model]}__is_active": True},
+                )
+            else:
+                rows = rows.filter(is_active=True)
+            changed += rows.update(**values)
+    obj.is_active = is_active
+    return changed
+
+
+def subtree_teacher_ids(obj):
+    """Ids of the teachers assigned to any subject in `obj`'s subtree."""
+    model, lookup = SUBTREES[type(obj)][-1]
+    return set(
+        model.objects.filter(**{lookup: obj.pk}, teacher__isnull=False)
+        .values_list("teacher_id", flat=True)
+        .distinct()
+    )
+
+
+def create_classes(department, count):
+    """
+    Create `count` classes in `department`, named with the lowest free
+    "{department}-{n}" serials, in a fixed number of queries.
+
+    Takes the same department row lock as StudentClass.save, so it is safe
+    to run alongside single creates. Returns the new classes.
+    """
+    with transaction.atomic():
+        base_name = (
+            Department.objects.select_for_update()
+            .values_list("name", flat=True)
+            .get(pk=department.pk)
+            .lower()
+        )
+        taken = taken_serials(
+            StudentClass.objects.filter(department=department), base_name
+        )
+        return StudentClass.objects.bulk_create(
+            StudentClass(name=f"{base_name}-{n}", department=department)
+            for n in free_serials(taken, count)
+        )
+
+
+def live_departments(session_id):
+    """A session's departments with their live class and subject counts."""
+    return (
+        Department.objects.filter(session_id=session_id, is_dead=False)
+        .annotate(
+            class_count=Count(
+                "classes", filter=Q(classes__is_dead=False), distinct=True
+            ),
+            subject_count=Count(
+                "classes__subjects",
+                filter=Q(classes__is_dead=False, classes__subjects__is_dead=False),
+                distinct=True,
+            ),
+        )
+        .order_by("name")
+    )
+
+
+def live_classes(department_id):
+    """A department's classes with their live subject counts."""
+    return (
+        StudentClass.objects.filter(department_id=department_id, is_dead=False)
+        .annotate(subject_count=Count("subjects", filter=Q(subjects__is_dead=False)))
+        .order_by("created_at", "id")
+    )
+
+
+def live_subjects(class_id):
+    return Subject.objects.filter(student_class_id=class_id, is_dead=False).order_by(
+        "name"
+    )
+
+
+def unclaimed_subjects(email):
+    """Subjects assigned to `email` before a teacher registered with it."""
+    return Subject.objects.filter(teacher_email=email, teacher__isnull=True)
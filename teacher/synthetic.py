@@ -0,0 +1,230 @@
+"""
+Synthetic institution data for benchmarks and load tests.
+
+generate_institution() builds sessions x departments x classes x subjects
+with their teachers, students and enrollments. It then records a full term
+of class sessions and attendance, all through batched bulk inserts.
+Generated rows are tagged with a prefix: every email and session name
+starts with it, so several data sets can live side by side.
+"""
+
+import datetime
+import random
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from student.models import Enrollment
+from user.models import User
+
+from .attendance import rebuild_attendance_summaries
+from .models import (
+    AcademicSession,
+    Attendance,
+    ClassSchedule,
+    ClassSession,
+    Department,
+    StudentClass,
+    Subject,
+)
+from .timetable import schedule_rows
+
+BATCH_SIZE = 2000
+# Subjects per summary rebuild, keeping IN lists under SQLite's variable limit.
+SUMMARY_CHUNK = 500
+DAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+FIRST_PERIOD = 9  # hour of the first class of the day
+PERIODS = 8  # hourly periods per day
+
+
+def _bulk_create(model, objs, batch_size=BATCH_SIZE):
+    """bulk_create an iterable in batches without materialising it; returns the count."""
+    objs = iter(objs)
+    created = 0
+    while batch := list(islice(objs, batch_size)):
+        model.objects.bulk_create(batch)
+        created += len(batch)
+    return created
+
+
+def _users(emails, role):
+    # make_password(None) is an unusable password and skips hashing.
+    return User.objects.bulk_create(
+        [
+            User(email=email, role=role, password=make_password(None))
+            for email in emails
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+
+def subject_days(index):
+    """Two weekdays for the index-th subject of a class; six subjects cover the week."""
+    return [DAYS[index % 7], DAYS[(index + 2) % 7]]
+
+
+def subject_period(index, class_index):
+    """
+    Start time of the index-th subject of the class_index-th class of a
+    department. A teacher takes the same subject in every class of their
+    department on the same days, so each class is shifted by one period to
+    keep the teacher free; this holds while classes and subjects per class
+    are at most PERIODS.
+    """
+    return datetime.time(FIRST_PERIOD + (index + class_index) % PERIODS)
+
+
+def generate_institution(
+    prefix="synth",
+    sessions=1,
+    departments=2,
+    classes=3,
+    subjects=6,
+    students=30,
+    weeks=12,
+    attendance_rate=0.85,
+    seed=0,
+    progress=None,
+):
+    """
+    Create a synthetic institution and return a dict of row counts.
+
+    Every class gets `subjects` subjects and `students` students enrolled
+    in all of them. Each department has one teacher per subject slot. The
+    term is the `weeks` weeks ending today; each student attends a session
+    with probability `attendance_rate`. `progress`, if given, is called
+    with a message after each stage.
+    """
+    rng = random.Random(seed)
+    report = progress or (lambda message: None)
+    counts = {}
+    today = datetime.date.today()
+    term_days = [today - datetime.timedelta(days=n) for n in range(weeks * 7)]
+
+    with transaction.atomic():
+        User.objects.create(
+            email=f"{prefix}-admin@example.com",
+            role=User.Role.ADMIN,
+            is_staff=True,
+            is_superuser=True,
+            password=make_password(None),
+        )
+
+        academic_sessions = AcademicSession.objects.bulk_create(
+            AcademicSession(year_range=f"{prefix}-{s + 1}", is_active=s == 0)
+            for s in range(sessions)
+        )
+        depts = Department.objects.bulk_create(
+            Department(name=f"dept{d + 1}", session=session)
+            for session in academic_sessions
+            for d in range(departments)
+        )
+        class_list = StudentClass.objects.bulk_create(
+            [
+                StudentClass(name=f"{dept.name}-{c + 1}", department=dept)
+                for dept in depts
+                for c in range(classes)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        counts.update(
+            sessions=len(academic_sessions),
+            departments=len(depts),
+            classes=len(class_list),
+        )
+        report(f"Created {len(depts)} departments and {len(class_list)} classes.")
+
+        teachers = _users(
+            (
+                f"{prefix}-teacher{n + 1}@example.com"
+                for n in range(len(depts) * subjects)
+            ),
+            User.Role.TEACHER,
+        )
+        subject_list = Subject.objects.bulk_create(
+            [
+                Subject(
+                    name=f"subject{k + 1}",
+                    student_class=cls,
+                    days=subject_days(k),
+                    timing=subject_period(k, c % classes),
+                    teacher=teacher,
+                    teacher_email=teacher.email,
+                )
+                for c, cls in enumerate(class_list)
+                for k in range(subjects)
+                for teacher in [teachers[(c // classes) * subjects + k]]
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        _bulk_create(
+            ClassSchedule,
+            (row for subject in subject_list for row in schedule_rows(subject)),
+        )
+        counts.update(teachers=len(teachers), subjects=len(subject_list))
+        report(f"Created {len(subject_list)} subjects for {len(teachers)} teachers.")
+
+        student_list = _users(
+            (
+                f"{prefix}-student{n + 1}@example.com"
+                for n in range(len(class_list) * students)
+            ),
+            User.Role.STUDENT,
+        )
+        roster = {
+            cls.pk: student_list[c * students : (c + 1) * students]
+            for c, cls in enumerate(class_list)
+        }
+        counts["students"] = len(student_list)
+        counts["enrollments"] = _bulk_create(
+            Enrollment,
+            (
+                Enrollment(student=student, subject=subject)
+                for subject in subject_list
+                for student in roster[subject.student_class_id]
+            ),
+        )
+        report(f"Enrolled {len(student_list)} students.")
+
+        schedules = {
+            (row.subject_id, row.day_of_week): row
+            for row in ClassSchedule.objects.filter(
+                subject__student_class__department__session__in=academic_sessions
+            )
+        }
+        class_sessions = ClassSession.objects.bulk_create(
+            [
+                ClassSession(
+                    subject=subject,
+                    schedule=schedules[subject.pk, day.strftime("%a")],
+                    date=day,
+                )
+                for subject in subject_list
+                for day in term_days
+                if day.strftime("%a") in subject.days
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        counts["class_sessions"] = len(class_sessions)
+        counts["attendance"] = _bulk_create(
+            Attendance,
+            (
+                Attendance(
+                    session=session,
+                    student=student,
+                    is_present=rng.random() < attendance_rate,
+                )
+                for session in class_sessions
+                for student in roster[session.subject.student_class_id]
+            ),
+        )
+        report(
+            f"Recorded {counts['attendance']} attendance rows over "
+            f"{len(class_sessions)} class sessions."
+        )
+
+        subject_ids = [subject.pk for subject in subject_list]
+        for start in range(0, len(subject_ids), SUMMARY_CHUNK):
+            rebuild_attendance_summaries(subject_ids[start : start + SUMMARY_CHUNK])
+    return counts
@@ -0,0 +1,236 @@
+import datetime
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail.backends import locmem
+from django.core.management import call_command
+from django.db.models import F
+from django.test import TestCase
+
+from student.models import Enrollment
+from teacher.alerts import (
+    CHECKPOINT_NAME,
+    deliver,
+    send_attendance_alerts,
+)
+from teacher.attendance import save_attendance
+from teacher.models import (
+    AcademicSession,
+    Attendance,
+    AttendanceAlert,
+    ClassSession,
+    Department,
+    JobCheckpoint,
+    StudentClass,
+    Subject,
+)
+from user.mail import queue_mass_mail, send_queued_mail
+from user.models import OutgoingEmail
+
+User = get_user_model()
+
+
+class SMTPDown(Exception):
+    pass
+
+
+class CountingBackend(locmem.EmailBackend):
+    """Counts real opens and closes, reusing an open connection like SMTP."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.is_open = False
+        self.opens = self.closes = 0
+
+    def open(self):
+        if self.is_open:
+            return False
+        self.is_open = True
+        self.opens += 1
+        return True
+
+    def close(self):
+        if self.is_open:
+            self.is_open = False
+            self.closes += 1
+
+
+class AttendanceAlertTest(TestCase):
+    def setUp(self):
+        session = AcademicSession.objects.create(year_range="2090-2091", is_active=True)
+        dept = Department.objects.create(name="Science", session=session)
+        cls = StudentClass.objects.create(name="science-1", department=dept)
+        self.teacher = User.objects.create_user(
+            email="teacher@example.com", role=User.Role.TEACHER
+        )
+        self.subject = Subject.objects.create(
+            name="Physics", student_class=cls, teacher=self.teacher
+        )
+        self.alice = User.objects.create_user(
+            email="alice@example.com", role=User.Role.STUDENT
+        )
+        self.bob = User.objects.create_user(
+            email="bob@example.com", role=User.Role.STUDENT
+        )
+        for student in (self.alice, self.bob):
+            Enrollment.objects.create(student=student, subject=self.subject)
+        self.day = 0
+
+    def mark(self, *pattern):
+        """One session per letter; Alice is present at each P, Bob at every one."""
+        for letter in pattern:
+            self.day += 1
+            class_session = ClassSession.objects.create(
+                subject=self.subject,
+                date=datetime.date(2090, 9, 1) + datetime.timedelta(self.day),
+            )
+            present = {self.bob.pk}
+            if letter == "P":
+                present.add(self.alice.pk)
+            save_attendance(class_session, present)
+
+    def recipients(self):
+        return sorted(message.to[0] for message in mail.outbox)
+
+    def test_alerts_once_when_a_student_drops_below(self):
+        self.mark("P", "P", "P", "A")
+        result = send_attendance_alerts()
+        # Four sessions are not enough to judge a rate.
+        self.assertEqual((result["pairs"], result["alerts"]), (2, 0))
+
+        self.mark("A")  # 3 of 5: 60%
+        result = send_attendance_alerts()
+        self.assertEqual(result["alerts"], 1)
+        self.assertEqual(result["sent"], 2)
+        self.assertEqual(
+            self.recipients(), ["alice@example.com", "teacher@example.com"]
+        )
+        teacher_digest = next(m for m in mail.outbox if m.to == ["teacher@example.com"])
+        self.assertIn("alice@example.com, physics", teacher_digest.body)
+        self.assertIn("60.0% (3 of 5 sessions)", teacher_digest.body)
+
+        # Still below: no repeat alert.
+        mail.outbox.clear()
+        self.mark("A")
+        self.assertEqual(send_attendance_alerts()["alerts"], 0)
+
+        # Back above, then below again: alerts again.
+        self.mark("P", "P", "P", "P", "P", "P", "P")  # 10 of 13: 76.9%
+        self.assertEqual(send_attendance_alerts()["alerts"], 0)
+        self.mark("A", "A")  # 10 of 15: 66.7%
+        self.assertEqual(send_attendance_alerts()["alerts"], 1)
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_scans_new_and_recent_marks(self):
+        self.mark("P", "A", "A", "A", "A")
+        first = send_attendance_alerts()
+        self.assertEqual(first["to"], Attendance.objects.latest("id").id)
+        self.assertEqual(first["alerts"], 1)
+
+        # Recent marks are scanned again, but alerted pairs are not repeated.
+        second = send_attendance_alerts()
+        self.assertEqual((second["from"], second["to"]), (first["to"], first["to"]))
+        self.assertEqual((second["pairs"], second["alerts"]), (2, 0))
+
+        self.mark("A")
+        with self.assertNumQueries(6):
+            # Checkpoint (3 with the savepoint), scan, summaries, save.
+            third = send_attendance_alerts()
+        self.assertEqual(third["to"] - third["from"], 2)
+        self.assertEqual(third["alerts"], 0)
+
+    def test_marks_committed_behind_the_checkpoint(self):
+        self.mark("A", "A", "A", "A")
+        self.assertEqual(send_attendance_alerts()["alerts"], 0)
+        # A later id committed first and was scanned; this mark's lower id
+        # only becomes visible now.
+        JobCheckpoint.objects.filter(name=CHECKPOINT_NAME).update(
+            position=F("position") + 10
+        )
+
+        self.mark("A")
+        self.assertEqual(send_attendance_alerts()["alerts"], 1)
+        self.assertEqual(
+            self.recipients(), ["alice@example.com", "teacher@example.com"]
+        )
+
+    def test_alerts_survive_a_failed_delivery(self):
+        self.mark("A", "A", "A", "A", "A")
+        with (
+            patch("teacher.alerts.deliver", side_effect=SMTPDown),
+            self.assertRaises(SMTPDown),
+        ):
+            send_attendance_alerts()
+
+        # Checkpoint, alert record and digests were committed together.
+        self.assertEqual(
+            JobCheckpoint.objects.get(name=CHECKPOINT_NAME).position,
+            Attendance.objects.latest("id").id,
+        )
+        self.assertTrue(
+            AttendanceAlert.objects.filter(
+                student=self.alice, subject=self.subject
+            ).exists()
+        )
+        self.assertEqual(send_attendance_alerts()["alerts"], 0)
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(send_queued_mail(), (2, 0))
+        self.assertEqual(
+            self.recipients(), ["alice@example.com", "teacher@example.com"]
+        )
+
+    def test_dry_run_and_skip_backlog(self):
+        self.mark("A", "A", "A", "A", "A")
+        result = send_attendance_alerts(dry_run=True)
+        self.assertEqual(result["alerts"], 1)
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(JobCheckpoint.objects.get(name=CHECKPOINT_NAME).position, 0)
+
+        result = send_attendance_alerts(skip_backlog=True)
+        self.assertEqual(result["alerts"], 0)
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(
+            JobCheckpoint.objects.get(name=CHECKPOINT_NAME).position,
+            Attendance.objects.latest("id").id,
+        )
+        # Pairs already below were recorded and do not alert on a re-scan.
+        self.assertEqual(send_attendance_alerts()["alerts"], 0)
+        self.assertEqual(mail.outbox, [])
+
+    def test_delivery_batches_share_one_connection(self):
+        queue_mass_mail(
+            ("Low attendance", "Body", None, [f"s{n}@example.com"]) for n in range(6)
+        )
+        backend = CountingBackend()
+        with patch("teacher.alerts.get_connection", return_value=backend) as factory:
+            self.assertEqual(deliver(6, batch_size=2), 6)
+        self.assertEqual(factory.call_count, 1)
+        self.assertEqual((backend.opens, backend.closes), (1, 1))
+        self.assertEqual(len(mail.outbox), 6)
+
+    def test_failed_batches_go_to_outbox(self):
+        self.mark("A", "A", "A", "A", "A")
+        with patch(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            side_effect=SMTPDown,
+        ):
+            result = send_attendance_alerts()
+        self.assertEqual((result["sent"], result["queued"]), (0, 2))
+        self.assertEqual(
+            sorted(OutgoingEmail.objects.values_list("recipient", flat=True)),
+            ["alice@example.com", "teacher@example.com"],
+        )
+
+    def test_command(self):
+        self.mark("A", "A", "A", "A", "A")
+        out = StringIO()
+        call_command("send_attendance_alerts", "--dry-run", stdout=out)
+        self.assertIn("1 alerts, 2 digests", out.getvalue())
+        call_command("send_attendance_alerts", stdout=out)
+        self.assertIn("2 sent, 0 left in the outbox", out.getvalue())
+
+        out = StringIO()
+        call_command("send_attendance_alerts", stdout=out)
+        self.assertIn("No new marks: 2 student/subject pairs", out.getvalue())
@@ -0,0 +1,218 @@
+import datetime
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from teacher.analytics import attendance_report
+from teacher.export import scoped_sessions
+from teacher.models import (
+    AcademicSession,
+    Attendance,
+    ClassSession,
+    Department,
+    StudentClass,
+    Subject,
+)
+from teacher.synthetic import generate_institution
+
+User = get_user_model()
+
+
+class AnalyticsFixture(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser("admin@example.com", "password")
+        cls.teacher = User.objects.create_user(
+            email="teacher@example.com", password="password", role=User.Role.TEACHER
+        )
+        cls.session = AcademicSession.objects.create(year_range="2090-2091")
+        science = Department.objects.create(name="Science", session=cls.session)
+        arts = Department.objects.create(name="Arts", session=cls.session)
+        cls.physics = Subject.objects.create(
+            name="Physics",
+            student_class=StudentClass.objects.create(
+                name="science-1", department=science
+            ),
+            teacher=cls.teacher,
+        )
+        cls.drawing = Subject.objects.create(
+            name="Drawing",
+            student_class=StudentClass.objects.create(name="arts-1", department=arts),
+        )
+        cls.alice = User.objects.create_user(
+            email="alice@example.com", role=User.Role.STUDENT
+        )
+        cls.bob = User.objects.create_user(
+            email="bob@example.com", role=User.Role.STUDENT
+        )
+
+        # Alice in Physics: P P A A A P A A (3 of 8); Bob is always present.
+        for day, alice_present in enumerate("PPAAAPAA", start=1):
+            class_session = ClassSession.objects.create(
+                subject=cls.physics, date=datetime.date(2090, 9, day)
+            )
+            Attendance.objects.create(
+                session=class_session,
+                student=cls.alice,
+                is_present=alice_present == "P",
+            )
+            Attendance.objects.create(
+                session=class_session, student=cls.bob, is_present=True
+            )
+        # Alice in Drawing: present at both sessions, in two different weeks.
+        for date in (datetime.date(2090, 9, 4), datetime.date(2090, 9, 11)):
+            Attendance.objects.create(
+                session=ClassSession.objects.create(subject=cls.drawing, date=date),
+                student=cls.alice,
+                is_present=True,
+            )
+
+
+class AttendanceAnalyticsTest(AnalyticsFixture):
+    def report(self, scope="session", pk=None, **kwargs):
+        return attendance_report(
+            scoped_sessions(scope, pk or self.session.pk), **kwargs
+        )
+
+    def test_rates_by_group(self):
+        report = self.report()
+        self.assertEqual(report["overall"], {"held": 18, "present": 13, "rate": 72.2})
+        self.assertEqual(
+            [
+                (row["name"], row["held"], row["present"])
+                for row in report["departments"]
+            ],
+            [("arts", 2, 2), ("science", 16, 11)],
+        )
+        self.assertEqual(
+            [(row["name"], row["rate"]) for row in report["subjects"]],
+            [("drawing", 100.0), ("physics", 68.8)],
+        )
+        self.assertEqual(
+            [(row["name"], row["rate"]) for row in report["students"]],
+            [("alice@example.com", 50.0), ("bob@example.com", 100.0)],
+        )
+
+    def test_streaks_and_recent_window(self):
+        rows = {
+            (row["email"], row["subject_name"]): row
+            for row in self.report(window=3)["student_subjects"]
+        }
+        alice = rows["alice@example.com", "physics"]
+        self.assertEqual((alice["held"], alice["present"], alice["rate"]), (8, 3, 37.5))
+        self.assertEqual((alice["streak"], alice["streak_present"]), (2, False))
+        self.assertEqual(alice["longest_absence"], 3)
+        self.assertEqual(alice["recent_rate"], 33.3)
+
+        bob = rows["bob@example.com", "physics"]
+        self.assertEqual((bob["streak"], bob["streak_present"]), (8, True))
+        self.assertEqual(bob["longest_absence"], 0)
+
+    def test_below_threshold(self):
+        report = self.report()
+        self.assertEqual(
+            [(row["email"], row["subject_name"]) for row in report["below_threshold"]],
+            [("alice@example.com", "physics")],
+        )
+        self.assertEqual(
+            [row["name"] for row in report["students_below_threshold"]],
+            ["alice@example.com"],
+        )
+        self.assertEqual(self.report(threshold=30)["below_threshold"], [])
+
+    def test_weeks(self):
+        weeks = self.report()["weeks"]
+        # 2090-09-01 is a Friday.
+        self.assertEqual(
+            [(row["week"], row["held"]) for row in weeks],
+            [
+                (datetime.date(2090, 8, 28), 6),
+                (datetime.date(2090, 9, 4), 11),
+                (datetime.date(2090, 9, 11), 1),
+            ],
+        )
+
+    def test_empty_scope(self):
+        report = self.report(
+            "subject",
+            Subject.objects.create(
+                name="Empty", student_class=self.physics.student_class
+            ).pk,
+        )
+        self.assertEqual(report["overall"]["rate"], None)
+        self.assertEqual(report["student_subjects"], [])
+        self.assertEqual(report["weeks"], [])
+
+    def test_matches_per_mark_computation(self):
+        generate_institution(
+            prefix="an", departments=2, classes=2, subjects=3, students=6, weeks=3
+        )
+        sessions = scoped_sessions(
+            "session", AcademicSession.objects.get(year_range="an-1").pk
+        )
+        marks = defaultdict(list)
+        for mark in Attendance.objects.filter(session__in=sessions).select_related(
+            "session"
+        ):
+            marks[mark.student_id, mark.session.subject_id].append(
+                (mark.session.date, mark.session_id, mark.is_present)
+            )
+
+        report = attendance_report(sessions, window=4)
+        self.assertTrue(marks)
+        self.assertEqual(len(report["student_subjects"]), len(marks))
+        for row in report["student_subjects"]:
+            history = [
+                present
+                for _, _, present in sorted(marks[row["student"], row["subject"]])
+            ]
+            self.assertEqual(row["held"], len(history))
+            self.assertEqual(row["present"], sum(history))
+            runs = "".join("P" if present else "A" for present in history)
+            self.assertEqual(row["longest_absence"], max(map(len, runs.split("P"))))
+            last = runs[-1]
+            self.assertEqual(row["streak_present"], last == "P")
+            self.assertEqual(row["streak"], len(runs) - len(runs.rstrip(last)))
+            recent = history[-4:]
+            self.assertEqual(
+                row["recent_rate"], round(100 * sum(recent) / len(recent), 1)
+            )
+
+
+class AttendanceReportViewTest(AnalyticsFixture):
+    def test_admin_sees_any_scope(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(f"/teacher/report/session/{self.session.pk}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Below 75% (1)")
+        self.assertContains(response, "Departments")
+        self.assertContains(response, "2 absent")
+
+        response = self.client.get(
+            f"/teacher/report/session/{self.session.pk}/",
+            {"threshold": 30, "end": "2090-09-04"},
+        )
+        self.assertContains(response, "Below 30% (0)")
+        self.assertEqual(response.context["report"]["overall"]["held"], 9)
+
+    def test_teacher_sees_own_subject_only(self):
+        self.client.force_login(self.teacher)
+        response = self.client.get(f"/teacher/report/subject/{self.physics.pk}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["groups"], [])
+        for url in (
+            f"/teacher/report/subject/{self.drawing.pk}/",
+            f"/teacher/report/session/{self.session.pk}/",
+        ):
+            self.assertEqual(self.client.get(url).status_code, 403)
+
+    def test_bad_parameters(self):
+        self.client.force_login(self.admin)
+        for url in (
+            f"/teacher/report/school/{self.session.pk}/",
+            f"/teacher/report/session/{self.session.pk}/?threshold=0",
+            f"/teacher/report/session/{self.session.pk}/?window=x",
+            "/teacher/report/class/999999/",
+        ):
+            self.assertEqual(self.client.get(url).status_code, 404, url)
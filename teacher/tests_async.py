@@ -0,0 +1,130 @@
+import datetime
+from io import StringIO
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from student.models import Enrollment
+from teacher.attendance import abuild_attendance_grid, build_attendance_grid
+from teacher.loadtest import LOAD_TEST_VIEWS, run_load_test
+from teacher.models import ClassSession, Subject
+from teacher.synthetic import generate_institution
+from user.models import User
+
+
+@override_settings(ROOT_URLCONF="classcheck.urls_async")
+class AsyncViewsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_institution(
+            prefix="as", departments=1, classes=2, subjects=3, students=5, weeks=2
+        )
+        session = ClassSession.objects.order_by("date", "pk").first()
+        cls.date = session.date
+        cls.subject = Subject.objects.select_related("teacher").get(
+            pk=session.subject_id
+        )
+        cls.teacher = cls.subject.teacher
+        cls.student = Enrollment.objects.filter(subject=cls.subject)[0].student
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_async_grid_matches_sync_grid(self):
+        sessions, rows = build_attendance_grid(self.subject, self.date)
+        async_sessions, async_rows = self.run_async(
+            abuild_attendance_grid, self.subject, self.date
+        )
+        self.assertTrue(sessions)
+        self.assertEqual(async_sessions, sessions)
+        self.assertEqual(async_rows, rows)
+
+        empty_date = self.date - datetime.timedelta(days=365)
+        self.assertEqual(
+            self.run_async(abuild_attendance_grid, self.subject, empty_date),
+            build_attendance_grid(self.subject, empty_date),
+        )
+
+    def run_async(self, func, *args):
+        return async_to_sync(func)(*args)
+
+    async def test_class_details(self):
+        await self.async_client.aforce_login(self.teacher)
+        response = await self.async_client.get(
+            f"/teacher/class/{self.subject.pk}/details/",
+            {"date": self.date.isoformat()},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            len(response.context["student_data"]),
+            await Enrollment.objects.filter(subject=self.subject).acount(),
+        )
+        self.assertContains(response, self.teacher.email)
+
+    async def test_class_details_of_other_teacher_is_404(self):
+        other = await sync_to_async(User.objects.create_user)(
+            "other@example.com", None, role=User.Role.TEACHER
+        )
+        await self.async_client.aforce_login(other)
+        response = await self.async_client.get(
+            f"/teacher/class/{self.subject.pk}/details/"
+        )
+        self.assertEqual(response.status_code, 404)
+
+    async def test_teacher_dashboard(self):
+        await self.async_client.aforce_login(self.teacher)
+        response = await self.async_client.get("/teacher/dashboard/")
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, self.subject.name.title())
+
+    async def test_student_dashboard(self):
+        await self.async_client.aforce_login(self.student)
+        response = await self.async_client.get(
+            "/student/dashboard/", {"date": self.date.isoformat(), "view": "week"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context["sessions"])
+
+    async def test_role_checks_apply(self):
+        await self.async_client.aforce_login(self.student)
+        response = await self.async_client.get(
+            f"/teacher/class/{self.subject.pk}/details/"
+        )
+        self.assertEqual(response.status_code, 302)
+
+
+class LoadTestTest(TransactionTestCase):
+    # The handlers run requests on their own threads and connections, so the
+    # generated data has to be committed.
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        generate_institution(departments=1, classes=1, subjects=6, students=3, weeks=1)
+
+    def test_both_modes_serve_every_view(self):
+        result = run_load_test(requests=4, concurrency=2)
+        self.assertEqual(sorted(result), sorted(LOAD_TEST_VIEWS))
+        for modes in result.values():
+            self.assertEqual(sorted(modes), ["asgi", "wsgi"])
+            for row in modes.values():
+                self.assertEqual(row["requests"], 4)
+                self.assertEqual(row["errors"], 0)
+
+    def test_command(self):
+        out = StringIO()
+        call_command(
+            "load_test",
+            "--requests",
+            "2",
+            "--view",
+            "class_details",
+            "--mode",
+            "asgi",
+            stdout=out,
+        )
+        self.assertIn("class_details", out.getvalue())
+        self.assertNotIn("wsgi", out.getvalue())
@@ -0,0 +1,108 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from student.models import Enrollment
+from teacher.attendance import save_attendance
+from teacher.models import (
+    AcademicSession,
+    AttendanceSummary,
+    ClassSession,
+    Department,
+    StudentClass,
+    Subject,
+)
+
+User = get_user_model()
+
+
+class AttendanceSummaryTest(TestCase):
+    def setUp(self):
+        self.session = AcademicSession.objects.create(
+            year_range="2090-2091", is_active=True
+        )
+        self.dept = Department.objects.create(name="Science", session=self.session)
+        self.cls = StudentClass.objects.create(name="science-1", department=self.dept)
+        self.subject = Subject.objects.create(name="Physics", student_class=self.cls)
+        self.alice = User.objects.create_user(
+            email="alice@example.com", role=User.Role.STUDENT
+        )
+        self.bob = User.objects.create_user(
+            email="bob@example.com", role=User.Role.STUDENT
+        )
+        for student in (self.alice, self.bob):
+            Enrollment.objects.create(student=student, subject=self.subject)
+
+    def summary(self, student):
+        return AttendanceSummary.objects.get(student=student, subject=self.subject)
+
+    def snapshot(self):
+        return sorted(
+            AttendanceSummary.objects.values_list(
+                "student_id",
+                "subject_id",
+                "sessions_held",
+                "sessions_present",
+                "last_session_date",
+            )
+        )
+
+    def test_incremental_updates(self):
+        first = ClassSession.objects.create(
+            subject=self.subject, date=datetime.date(2090, 9, 1)
+        )
+        second = ClassSession.objects.create(
+            subject=self.subject, date=datetime.date(2090, 9, 2)
+        )
+
+        save_attendance(first, [self.alice.id])
+        save_attendance(second, [self.alice.id, self.bob.id])
+
+        alice = self.summary(self.alice)
+        self.assertEqual((alice.sessions_held, alice.sessions_present), (2, 2))
+        self.assertEqual(alice.last_session_date, second.date)
+        self.assertEqual(alice.percentage, 100.0)
+        bob = self.summary(self.bob)
+        self.assertEqual((bob.sessions_held, bob.sessions_present), (2, 1))
+
+        # Correcting an earlier session only moves the present count.
+        save_attendance(first, [self.bob.id])
+
+        alice = self.summary(self.alice)
+        self.assertEqual((alice.sessions_held, alice.sessions_present), (2, 1))
+        self.assertEqual(alice.last_session_date, second.date)
+        bob = self.summary(self.bob)
+        self.assertEqual((bob.sessions_held, bob.sessions_present), (2, 2))
+
+    def test_saving_same_marks_twice_keeps_counts(self):
+        class_session = ClassSession.objects.create(
+            subject=self.subject, date=datetime.date(2090, 9, 1)
+        )
+
+        self.assertEqual(save_attendance(class_session, [self.alice.id]), (2, 0))
+        before = self.snapshot()
+        self.assertEqual(save_attendance(class_session, [self.alice.id]), (0, 2))
+
+        self.assertEqual(self.snapshot(), before)
+        alice = self.summary(self.alice)
+        self.assertEqual((alice.sessions_held, alice.sessions_present), (1, 1))
+        bob = self.summary(self.bob)
+        self.assertEqual((bob.sessions_held, bob.sessions_present), (1, 0))
+
+    def test_rebuild_matches_incremental(self):
+        for day, present in ((1, [self.alice.id]), (2, []), (3, [self.bob.id])):
+            class_session = ClassSession.objects.create(
+                subject=self.subject, date=datetime.date(2090, 9, day)
+            )
+            save_attendance(class_session, present)
+        incremental = self.snapshot()
+
+        AttendanceSummary.objects.update(sessions_held=0, sessions_present=0)
+        out = StringIO()
+        call_command("rebuild_attendance_summary", stdout=out)
+
+        self.assertIn("Rebuilt 2 summary rows", out.getvalue())
+        self.assertEqual(self.snapshot(), incremental)
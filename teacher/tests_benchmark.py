@@ -0,0 +1,102 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from student.models import Enrollment
+from teacher.benchmark import VIEWS
+from teacher.models import (
+    Attendance,
+    AttendanceSummary,
+    ClassSchedule,
+    StudentClass,
+    Subject,
+)
+from teacher.synthetic import generate_institution
+from teacher.timetable import find_conflicts
+
+
+class SyntheticInstitutionTest(TestCase):
+    def test_generate_counts(self):
+        counts = generate_institution(
+            prefix="t", departments=2, classes=2, subjects=3, students=4, weeks=2
+        )
+        self.assertEqual(counts["classes"], 4)
+        self.assertEqual(Subject.objects.count(), 12)
+        self.assertEqual(Enrollment.objects.count(), 12 * 4)
+        self.assertEqual(ClassSchedule.objects.count(), 12 * 2)
+        # Two weeks of a twice-weekly class: four sessions per subject.
+        self.assertEqual(counts["class_sessions"], 12 * 4)
+        self.assertEqual(Attendance.objects.count(), 12 * 4 * 4)
+        self.assertEqual(AttendanceSummary.objects.count(), 12 * 4)
+        self.assertEqual(
+            sorted(StudentClass.objects.values_list("name", flat=True)),
+            ["dept1-1", "dept1-2", "dept2-1", "dept2-2"],
+        )
+
+    def test_teachers_are_not_double_booked(self):
+        generate_institution(
+            prefix="t", departments=1, classes=3, subjects=6, students=1, weeks=1
+        )
+        for subject in Subject.objects.all():
+            conflicts = find_conflicts(
+                subject.teacher_email,
+                subject.days,
+                subject.timing,
+                exclude_subject=subject,
+            )
+            self.assertFalse(conflicts.exists(), subject)
+
+    def test_command_refuses_existing_prefix(self):
+        call_command(
+            "generate_institution", "--students", "2", "--weeks", "1", stdout=StringIO()
+        )
+        with self.assertRaises(CommandError):
+            call_command("generate_institution", stdout=StringIO())
+
+
+class BenchmarkCommandTest(TestCase):
+    def test_writes_json(self):
+        generate_institution(departments=1, classes=1, subjects=6, students=3, weeks=1)
+        handle, path = tempfile.mkstemp(suffix=".json")
+        os.close(handle)
+        self.addCleanup(os.remove, path)
+
+        call_command(
+            "benchmark_views",
+            "--iterations",
+            "2",
+            "--warmup",
+            "0",
+            "--output",
+            path,
+            stdout=StringIO(),
+        )
+        with open(path) as f:
+            result = json.load(f)
+        self.assertEqual(sorted(result["views"]), sorted(VIEWS))
+        for row in result["views"].values():
+            self.assertLess(row["status"], 400)
+            self.assertGreater(row["queries"], 0)
+
+        out = StringIO()
+        call_command(
+            "benchmark_views",
+            "--iterations",
+            "1",
+            "--warmup",
+            "0",
+            "--view",
+            "teacher_dashboard",
+            "--compare",
+            path,
+            stdout=out,
+        )
+        self.assertIn("Against baseline", out.getvalue())
+
+    def test_missing_data(self):
+        with self.assertRaises(CommandError):
+            call_command("benchmark_views", "--prefix", "none", stdout=StringIO())
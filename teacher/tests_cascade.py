@@ -0,0 +1,125 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from teacher.models import AcademicSession, Department, StudentClass, Subject
+from teacher.structure import set_active
+
+User = get_user_model()
+
+
+class CascadeTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.admin = User.objects.create_user(
+            "admin@example.com", None, role=User.Role.ADMIN, is_superuser=True
+        )
+        self.client.force_login(self.admin)
+
+        self.session = AcademicSession.objects.create(year_range="2090-2091")
+        self.dept = Department.objects.create(name="Dept", session=self.session)
+
+    def _add_classes(self, count, subjects_per_class=3):
+        for _ in range(count):
+            cls = StudentClass.objects.create(department=self.dept)
+            for i in range(subjects_per_class):
+                Subject.objects.create(name=f"Subj {i}", student_class=cls)
+
+    def _count_queries(self, obj, is_active):
+        with CaptureQueriesContext(connection) as ctx:
+            set_active(obj, is_active)
+        return len(ctx.captured_queries)
+
+    def test_department_cascade_reaches_subjects(self):
+        self._add_classes(2)
+        self.client.post(f"/teacher/structure/department/{self.dept.id}/delete/")
+        self.assertFalse(
+            Subject.objects.filter(
+                student_class__department=self.dept, is_active=True
+            ).exists()
+        )
+        self.assertFalse(StudentClass.objects.filter(is_active=True).exists())
+
+        self.client.post(
+            f"/teacher/structure/department/{self.dept.id}/delete/", {"restore": "true"}
+        )
+        self.assertFalse(Subject.objects.filter(is_active=False).exists())
+        self.assertFalse(StudentClass.objects.filter(is_active=False).exists())
+
+    def test_restore_skips_dead_rows(self):
+        self._add_classes(1)
+        dead = Subject.objects.create(
+            name="Dead",
+            student_class=StudentClass.objects.get(),
+            is_dead=True,
+            is_active=False,
+        )
+        set_active(self.dept, False)
+        set_active(self.dept, True)
+        dead.refresh_from_db()
+        self.assertFalse(dead.is_active)
+
+    def test_session_cascade(self):
+        self._add_classes(1)
+        response = self.client.post(
+            f"/teacher/structure/session/{self.session.id}/delete/"
+        )
+        self.assertRedirects(response, "/teacher/structure/")
+        self.session.refresh_from_db()
+        self.dept.refresh_from_db()
+        self.assertFalse(self.session.is_active)
+        self.assertFalse(self.dept.is_active)
+        self.assertFalse(Subject.objects.filter(is_active=True).exists())
+
+        self.client.post(
+            f"/teacher/structure/session/{self.session.id}/delete/",
+            {"restore": "true"},
+        )
+        self.assertFalse(Subject.objects.filter(is_active=False).exists())
+
+    def test_restore_keeps_rows_deactivated_on_their_own(self):
+        self._add_classes(2)
+        own, other = StudentClass.objects.order_by("id")
+        lone = Subject.objects.filter(student_class=other).first()
+        set_active(own, False)
+        set_active(lone, False)
+
+        set_active(self.dept, False)
+        set_active(self.dept, True)
+
+        own.refresh_from_db()
+        self.assertFalse(own.is_active)
+        self.assertFalse(
+            Subject.objects.filter(student_class=own, is_active=True).exists()
+        )
+        self.assertEqual(
+            set(Subject.objects.filter(is_active=False).values_list("id", flat=True)),
+            set(Subject.objects.filter(student_class=own).values_list("id", flat=True))
+            | {lone.id},
+        )
+
+        # Restoring the class itself brings back the subjects it cascaded to.
+        set_active(own, True)
+        self.assertEqual(
+            list(Subject.objects.filter(is_active=False).values_list("id", flat=True)),
+            [lone.id],
+        )
+
+    def test_delete_requires_post(self):
+        url = f"/teacher/structure/session/{self.session.id}/delete/"
+        self.session.is_active = True
+        self.session.save()
+
+        self.assertEqual(self.client.get(url).status_code, 405)
+        self.session.refresh_from_db()
+        self.assertTrue(self.session.is_active)
+
+    def test_query_count_is_flat(self):
+        self._add_classes(1)
+        small = self._count_queries(self.dept, False)
+        set_active(self.dept, True)
+
+        self._add_classes(10)
+        large = self._count_queries(self.dept, False)
+        self.assertEqual(small, large)
@@ -0,0 +1,105 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from student.models import Enrollment
+from teacher.attendance import build_attendance_grid
+from teacher.models import (
+    AcademicSession,
+    Attendance,
+    ClassSession,
+    Department,
+    StudentClass,
+    Subject,
+)
+
+User = get_user_model()
+
+
+class ClassDetailsGridTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.teacher = User.objects.create_user(
+            email="teacher@example.com", password="password", role=User.Role.TEACHER
+        )
+        self.client.force_login(self.teacher)
+
+        self.session = AcademicSession.objects.create(
+            year_range="2090-2091", is_active=True
+        )
+        self.dept = Department.objects.create(name="Science", session=self.session)
+        self.cls = StudentClass.objects.create(name="science-1", department=self.dept)
+        self.subject = Subject.objects.create(
+            name="Physics", student_class=self.cls, teacher=self.teacher
+        )
+        self.date = datetime.date(2090, 9, 1)
+        self.student_count = 0
+
+    def add_students(self, count, extra_subject=None):
+        students = []
+        for _ in range(count):
+            self.student_count += 1
+            student = User.objects.create_user(
+                email=f"student{self.student_count}@example.com",
+                role=User.Role.STUDENT,
+            )
+            Enrollment.objects.create(student=student, subject=self.subject)
+            if extra_subject:
+                Enrollment.objects.create(student=student, subject=extra_subject)
+            students.append(student)
+        return students
+
+    def add_session(self, subject, present=()):
+        class_session = ClassSession.objects.create(subject=subject, date=self.date)
+        for student in present:
+            Attendance.objects.create(
+                session=class_session, student=student, is_present=True
+            )
+        return class_session
+
+    def test_grid_values(self):
+        chemistry = Subject.objects.create(name="Chemistry", student_class=self.cls)
+        alice, bob = self.add_students(2)
+        Enrollment.objects.create(student=alice, subject=chemistry)
+
+        physics_session = self.add_session(self.subject, present=[alice])
+        chemistry_session = self.add_session(chemistry)
+
+        sessions, student_data = build_attendance_grid(self.subject, self.date)
+
+        self.assertEqual(sessions, [physics_session, chemistry_session])
+        grid = {row["student"]: row["attendance"] for row in student_data}
+        self.assertEqual(
+            grid[alice],
+            {physics_session.id: "Present", chemistry_session.id: "Absent"},
+        )
+        self.assertEqual(
+            grid[bob], {physics_session.id: "Absent", chemistry_session.id: "N/A"}
+        )
+
+    def test_query_count_is_flat(self):
+        url = f"/teacher/class/{self.subject.id}/details/?date={self.date}"
+
+        def count_queries():
+            cache.clear()
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            return len(ctx.captured_queries)
+
+        students = self.add_students(3)
+        self.add_session(self.subject, present=students[:1])
+        small = count_queries()
+
+        for index in range(6):
+            other = Subject.objects.create(name=f"Other {index}", student_class=self.cls)
+            students += self.add_students(10, extra_subject=other)
+            self.add_session(other, present=students[-5:])
+        self.add_session(self.subject, present=students)
+        large = count_queries()
+
+        self.assertEqual(small, large)
@@ -1,4 +1,5 @@
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import Client, TestCase
 
 from teacher.models import AcademicSession, Department, StudentClass, Subject
@@ -8,6 +9,8 @@ User = get_user_model()
 
 class DashboardHierarchyTest(TestCase):
     def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
         self.client = Client()
         self.teacher = User.objects.create_user(
             email="teacher@example.com", password="password", role=User.Role.TEACHER
@@ -15,7 +18,9 @@ class DashboardHierarchyTest(TestCase):
         self.client.force_login(self.teacher)
 
         # Setup Hierarchy
-        self.session = AcademicSession.objects.create(year_range="2090-2091")
+        self.session = AcademicSession.objects.create(
+            year_range="2090-2091", is_active=True
+        )
         self.dept = Department.objects.create(name="Science", session=self.session)
         self.cls1 = StudentClass.objects.create(name="science-1", department=self.dept)
 
@@ -61,18 +66,12 @@ class DashboardHierarchyTest(TestCase):
         self.assertContains(response, "Chemistry")
         self.assertContains(response, "Math")
 
-        # Check Context Ordering
-        # View should return queryset ordered by dept name, class name, subject name.
-        ordered_classes = list(response.context["classes"])
-        # Expected order: Math (science-2) > Chemistry (science-1) > Physics (science-1) ?
-        # No: Order is Dept Name -> Class Name -> Name
-        # science-1 < science-2
-        # Inside science-1: Chemistry < Physics
-        # So: Chemistry, Physics, Math
-
-        self.assertEqual(ordered_classes[0], self.subj2)  # Chemistry (science-1)
-        self.assertEqual(ordered_classes[1], self.subj1)  # Physics (science-1)
-        self.assertEqual(ordered_classes[2], self.subj3)  # Math (science-2)
+        # The class list is a cached fragment, so check the order in the
+        # rendered HTML: dept name -> class name -> subject name, i.e.
+        # Chemistry, Physics (science-1) then Math (science-2).
+        content = response.content.decode()
+        self.assertLess(content.index("Chemistry"), content.index("Physics"))
+        self.assertLess(content.index("Physics"), content.index("Math"))
 
     def test_dashboard_inactive_filtering(self):
         # 1. Inactive Subject
@@ -0,0 +1,100 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from teacher.dashboard import dashboard_version, invalidate_teacher_dashboards
+from teacher.models import AcademicSession, Department, StudentClass, Subject
+
+User = get_user_model()
+
+
+class DashboardCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.teacher = User.objects.create_user(
+            "teacher@example.com", None, role=User.Role.TEACHER
+        )
+        self.other = User.objects.create_user(
+            "other@example.com", None, role=User.Role.TEACHER
+        )
+        self.admin = User.objects.create_user(
+            "admin@example.com", None, role=User.Role.ADMIN, is_superuser=True
+        )
+        session = AcademicSession.objects.create(year_range="2090-2091", is_active=True)
+        self.dept = Department.objects.create(name="Science", session=session)
+        self.cls = StudentClass.objects.create(department=self.dept)
+        self.physics = Subject.objects.create(
+            name="Physics", student_class=self.cls, teacher=self.teacher
+        )
+        self.client = Client()
+        self.client.force_login(self.teacher)
+
+    def get_dashboard(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/teacher/dashboard/")
+        self.assertEqual(response.status_code, 200)
+        subject_queries = [
+            q for q in ctx.captured_queries if "teacher_subject" in q["sql"]
+        ]
+        return response, len(subject_queries)
+
+    def admin_post(self, url, data=None):
+        admin = Client()
+        admin.force_login(self.admin)
+        admin.post(url, data or {})
+
+    def test_class_list_is_served_from_cache(self):
+        response, queries = self.get_dashboard()
+        self.assertContains(response, "Physics")
+        self.assertEqual(queries, 1)
+
+        response, queries = self.get_dashboard()
+        self.assertContains(response, "Physics")
+        self.assertEqual(queries, 0)
+
+    def test_structure_change_bumps_only_affected_teachers(self):
+        self.get_dashboard()
+        other_version = dashboard_version(self.other.pk)
+
+        self.admin_post(f"/teacher/structure/department/{self.dept.id}/delete/")
+        response, queries = self.get_dashboard()
+        self.assertEqual(queries, 1)
+        self.assertNotContains(response, "Physics")
+        self.assertEqual(dashboard_version(self.other.pk), other_version)
+
+        self.admin_post(
+            f"/teacher/structure/department/{self.dept.id}/delete/",
+            {"restore": "true"},
+        )
+        response, _ = self.get_dashboard()
+        self.assertContains(response, "Physics")
+
+    def test_subject_deactivation_and_assignment(self):
+        self.get_dashboard()
+        self.admin_post(f"/teacher/structure/subject/{self.physics.id}/delete/")
+        response, _ = self.get_dashboard()
+        self.assertNotContains(response, "Physics")
+
+        self.admin_post(
+            "/teacher/structure/subject/add/",
+            {
+                "name": "Chemistry",
+                "class_id": self.cls.id,
+                "days": ["Mon"],
+                "timing": "10:00",
+                "teacher_email": self.teacher.email,
+            },
+        )
+        response, _ = self.get_dashboard()
+        self.assertContains(response, "Chemistry")
+
+    def test_version_survives_eviction(self):
+        version = dashboard_version(self.teacher.pk)
+        invalidate_teacher_dashboards([self.teacher.pk])
+        self.assertEqual(dashboard_version(self.teacher.pk), version + 1)
+
+        cache.clear()
+        self.assertGreater(dashboard_version(self.teacher.pk), version + 1)
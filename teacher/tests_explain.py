@@ -0,0 +1,51 @@
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+
+from teacher.explain import explain_hot_queries, hot_queries
+from teacher.synthetic import generate_institution
+
+# Index each hot query is expected to use.
+EXPECTED_INDEXES = {
+    "teacher_dashboard": "subject_teacher_active_idx",
+    "register_pending_subjects": "subject_pending_teacher_idx",
+    # The class and subject counts group by department, so SQLite reaches
+    # the live departments through the plain session index instead.
+    "manage_structure_departments": "teacher_department_session_id",
+    "department_classes": "class_live_idx",
+    "class_subjects": "subject_live_idx",
+    "schedule_conflicts": "schedule_teacher_slot_idx",
+    "roster": "enrollment_roster_idx",
+    "student_history": "attendance_student_idx",
+    "outbox_due": "outbox_due_idx",
+}
+
+
+class ExplainQueriesTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_institution(departments=1, classes=2, subjects=3, students=4, weeks=1)
+
+    @skipUnless(connection.vendor == "sqlite", "plan text is SQLite's")
+    def test_hot_queries_use_their_indexes(self):
+        plans = {name: plan for name, _, plan in explain_hot_queries()}
+        for name, index in EXPECTED_INDEXES.items():
+            with self.subTest(query=name):
+                self.assertIn(index, plans[name])
+
+    def test_every_query_explains(self):
+        names = [name for name, _ in hot_queries()]
+        self.assertEqual(len(names), len(set(names)))
+        self.assertEqual(len(explain_hot_queries()), len(names))
+
+    def test_command(self):
+        out = StringIO()
+        call_command("explain_queries", "--query", "roster", "--sql", stdout=out)
+        self.assertIn("roster", out.getvalue())
+        self.assertIn("SELECT", out.getvalue())
+
+        with self.assertRaises(CommandError):
+            call_command("explain_queries", "--query", "nope", stdout=StringIO())
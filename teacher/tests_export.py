@@ -0,0 +1,151 @@
+import csv
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+
+from student.models import Enrollment
+from teacher.export import matrix_rows, scoped_sessions
+from teacher.models import (
+    AcademicSession,
+    Attendance,
+    ClassSession,
+    Department,
+    StudentClass,
+    Subject,
+)
+
+User = get_user_model()
+
+
+class AttendanceExportTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.admin = User.objects.create_superuser("admin@example.com", "password")
+        self.teacher = User.objects.create_user(
+            email="teacher@example.com", password="password", role=User.Role.TEACHER
+        )
+
+        self.session = AcademicSession.objects.create(year_range="2090-2091")
+        self.dept = Department.objects.create(name="Science", session=self.session)
+        self.cls = StudentClass.objects.create(name="science-1", department=self.dept)
+        self.physics = Subject.objects.create(
+            name="Physics", student_class=self.cls, teacher=self.teacher
+        )
+        self.chemistry = Subject.objects.create(
+            name="Chemistry", student_class=self.cls
+        )
+
+        self.alice = User.objects.create_user(
+            email="alice@example.com", role=User.Role.STUDENT
+        )
+        self.bob = User.objects.create_user(
+            email="bob@example.com", role=User.Role.STUDENT
+        )
+        for day, subject, marks in (
+            (1, self.physics, {self.alice: True, self.bob: False}),
+            (2, self.chemistry, {self.alice: False}),
+            (9, self.physics, {self.alice: True}),
+        ):
+            class_session = ClassSession.objects.create(
+                subject=subject, date=datetime.date(2090, 9, day)
+            )
+            for student, is_present in marks.items():
+                Enrollment.objects.get_or_create(student=student, subject=subject)
+                Attendance.objects.create(
+                    session=class_session, student=student, is_present=is_present
+                )
+
+    def fetch(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        content = b"".join(response.streaming_content).decode()
+        return list(csv.reader(content.splitlines()))
+
+    def test_long_format_with_date_range(self):
+        self.client.force_login(self.admin)
+        rows = self.fetch(
+            f"/teacher/export/department/{self.dept.id}/?start=2090-09-01&end=2090-09-02"
+        )
+
+        self.assertEqual(
+            rows[0], ["date", "department", "class", "subject", "student", "status"]
+        )
+        self.assertEqual(
+            rows[1:],
+            [
+                [
+                    "2090-09-01",
+                    "science",
+                    "science-1",
+                    "physics",
+                    "alice@example.com",
+                    "Present",
+                ],
+                [
+                    "2090-09-01",
+                    "science",
+                    "science-1",
+                    "physics",
+                    "bob@example.com",
+                    "Absent",
+                ],
+                [
+                    "2090-09-02",
+                    "science",
+                    "science-1",
+                    "chemistry",
+                    "alice@example.com",
+                    "Absent",
+                ],
+            ],
+        )
+
+    def test_matrix_format(self):
+        self.client.force_login(self.admin)
+        rows = self.fetch(f"/teacher/export/session/{self.session.id}/?layout=matrix")
+
+        self.assertEqual(
+            rows,
+            [
+                [
+                    "student",
+                    "2090-09-01 physics",
+                    "2090-09-02 chemistry",
+                    "2090-09-09 physics",
+                ],
+                ["alice@example.com", "P", "A", "P"],
+                ["bob@example.com", "A", "", ""],
+            ],
+        )
+
+    def test_matrix_skips_sessions_added_mid_export(self):
+        rows = matrix_rows(scoped_sessions("session", self.session.id))
+        header = next(rows)
+
+        # Held after the header was read, for a student new to the export.
+        carol = User.objects.create_user(
+            email="carol@example.com", role=User.Role.STUDENT
+        )
+        late = ClassSession.objects.create(
+            subject=self.physics, date=datetime.date(2090, 9, 10)
+        )
+        for student in (self.alice, carol):
+            Attendance.objects.create(session=late, student=student, is_present=True)
+
+        self.assertEqual(len(header), 4)
+        self.assertEqual(
+            list(rows),
+            [["alice@example.com", "P", "A", "P"], ["bob@example.com", "A", "", ""]],
+        )
+
+    def test_teacher_limited_to_own_subject(self):
+        self.client.force_login(self.teacher)
+        rows = self.fetch(f"/teacher/export/subject/{self.physics.id}/")
+        self.assertEqual(len(rows), 4)
+
+        response = self.client.get(f"/teacher/export/subject/{self.chemistry.id}/")
+        self.assertEqual(response.status_code, 403)
+        response = self.client.get(f"/teacher/export/class/{self.cls.id}/")
+        self.assertEqual(response.status_code, 403)
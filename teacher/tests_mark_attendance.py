@@ -0,0 +1,104 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from student.models import Enrollment
+from teacher.attendance import save_attendance
+from teacher.models import (
+    AcademicSession,
+    Attendance,
+    ClassSchedule,
+    ClassSession,
+    Department,
+    StudentClass,
+    Subject,
+)
+
+User = get_user_model()
+
+
+class BulkAttendanceTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.teacher = User.objects.create_user(
+            email="teacher@example.com", password="password", role=User.Role.TEACHER
+        )
+        self.client.force_login(self.teacher)
+
+        self.session = AcademicSession.objects.create(
+            year_range="2090-2091", is_active=True
+        )
+        self.dept = Department.objects.create(name="Science", session=self.session)
+        self.cls = StudentClass.objects.create(name="science-1", department=self.dept)
+        self.subject = Subject.objects.create(
+            name="Physics", student_class=self.cls, teacher=self.teacher
+        )
+        ClassSchedule.objects.create(
+            subject=self.subject,
+            day_of_week=datetime.datetime.now().strftime("%a"),
+            start_time=datetime.time(0, 0),
+            end_time=datetime.time(23, 59),
+        )
+        self.student_count = 0
+
+    def add_students(self, count):
+        students = []
+        for _ in range(count):
+            self.student_count += 1
+            student = User.objects.create_user(
+                email=f"student{self.student_count}@example.com",
+                role=User.Role.STUDENT,
+            )
+            Enrollment.objects.create(student=student, subject=self.subject)
+            students.append(student)
+        return students
+
+    def test_submit_and_resubmit(self):
+        alice, bob, carol = self.add_students(3)
+        url = f"/teacher/class/{self.subject.id}/attendance/"
+
+        response = self.client.post(
+            url, {f"student_{alice.id}": "on", f"student_{bob.id}": "on"}, follow=True
+        )
+        self.assertContains(response, "3 recorded, 0 updated")
+        class_session = ClassSession.objects.get(subject=self.subject)
+        self.assertEqual(
+            set(
+                Attendance.objects.filter(
+                    session=class_session, is_present=True
+                ).values_list("student_id", flat=True)
+            ),
+            {alice.id, bob.id},
+        )
+        self.assertFalse(
+            Attendance.objects.get(session=class_session, student=carol).is_present
+        )
+
+        dave = self.add_students(1)[0]
+        response = self.client.post(url, {f"student_{carol.id}": "on"}, follow=True)
+        self.assertContains(response, "1 recorded, 3 updated")
+        present = set(
+            Attendance.objects.filter(session=class_session, is_present=True)
+            .values_list("student_id", flat=True)
+        )
+        self.assertEqual(present, {carol.id})
+        self.assertEqual(Attendance.objects.filter(student=dave).count(), 1)
+
+    def test_statement_count_is_flat(self):
+        class_session = ClassSession.objects.create(
+            subject=self.subject, date=datetime.date(2090, 9, 1)
+        )
+
+        def count_queries(students):
+            with CaptureQueriesContext(connection) as ctx:
+                save_attendance(class_session, [s.id for s in students])
+            return len(ctx.captured_queries)
+
+        small = count_queries(self.add_students(5))
+        large = count_queries(self.add_students(100))
+
+        self.assertEqual(small, large)
+        self.assertEqual(Attendance.objects.filter(session=class_session).count(), 105)
@@ -0,0 +1,80 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from teacher.models import AcademicSession, Department, StudentClass, Subject
+from teacher.structure import create_classes
+
+User = get_user_model()
+
+
+class SerialNamingTest(TestCase):
+    def setUp(self):
+        self.session = AcademicSession.objects.create(year_range="2090-2091")
+        self.dept = Department.objects.create(name="Science", session=self.session)
+
+    def test_class_names_fill_lowest_free_serial(self):
+        first = StudentClass.objects.create(department=self.dept)
+        second = StudentClass.objects.create(department=self.dept)
+        StudentClass.objects.create(department=self.dept)
+        self.assertEqual([first.name, second.name], ["science-1", "science-2"])
+
+        second.delete()
+        refill = StudentClass.objects.create(department=self.dept)
+        self.assertEqual(refill.name, "science-2")
+
+        # Saving an existing class keeps its name.
+        refill.is_active = False
+        refill.save()
+        refill.refresh_from_db()
+        self.assertEqual(refill.name, "science-2")
+
+    def test_subject_names_are_deduplicated(self):
+        cls = StudentClass.objects.create(department=self.dept)
+        names = [
+            Subject.objects.create(name="Physics", student_class=cls).name
+            for _ in range(3)
+        ]
+        self.assertEqual(names, ["physics", "physics-1", "physics-2"])
+
+        subject = Subject.objects.get(name="physics-1")
+        subject.save()
+        subject.refresh_from_db()
+        self.assertEqual(subject.name, "physics-1")
+
+    def test_create_query_count_is_flat(self):
+        with CaptureQueriesContext(connection) as small:
+            StudentClass.objects.create(department=self.dept)
+        create_classes(self.dept, 50)
+        with CaptureQueriesContext(connection) as large:
+            StudentClass.objects.create(department=self.dept)
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+    def test_bulk_create_classes(self):
+        StudentClass.objects.create(department=self.dept)
+        with CaptureQueriesContext(connection) as ctx:
+            classes = create_classes(self.dept, 100)
+        self.assertLessEqual(len(ctx.captured_queries), 6)
+        self.assertEqual(len(classes), 100)
+        self.assertEqual(classes[0].name, "science-2")
+        self.assertEqual(StudentClass.objects.filter(department=self.dept).count(), 101)
+
+    def test_add_class_view_with_count(self):
+        client = Client()
+        admin = User.objects.create_user(
+            "admin@example.com", None, role=User.Role.ADMIN, is_superuser=True
+        )
+        client.force_login(admin)
+        response = client.post(
+            "/teacher/structure/class/add/",
+            {"name": "", "department_id": self.dept.id, "count": "5"},
+        )
+        self.assertRedirects(response, "/teacher/structure/")
+        self.assertEqual(StudentClass.objects.filter(department=self.dept).count(), 5)
+
+        client.post(
+            "/teacher/structure/class/add/",
+            {"department_id": self.dept.id, "count": "0"},
+        )
+        self.assertEqual(StudentClass.objects.filter(department=self.dept).count(), 5)
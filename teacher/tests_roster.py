@@ -0,0 +1,137 @@
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import transaction
+from django.test import Client, TestCase
+
+from student.models import Enrollment
+from teacher.models import AcademicSession, Department, StudentClass, Subject
+from teacher.roster import import_roster
+from user.models import Invitation, OutgoingEmail
+
+User = get_user_model()
+
+
+class RosterImportTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.teacher = User.objects.create_user(
+            email="teacher@example.com", password="password", role=User.Role.TEACHER
+        )
+        self.client.force_login(self.teacher)
+
+        self.session = AcademicSession.objects.create(year_range="2090-2091")
+        self.dept = Department.objects.create(name="Science", session=self.session)
+        self.cls = StudentClass.objects.create(name="science-1", department=self.dept)
+        self.subject = Subject.objects.create(
+            name="Physics", student_class=self.cls, teacher=self.teacher
+        )
+        self.student = User.objects.create_user(
+            email="existing@example.com", role=User.Role.STUDENT
+        )
+
+    def test_upload_csv(self):
+        csv_data = (
+            "\ufeffEmail,First_Name,Last_Name\n"
+            "new@example.com,Ada,Lovelace\n"
+            "existing@example.com,,\n"
+            "not-an-email,Bad,Row\n"
+            "new@example.com,Ada,Again\n"
+            "teacher@example.com,,\n"
+        )
+        upload = SimpleUploadedFile("roster.csv", csv_data.encode("utf-8"))
+
+        response = self.client.post(
+            f"/teacher/class/{self.subject.id}/roster/", {"file": upload}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        report = response.context["report"]
+        self.assertEqual((report.rows, report.invited, report.enrolled), (5, 1, 1))
+        self.assertEqual(
+            [(e["line"], e["reason"]) for e in report.errors],
+            [(4, "Invalid email"), (5, "Duplicate row"), (6, "Not a student account")],
+        )
+
+        invitation = Invitation.objects.get(email="new@example.com")
+        self.assertEqual(invitation.class_id, self.subject.id)
+        self.assertEqual(invitation.first_name, "Ada")
+        self.assertTrue(
+            Enrollment.objects.filter(
+                student=self.student, subject=self.subject
+            ).exists()
+        )
+        self.assertEqual(OutgoingEmail.objects.get().recipient, "new@example.com")
+
+    def test_enrolled_count_skips_rows_enrolled_concurrently(self):
+        other = User.objects.create_user(
+            email="other@example.com", role=User.Role.STUDENT
+        )
+        atomic = transaction.atomic
+        raced = []
+
+        def enrolled_elsewhere_first(*args, **kwargs):
+            # Another import enrolls one student after this one checked.
+            if not raced:
+                raced.append(
+                    Enrollment.objects.create(
+                        student=self.student, subject=self.subject
+                    )
+                )
+            return atomic(*args, **kwargs)
+
+        with patch("teacher.roster.transaction.atomic", enrolled_elsewhere_first):
+            report = import_roster(
+                self.subject,
+                [(2, self.student.email, "", ""), (3, other.email, "", "")],
+            )
+
+        self.assertEqual(report.enrolled, 1)
+        self.assertEqual(Enrollment.objects.filter(subject=self.subject).count(), 2)
+
+    def test_invited_to_another_class_is_explained(self):
+        Invitation.objects.create(
+            email="pending@example.com",
+            token="00000000-0000-0000-0000-000000000001",
+            role=User.Role.STUDENT,
+            class_id=self.subject.id + 1,
+        )
+        report = import_roster(self.subject, [(2, "pending@example.com", "", "")])
+
+        self.assertEqual(report.invited, 0)
+        (error,) = report.errors
+        self.assertTrue(error["reason"].startswith("Already invited to another class"))
+        self.assertIn("once they have registered", error["reason"])
+
+    def test_missing_email_column(self):
+        upload = SimpleUploadedFile("roster.csv", b"name\nAda\n")
+        response = self.client.post(
+            f"/teacher/class/{self.subject.id}/roster/", {"file": upload}
+        )
+        self.assertContains(response, "must contain an")
+        self.assertIsNone(response.context["report"])
+
+    def test_command_imports_in_chunks(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as f:
+            f.write("email\n")
+            for n in range(25):
+                f.write(f"student{n}@example.com\n")
+        self.addCleanup(os.unlink, f.name)
+
+        out = StringIO()
+        with patch("teacher.roster.CHUNK_SIZE", 10):
+            call_command("import_roster", self.subject.id, f.name, stdout=out)
+
+        output = out.getvalue()
+        self.assertIn("10 rows: 10 invited", output)
+        self.assertIn("Imported 25 of 25 rows.", output)
+        self.assertEqual(
+            Invitation.objects.filter(class_id=self.subject.id).count(), 25
+        )
+        # No --base-url, so no links to send.
+        self.assertFalse(OutgoingEmail.objects.exists())
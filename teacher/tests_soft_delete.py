@@ -50,7 +50,7 @@ class SoftDeleteTest(TestCase):
         dead_subject = Subject.objects.create(
             name="Dead Subject", student_class=self.cls, is_dead=True
         )
-        response = self.client.get("/teacher/structure/")
+        response = self.client.get(f"/teacher/structure/class/{self.cls.id}/subjects/")
         self.assertContains(response, "subj 1")
         self.assertNotContains(response, "dead subject")
 
@@ -53,5 +53,7 @@ class AcademicStructureTest(TestCase):
         response = self.client.get("/teacher/structure/")
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, "science")
+        response = self.client.get(f"/teacher/structure/department/{dept.id}/classes/")
         self.assertContains(response, "science-1")
+        response = self.client.get(f"/teacher/structure/class/{cls.id}/subjects/")
         self.assertContains(response, "physics")
@@ -0,0 +1,88 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from teacher.models import AcademicSession, Department, StudentClass, Subject
+from teacher.structure import create_classes
+from teacher.views_structure import CLASSES_PER_PAGE
+
+User = get_user_model()
+
+
+class StructureTreeTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.admin = User.objects.create_user(
+            "admin@example.com", None, role=User.Role.ADMIN, is_superuser=True
+        )
+        self.client.force_login(self.admin)
+        self.session = AcademicSession.objects.create(
+            year_range="2090-2091", is_active=True
+        )
+        self.dept = Department.objects.create(name="Science", session=self.session)
+
+    def add_history(self, years):
+        for year in years:
+            old = AcademicSession.objects.create(year_range=f"{year}-{year + 1}")
+            dept = Department.objects.create(name=f"Old {year}", session=old)
+            for cls in create_classes(dept, 3):
+                Subject.objects.create(name="History", student_class=cls)
+
+    def count_page_queries(self):
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/teacher/structure/")
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response
+
+    def test_only_selected_session_is_rendered(self):
+        self.add_history([2000])
+        small, _ = self.count_page_queries()
+        self.add_history(range(2001, 2010))
+        large, response = self.count_page_queries()
+        self.assertEqual(small, large)
+        self.assertContains(response, "science")
+        self.assertNotContains(response, "old 2001")
+
+        old = AcademicSession.objects.get(year_range="2001-2002")
+        response = self.client.get(f"/teacher/structure/?session={old.id}")
+        self.assertContains(response, "old 2001")
+        self.assertNotContains(response, "science")
+
+    def test_classes_are_paginated_with_counts(self):
+        classes = create_classes(self.dept, CLASSES_PER_PAGE + 1)
+        Subject.objects.create(name="Physics", student_class=classes[0])
+        Subject.objects.create(name="Dead", student_class=classes[0], is_dead=True)
+
+        url = f"/teacher/structure/department/{self.dept.id}/classes/"
+        data = self.client.get(url, {"format": "json"}).json()
+        self.assertEqual(len(data["classes"]), CLASSES_PER_PAGE)
+        self.assertTrue(data["has_next"])
+        self.assertEqual(data["classes"][0]["subject_count"], 1)
+
+        response = self.client.get(url, {"page": 2})
+        self.assertContains(response, f"science-{CLASSES_PER_PAGE + 1}")
+        self.assertNotContains(response, "Load more classes")
+
+    def test_class_subjects_json(self):
+        cls = StudentClass.objects.create(department=self.dept)
+        Subject.objects.create(
+            name="Physics", student_class=cls, days=["Mon"], timing="10:00"
+        )
+        data = self.client.get(
+            f"/teacher/structure/class/{cls.id}/subjects/", {"format": "json"}
+        ).json()
+        self.assertEqual(data["subjects"][0]["timing"], "10:00:00")
+        self.assertEqual(data["subjects"][0]["days"], ["Mon"])
+
+    def test_fragments_require_admin(self):
+        teacher = User.objects.create_user(
+            "teacher@example.com", None, role=User.Role.TEACHER
+        )
+        self.client.force_login(teacher)
+        response = self.client.get(
+            f"/teacher/structure/department/{self.dept.id}/classes/"
+        )
+        self.assertEqual(response.status_code, 302)
@@ -0,0 +1,197 @@
+import datetime
+from importlib import import_module
+from io import StringIO
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import Client, TestCase
+
+from teacher.models import (
+    AcademicSession,
+    ClassSchedule,
+    Department,
+    StudentClass,
+    Subject,
+)
+from teacher.timetable import Slot, find_conflicts, open_schedule, validate_timetable
+
+User = get_user_model()
+
+
+def slot(day, start, end, label="x", teacher="t@example.com"):
+    return Slot(
+        teacher,
+        day,
+        datetime.time.fromisoformat(start),
+        datetime.time.fromisoformat(end),
+        label,
+    )
+
+
+class TimetableTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.admin = User.objects.create_user(
+            "admin@example.com", None, role=User.Role.ADMIN, is_superuser=True
+        )
+        self.client.force_login(self.admin)
+        self.session = AcademicSession.objects.create(
+            year_range="2090-2091", is_active=True
+        )
+        dept = Department.objects.create(name="Science", session=self.session)
+        self.cls = StudentClass.objects.create(department=dept)
+
+    def add_subject(self, name, days, timing, email="teacher@example.com"):
+        return self.client.post(
+            "/teacher/structure/subject/add/",
+            {
+                "name": name,
+                "class_id": self.cls.id,
+                "days": days,
+                "timing": timing,
+                "teacher_email": email,
+            },
+        )
+
+    def test_add_subject_indexes_schedule(self):
+        self.add_subject("Physics", ["Mon", "Wed"], "10:00")
+        rows = ClassSchedule.objects.filter(subject__name="physics")
+        self.assertEqual(
+            sorted(rows.values_list("day_of_week", flat=True)), ["Mon", "Wed"]
+        )
+        self.assertEqual(rows[0].end_time, datetime.time(11, 0))
+        self.assertEqual(rows[0].teacher_email, "teacher@example.com")
+
+    def test_overlapping_interval_is_rejected(self):
+        self.add_subject("Physics", ["Mon", "Wed"], "10:00")
+        # Starts half way through the physics class on a shared day.
+        self.add_subject("Chemistry", ["Wed"], "10:30")
+        self.assertFalse(Subject.objects.filter(name="chemistry").exists())
+
+        # Back to back and on other days is fine.
+        self.add_subject("Biology", ["Wed"], "11:00")
+        self.add_subject("Maths", ["Tue"], "10:30")
+        self.add_subject("Art", ["Mon"], "10:30", email="other@example.com")
+        self.assertEqual(Subject.objects.count(), 4)
+
+    def test_inactive_subjects_do_not_conflict(self):
+        self.add_subject("Physics", ["Mon"], "10:00")
+        Subject.objects.filter(name="physics").update(is_active=False)
+        self.assertFalse(find_conflicts("teacher@example.com", ["Mon"], "10:15"))
+
+    def test_validate_timetable(self):
+        slots = [
+            slot("Mon", "09:00", "10:00", "a"),
+            slot("Mon", "10:00", "11:00", "b"),
+            slot("Mon", "09:00", "12:00", "c"),
+            slot("Tue", "09:00", "10:00", "d"),
+            slot("Mon", "09:30", "10:30", "e", teacher="u@example.com"),
+        ]
+        conflicts = validate_timetable(slots)
+        pairs = sorted(
+            tuple(sorted((c.first.label, c.second.label))) for c in conflicts
+        )
+        self.assertEqual(pairs, [("a", "c"), ("b", "c")])
+
+    def test_validate_timetable_command(self):
+        Subject.objects.create(
+            name="Physics",
+            student_class=self.cls,
+            days=["Fri"],
+            timing="09:00",
+            teacher_email="teacher@example.com",
+        )
+        call_command("validate_timetable", stdout=StringIO())
+
+        Subject.objects.create(
+            name="Chemistry",
+            student_class=self.cls,
+            days=["Fri"],
+            timing="09:45",
+            teacher_email="teacher@example.com",
+        )
+        with self.assertRaises(CommandError):
+            call_command("validate_timetable", stdout=StringIO())
+
+
+class ScheduleSyncTest(TestCase):
+    def setUp(self):
+        session = AcademicSession.objects.create(year_range="2090-2091")
+        dept = Department.objects.create(name="Science", session=session)
+        self.cls = StudentClass.objects.create(department=dept)
+        self.subject = Subject.objects.create(
+            name="Physics",
+            student_class=self.cls,
+            days=["Mon", "Wed"],
+            timing="10:00",
+            teacher_email="teacher@example.com",
+        )
+
+    def schedule(self):
+        return {
+            row.day_of_week: (row.pk, row.start_time)
+            for row in ClassSchedule.objects.filter(subject=self.subject)
+        }
+
+    def test_subject_changes_are_synced(self):
+        before = self.schedule()
+        self.assertEqual(set(before), {"Mon", "Wed"})
+
+        self.subject.days = ["Mon", "Fri"]
+        self.subject.timing = datetime.time(14, 0)
+        self.subject.save()
+        after = self.schedule()
+        self.assertEqual(set(after), {"Mon", "Fri"})
+        # Monday's row is updated in place rather than recreated.
+        self.assertEqual(after["Mon"], (before["Mon"][0], datetime.time(14, 0)))
+
+        self.subject.timing = None
+        self.subject.save()
+        self.assertEqual(self.schedule(), {})
+
+    def test_backfill_command(self):
+        ClassSchedule.objects.all().delete()
+        call_command("sync_schedules", "--batch-size", "1", stdout=StringIO())
+        self.assertEqual(set(self.schedule()), {"Mon", "Wed"})
+
+    def test_duplicate_days_get_one_row(self):
+        self.subject.days = ["Mon", "Wed", "Mon"]
+        self.subject.save()
+        self.assertEqual(
+            sorted(
+                ClassSchedule.objects.filter(subject=self.subject).values_list(
+                    "day_of_week", flat=True
+                )
+            ),
+            ["Mon", "Wed"],
+        )
+
+    def test_backfill_migration(self):
+        migration = import_module("teacher.migrations.0004_backfill_class_schedules")
+        ClassSchedule.objects.filter(day_of_week="Wed").delete()
+        monday = self.schedule()["Mon"]
+
+        migration.backfill_class_schedules(apps, None)
+
+        after = self.schedule()
+        self.assertEqual(set(after), {"Mon", "Wed"})
+        self.assertEqual(after["Mon"], monday)
+        self.assertEqual(
+            ClassSchedule.objects.get(subject=self.subject, day_of_week="Wed").end_time,
+            datetime.time(11, 0),
+        )
+
+    def test_open_schedule(self):
+        monday = datetime.date(2090, 1, 2)  # a Monday
+
+        def at(hour, minute):
+            return datetime.datetime.combine(monday, datetime.time(hour, minute))
+
+        self.assertIsNone(open_schedule(self.subject, at(10, 30)))
+        self.assertIsNotNone(open_schedule(self.subject, at(10, 45)))
+        self.assertIsNotNone(open_schedule(self.subject, at(11, 0)))
+        self.assertIsNone(open_schedule(self.subject, at(11, 1)))
+        self.assertIsNone(
+            open_schedule(self.subject, at(10, 50) + datetime.timedelta(days=1))
+        )
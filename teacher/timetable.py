@@ -0,0 +1,203 @@
+import datetime
+from collections import defaultdict
+from typing import NamedTuple
+
+from .models import ClassSchedule, Subject
+
+# Subjects only store a start time; every class is assumed to run this long.
+SLOT_LENGTH = datetime.timedelta(hours=1)
+# Attendance can be marked during the last part of a class.
+MARKING_WINDOW = datetime.timedelta(minutes=15)
+
+
+class Slot(NamedTuple):
+    teacher_email: str
+    day: str
+    start: datetime.time
+    end: datetime.time
+    label: str
+
+
+class Conflict(NamedTuple):
+    day: str
+    first: Slot
+    second: Slot
+
+    def __str__(self):
+        return (
+            f"{self.first.teacher_email} on {self.day}: '{self.first.label}' "
+            f"({self.first.start:%H:%M}-{self.first.end:%H:%M}) overlaps "
+            f"'{self.second.label}' ({self.second.start:%H:%M}-{self.second.end:%H:%M})"
+        )
+
+
+def slot_end(start):
+    """End of a class starting at `start`, capped at midnight."""
+    end = datetime.datetime.combine(datetime.date.min, start) + SLOT_LENGTH
+    if end.date() > datetime.date.min:
+        return datetime.time.max
+    return end.time()
+
+
+def parse_time(value):
+    if isinstance(value, datetime.time) or value is None:
+        return value
+    return datetime.time.fromisoformat(value)
+
+
+def schedule_rows(subject):
+    """Unsaved ClassSchedule rows for each distinct day `subject` is taught."""
+    start = parse_time(subject.timing)
+    if start is None:
+        return []
+    end = slot_end(start)
+    return [
+        ClassSchedule(
+            subject=subject,
+            teacher_email=subject.teacher_email,
+            day_of_week=day,
+            start_time=start,
+            end_time=end,
+        )
+        for day in dict.fromkeys(subject.days)
+    ]
+
+
+def sync_schedules(subjects):
+    """
+    Make the ClassSchedule rows of `subjects` match their days and timing.
+
+    Rows are matched on (subject, day) and updated in place, so sessions
+    already linked to a schedule keep their link when only the time or the
+    teacher changes. Costs one read plus at most one bulk create, update
+    and delete, however many subjects are passed.
+    """
+    subjects = list(subjects)
+    if not subjects:
+        return
+    existing = {
+        (row.subject_id, row.day_of_week): row
+        for row in ClassSchedule.objects.filter(subject__in=subjects)
+    }
+    to_create, to_update = [], []
+    for subject in subjects:
+        for row in schedule_rows(subject):
+            current = existing.pop((subject.pk, row.day_of_week), None)
+            if current is None:
+                to_create.append(row)
+            elif (current.start_time, current.end_time, current.teacher_email) != (
+                row.start_time,
+                row.end_time,
+                row.teacher_email,
+            ):
+                current.start_time = row.start_time
+                current.end_time = row.end_time
+                current.teacher_email = row.teacher_email
+                to_update.append(current)
+
+    if to_create:
+        ClassSchedule.objects.bulk_create(to_create, batch_size=1000)
+    if to_update:
+        ClassSchedule.objects.bulk_update(
+            to_update, ["start_time", "end_time", "teacher_email"], batch_size=1000
+        )
+    if existing:
+        ClassSchedule.objects.filter(
+            pk__in=[row.pk for row in existing.values()]
+        ).delete()
+
+
+def open_schedule(subject, now):
+    """
+    The schedule of `subject` whose marking window contains `now`: it runs
+    today and ends within the next MARKING_WINDOW.
+
+    One range lookup on the (subject, day_of_week, end_time) index.
+    """
+    current_time = now.time()
+    window_end = now + MARKING_WINDOW
+    latest_end = (
+        window_end.time() if window_end.date() == now.date() else datetime.time.max
+    )
+    return (
+        ClassSchedule.objects.filter(
+            subject=subject,
+            day_of_week=now.strftime("%a"),
+            end_time__gte=current_time,
+            end_time__lte=latest_end,
+        )
+        .order_by("end_time")
+        .first()
+    )
+
+
+def find_conflicts(teacher_email, days, start, exclude_subject=None):
+    """
+    Live schedule rows of `teacher_email` that overlap a class starting at
+    `start` on any of `days`.
+
+    A single lookup on the (teacher_email, day_of_week, start_time) index;
+    intervals overlap when each one starts before the other ends.
+    """
+    start = parse_time(start)
+    rows = ClassSchedule.objects.filter(
+        teacher_email=teacher_email,
+        day_of_week__in=days,
+        start_time__lt=slot_end(start),
+        end_time__gt=start,
+        subject__is_active=True,
+        subject__is_dead=False,
+    ).select_related("subject__student_class")
+    if exclude_subject is not None:
+        rows = rows.exclude(subject=exclude_subject)
+    return rows
+
+
+def subject_slots(subjects):
+    """Slots for every (subject, day) pair of `subjects`."""
+    for subject in subjects:
+        start = parse_time(subject.timing)
+        if start is None or not subject.teacher_email:
+            continue
+        label = f"{subject.name} ({subject.student_class.name})"
+        for day in dict.fromkeys(subject.days):
+            yield Slot(subject.teacher_email, day, start, slot_end(start), label)
+
+
+def validate_timetable(slots):
+    """
+    Every pair of overlapping slots for the same teacher and day in `slots`.
+
+    Slots are grouped by (teacher, day) and swept in start order, so a term
+    with thousands of subjects is checked in O(n log n) without touching the
+    database. Each slot is reported against the earlier slot it overlaps
+    that ends last.
+    """
+    groups = defaultdict(list)
+    for slot in slots:
+        groups[slot.teacher_email, slot.day].append(slot)
+
+    conflicts = []
+    for (_, day), group in sorted(groups.items()):
+        group.sort(key=lambda slot: (slot.start, slot.end))
+        latest = group[0]
+        for slot in group[1:]:
+            if slot.start < latest.end:
+                conflicts.append(Conflict(day, latest, slot))
+            if slot.end > latest.end:
+                latest = slot
+    return conflicts
+
+
+def session_slots(session):
+    """Slots of all live subjects in an academic session."""
+    subjects = (
+        Subject.objects.filter(
+            student_class__department__session=session,
+            is_active=True,
+            is_dead=False,
+        )
+        .select_related("student_class")
+        .only("name", "days", "timing", "teacher_email", "student_class__name")
+    )
+    return subject_slots(subjects.iterator(chunk_size=1000))
@@ -1,19 +1,40 @@
 from django.urls import path
 
-from . import views, views_structure
+from . import views, views_export, views_report, views_structure
 
 urlpatterns = [
     path("dashboard/", views.teacher_dashboard, name="teacher_dashboard"),
     path("dashboard/", views.teacher_dashboard, name="teacher_dashboard"),
     path("class/<int:class_id>/invite/", views.invite_student, name="invite_student"),
+    path("class/<int:class_id>/roster/", views.upload_roster, name="upload_roster"),
     path(
         "class/<int:class_id>/attendance/",
         views.mark_attendance,
         name="mark_attendance",
     ),
     path("class/<int:class_id>/details/", views.class_details, name="class_details"),
+    path(
+        "export/<str:scope>/<int:pk>/",
+        views_export.export_attendance,
+        name="export_attendance",
+    ),
+    path(
+        "report/<str:scope>/<int:pk>/",
+        views_report.attendance_report_view,
+        name="attendance_report",
+    ),
     # Structure Management
     path("structure/", views_structure.manage_structure, name="manage_structure"),
+    path(
+        "structure/department/<int:dept_id>/classes/",
+        views_structure.department_classes,
+        name="department_classes",
+    ),
+    path(
+        "structure/class/<int:class_id>/subjects/",
+        views_structure.class_subjects,
+        name="class_subjects",
+    ),
     path(
         "structure/department/add/",
         views_structure.add_department,
@@ -22,6 +43,11 @@ urlpatterns = [
     path("structure/class/add/", views_structure.add_class, name="add_class"),
     path("structure/subject/add/", views_structure.add_subject, name="add_subject"),
     # Delete Routes
+    path(
+        "structure/session/<int:session_id>/delete/",
+        views_structure.delete_session,
+        name="delete_session",
+    ),
     path(
         "structure/department/<int:dept_id>/delete/",
         views_structure.delete_department,
@@ -0,0 +1,51 @@
+"""
+Async variants of the read-heavy teacher views, served in place of the
+sync ones when ASYNC_VIEWS is set (see classcheck/urls_async.py).
+
+Each view resolves request.user through request.auser() before rendering,
+so the auth context processor does not fall back to a sync lookup.
+"""
+
+import datetime
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import aget_object_or_404, render
+
+from user.decorators import teacher_required
+
+from .attendance import abuild_attendance_grid
+from .dashboard import render_class_list
+from .models import Subject
+
+
+@login_required
+async def teacher_dashboard(request):
+    request.user = await request.auser()
+    # Served from the shared cache; only a miss reaches the database.
+    class_list = await sync_to_async(render_class_list)(request.user)
+    return render(request, "teacher/dashboard.html", {"class_list": class_list})
+
+
+@teacher_required
+async def class_details(request, class_id):
+    request.user = await request.auser()
+    subject = await aget_object_or_404(Subject, id=class_id, teacher=request.user)
+    date_str = request.GET.get("date")
+    if date_str:
+        date = datetime.datetime.strptime(date_str, "%Y-%m-%d").date()
+    else:
+        date = datetime.date.today()
+
+    sessions, student_data = await abuild_attendance_grid(subject, date)
+
+    return render(
+        request,
+        "teacher/class_details.html",
+        {
+            "subject": subject,
+            "date": date,
+            "sessions": sessions,
+            "student_data": student_data,
+        },
+    )
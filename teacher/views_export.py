@@ -0,0 +1,29 @@
+from django.contrib.auth.decorators import login_required
+from django.http import StreamingHttpResponse
+
+from .export import csv_lines, long_rows, matrix_rows, scoped_sessions
+from .scopes import check_scope, parse_date
+
+
+@login_required
+def export_attendance(request, scope, pk):
+    """
+    Stream the attendance register for a subject, class, department or
+    academic session as CSV.
+
+    Admins may export any scope; teachers only their own subjects.
+    ?start= and ?end= bound the dates and ?layout=matrix switches from one
+    row per mark to one row per student.
+    """
+    check_scope(request.user, scope, pk)
+
+    start = parse_date(request.GET.get("start"))
+    end = parse_date(request.GET.get("end"))
+    sessions = scoped_sessions(scope, pk, start, end)
+    rows = matrix_rows if request.GET.get("layout") == "matrix" else long_rows
+
+    response = StreamingHttpResponse(csv_lines(rows(sessions)), content_type="text/csv")
+    response["Content-Disposition"] = (
+        f'attachment; filename="attendance-{scope}-{pk}.csv"'
+    )
+    return response
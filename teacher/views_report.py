@@ -0,0 +1,72 @@
+from django.contrib.auth.decorators import login_required
+from django.http import Http404
+from django.shortcuts import get_object_or_404, render
+
+from .analytics import ATTENDANCE_THRESHOLD, RECENT_WINDOW, attendance_report
+from .export import scoped_sessions
+from .scopes import SCOPE_MODELS, check_scope, parse_date
+
+
+def _parse_int(value, default, low, high):
+    if not value:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise Http404("Expected a whole number.")
+    if not low <= number <= high:
+        raise Http404(f"Expected a number from {low} to {high}.")
+    return number
+
+
+@login_required
+def attendance_report_view(request, scope, pk):
+    """
+    Attendance rates, streaks and below-threshold lists for a subject,
+    class, department or academic session.
+
+    Admins may view any scope; teachers only their own subjects.
+    ?start= and ?end= bound the dates, ?threshold= sets the percentage
+    students must reach and ?window= the number of recent sessions.
+    """
+    check_scope(request.user, scope, pk)
+    target = get_object_or_404(SCOPE_MODELS[scope], pk=pk)
+
+    start = parse_date(request.GET.get("start"))
+    end = parse_date(request.GET.get("end"))
+    report = attendance_report(
+        scoped_sessions(scope, pk, start, end),
+        threshold=_parse_int(
+            request.GET.get("threshold"), ATTENDANCE_THRESHOLD, 1, 100
+        ),
+        window=_parse_int(request.GET.get("window"), RECENT_WINDOW, 1, 1000),
+    )
+    # Breakdowns with a single row would only repeat the overall figure.
+    groups = [
+        (title, rows)
+        for title, rows in (
+            ("Departments", report["departments"]),
+            ("Classes", report["classes"]),
+            ("Subjects", report["subjects"]),
+        )
+        if len(rows) > 1
+    ]
+    if scope != "subject" and report["students_below_threshold"]:
+        groups.append(
+            (
+                f"Students below {report['threshold']}% overall",
+                report["students_below_threshold"],
+            )
+        )
+    return render(
+        request,
+        "teacher/attendance_report.html",
+        {
+            "scope": scope,
+            "target": target,
+            "start": start,
+            "end": end,
+            "report": report,
+            "groups": groups,
+        },
+    )
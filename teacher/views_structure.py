@@ -6,60 +6,171 @@ from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.core.mail import send_mail
 from django.contrib.auth.decorators import user_passes_test
-from django.db.models import Prefetch
+from django.core.paginator import Paginator
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.views.decorators.http import require_POST
 
 from user.models import Invitation
-
-from .models import AcademicSession, Department, StudentClass, Subject
+from user.stats import invalidate_dashboard_stats
+
+from .dashboard import invalidate_teacher_dashboards
+from .models import (
+    AcademicSession,
+    Department,
+    StudentClass,
+    Subject,
+)
+from .structure import (
+    create_classes,
+    live_classes,
+    live_departments,
+    live_subjects,
+    set_active,
+    subtree_teacher_ids,
+)
+from .timetable import find_conflicts
+
+MAX_BULK_CLASSES = 200
+DEPARTMENTS_PER_PAGE = 20
+CLASSES_PER_PAGE = 24
+SUBJECTS_PER_PAGE = 50
+
+DAYS_OF_WEEK = [
+    ("Mon", "Monday"),
+    ("Tue", "Tuesday"),
+    ("Wed", "Wednesday"),
+    ("Thu", "Thursday"),
+    ("Fri", "Friday"),
+    ("Sat", "Saturday"),
+    ("Sun", "Sunday"),
+]
 
 
 def is_admin(user):
     return user.is_authenticated and user.is_admin()
 
 
+def _wants_json(request):
+    return request.GET.get("format") == "json"
+
+
 @user_passes_test(is_admin)
 def manage_structure(request):
-    sessions = AcademicSession.objects.prefetch_related(
-        Prefetch(
-            "departments",
-            queryset=Department.objects.filter(is_dead=False).prefetch_related(
-                Prefetch(
-                    "classes",
-                    queryset=StudentClass.objects.filter(
-                        is_dead=False
-                    ).prefetch_related(
-                        Prefetch(
-                            "subjects", queryset=Subject.objects.filter(is_dead=False)
-                        )
-                    ),
-                )
-            ),
+    """
+    Structure page for one academic session: the one picked with ?session,
+    else the newest active one. Departments are paginated and carry their
+    class and subject counts; classes and subjects are fetched on demand
+    from department_classes and class_subjects.
+    """
+    sessions = list(
+        AcademicSession.objects.order_by("-created_at").values(
+            "id", "year_range", "is_active"
+        )
+    )
+    selected = None
+    try:
+        session_id = int(request.GET.get("session", ""))
+    except ValueError:
+        session_id = None
+    for candidate in sessions:
+        if candidate["id"] == session_id:
+            selected = candidate
+            break
+    if selected is None:
+        selected = next((s for s in sessions if s["is_active"]), None) or (
+            sessions[0] if sessions else None
         )
-    ).order_by("-created_at")
+
+    departments = None
+    if selected:
+        departments = Paginator(
+            live_departments(selected["id"]), DEPARTMENTS_PER_PAGE
+        ).get_page(request.GET.get("page"))
 
     current_year = datetime.now().year
     next_year = current_year + 1
     default_session_name = f"{current_year}-{next_year}"
 
-    days_of_week = [
-        ("Mon", "Monday"),
-        ("Tue", "Tuesday"),
-        ("Wed", "Wednesday"),
-        ("Thu", "Thursday"),
-        ("Fri", "Friday"),
-        ("Sat", "Saturday"),
-        ("Sun", "Sunday"),
-    ]
-
     context = {
         "sessions": sessions,
+        "session": selected,
+        "departments": departments,
         "default_session_name": default_session_name,
-        "days_of_week": days_of_week,
     }
     return render(request, "teacher/manage_structure.html", context)
 
 
+@user_passes_test(is_admin)
+def department_classes(request, dept_id):
+    """One page of a department's classes with subject counts, as HTML or JSON."""
+    dept = get_object_or_404(Department, id=dept_id)
+    classes = Paginator(live_classes(dept.id), CLASSES_PER_PAGE).get_page(
+        request.GET.get("page")
+    )
+
+    if _wants_json(request):
+        return JsonResponse(
+            {
+                "department": dept.id,
+                "page": classes.number,
+                "pages": classes.paginator.num_pages,
+                "has_next": classes.has_next(),
+                "classes": [
+                    {
+                        "id": cls.id,
+                        "name": cls.name,
+                        "is_active": cls.is_active,
+                        "subject_count": cls.subject_count,
+                    }
+                    for cls in classes
+                ],
+            }
+        )
+    return render(
+        request,
+        "teacher/structure/_classes.html",
+        {"dept": dept, "classes": classes, "days_of_week": DAYS_OF_WEEK},
+    )
+
+
+@user_passes_test(is_admin)
+def class_subjects(request, class_id):
+    """One page of a class's subjects, as HTML or JSON."""
+    student_class = get_object_or_404(StudentClass, id=class_id)
+    subjects = Paginator(live_subjects(student_class.id), SUBJECTS_PER_PAGE).get_page(
+        request.GET.get("page")
+    )
+
+    if _wants_json(request):
+        return JsonResponse(
+            {
+                "class": student_class.id,
+                "page": subjects.number,
+                "pages": subjects.paginator.num_pages,
+                "has_next": subjects.has_next(),
+                "subjects": [
+                    {
+                        "id": subject.id,
+                        "name": subject.name,
+                        "is_active": subject.is_active,
+                        "days": subject.days,
+                        "timing": subject.timing.isoformat()
+                        if subject.timing
+                        else None,
+                        "teacher_email": subject.teacher_email,
+                    }
+                    for subject in subjects
+                ],
+            }
+        )
+    return render(
+        request,
+        "teacher/structure/_subjects.html",
+        {"cls": student_class, "subjects": subjects},
+    )
+
+
 @user_passes_test(is_admin)
 def add_department(request):
     if request.method == "POST":
@@ -97,6 +208,7 @@ def add_department(request):
             )
         else:
             Department.objects.create(name=dept_name, session=session)
+            invalidate_dashboard_stats()
             messages.success(
                 request,
                 f"Department '{dept_name}' added to session '{session.year_range}'.",
@@ -112,8 +224,29 @@ def add_class(request):
         dept_id = request.POST.get("department_id")
 
         department = get_object_or_404(Department, id=dept_id)
-        StudentClass.objects.create(name=class_name, department=department)
-        messages.success(request, f"Class '{class_name}' added to '{department.name}'.")
+        try:
+            count = int(request.POST.get("count") or 1)
+        except ValueError:
+            count = 0
+        if not 1 <= count <= MAX_BULK_CLASSES:
+            messages.error(
+                request, f"Number of classes must be between 1 and {MAX_BULK_CLASSES}."
+            )
+            return redirect("manage_structure")
+
+        if count == 1:
+            StudentClass.objects.create(name=class_name, department=department)
+            messages.success(
+                request, f"Class '{class_name}' added to '{department.name}'."
+            )
+        else:
+            classes = create_classes(department, count)
+            messages.success(
+                request,
+                f"{len(classes)} classes added to '{department.name}' "
+                f"({classes[0].name} to {classes[-1].name}).",
+            )
+        invalidate_dashboard_stats()
 
     return redirect("manage_structure")
 
@@ -123,8 +256,9 @@ def add_subject(request):
     if request.method == "POST":
         subject_name = request.POST.get("name")
         class_id = request.POST.get("class_id")
-        days_str = request.POST.get("days")
-        days = days_str.split(",") if days_str else []
+        days = request.POST.getlist("days")
+        if len(days) == 1 and "," in days[0]:
+            days = days[0].split(",")
         timing = request.POST.get("timing")
         teacher_email = request.POST.get("teacher_email")
 
@@ -133,17 +267,16 @@ def add_subject(request):
             return redirect("manage_structure")
 
         # Conflict Detection
-        conflicting_subjects = Subject.objects.filter(
-            teacher_email=teacher_email, timing=timing, is_active=True, is_dead=False
-        )
-
-        for subj in conflicting_subjects:
-            # Check for intersection in days
-            # days is a list like ['Mon', 'Wed']
-            if any(day in subj.days for day in days):
+        if timing:
+            try:
+                conflict = find_conflicts(teacher_email, days, timing).first()
+            except ValueError:
+                messages.error(request, f"Invalid class time '{timing}'.")
+                return redirect("manage_structure")
+            if conflict:
                 messages.error(
                     request,
-                    f"Conflict: Teacher is already assigned to '{subj.name}' ({subj.student_class.name}) at {timing} on overlapping days.",
+                    f"Conflict: Teacher is already assigned to '{conflict.subject.name}' ({conflict.subject.student_class.name}) on {conflict.day_of_week} from {conflict.start_time:%H:%M} to {conflict.end_time:%H:%M}.",
                 )
                 return redirect("manage_structure")
 
@@ -161,6 +294,8 @@ def add_subject(request):
                 teacher_email=teacher_email,
                 teacher=user
             )
+            invalidate_dashboard_stats()
+            invalidate_teacher_dashboards([user.pk])
             messages.success(
                 request, f"Subject '{subject_name}' added to '{student_class.name}' and assigned to {user.email}."
             )
@@ -198,6 +333,7 @@ def add_subject(request):
                     timing=timing,
                     teacher_email=teacher_email,
                 )
+                invalidate_dashboard_stats()
                 
                 messages.success(
                     request, f"Subject '{subject_name}' added. Invitation sent to {teacher_email}."
@@ -212,69 +348,92 @@ def add_subject(request):
 
 
 @user_passes_test(is_admin)
+@require_POST
+def delete_session(request, session_id):
+    session = get_object_or_404(AcademicSession, id=session_id)
+    teacher_ids = subtree_teacher_ids(session)
+    if "restore" in request.POST:
+        set_active(session, True)
+        messages.success(
+            request, f"Session '{session.year_range}' and its contents restored."
+        )
+    elif "hard_delete" in request.POST:
+        year_range = session.year_range
+        session.delete()
+        messages.success(request, f"Session '{year_range}' permanently deleted.")
+    else:
+        set_active(session, False)
+        messages.warning(
+            request, f"Session '{session.year_range}' and its contents deactivated."
+        )
+    invalidate_dashboard_stats()
+    invalidate_teacher_dashboards(teacher_ids)
+    return redirect("manage_structure")
+
+
+@user_passes_test(is_admin)
+@require_POST
 def delete_department(request, dept_id):
     dept = get_object_or_404(Department, id=dept_id)
+    teacher_ids = subtree_teacher_ids(dept)
     if "restore" in request.POST:
-        dept.is_active = True
-        dept.save()
-        messages.success(request, f"Department '{dept.name}' restored.")
+        set_active(dept, True)
+        messages.success(
+            request, f"Department '{dept.name}' and its contents restored."
+        )
     elif "hard_delete" in request.POST:
         dept_name = dept.name
         dept.delete()
         messages.success(request, f"Department '{dept_name}' permanently deleted.")
     else:
-        dept.is_active = False
-        dept.save()
-        # Cascading deactivation
-        for student_class in dept.classes.all():
-            student_class.is_active = False
-            student_class.save()
-            for subject in student_class.subjects.all():
-                subject.is_active = False
-                subject.save()
+        set_active(dept, False)
         messages.warning(
             request, f"Department '{dept.name}' and its contents deactivated."
         )
+    invalidate_dashboard_stats()
+    invalidate_teacher_dashboards(teacher_ids)
     return redirect("manage_structure")
 
 
 @user_passes_test(is_admin)
+@require_POST
 def delete_class(request, class_id):
     student_class = get_object_or_404(StudentClass, id=class_id)
+    teacher_ids = subtree_teacher_ids(student_class)
     if "restore" in request.POST:
-        student_class.is_active = True
-        student_class.save()
-        messages.success(request, f"Class '{student_class.name}' restored.")
+        set_active(student_class, True)
+        messages.success(
+            request, f"Class '{student_class.name}' and its subjects restored."
+        )
     elif "hard_delete" in request.POST:
         class_name = student_class.name
         student_class.delete()
         messages.success(request, f"Class '{class_name}' permanently deleted.")
     else:
-        student_class.is_active = False
-        student_class.save()
-        # Cascading deactivation
-        for subject in student_class.subjects.all():
-            subject.is_active = False
-            subject.save()
+        set_active(student_class, False)
         messages.warning(
             request, f"Class '{student_class.name}' and its subjects deactivated."
         )
+    invalidate_dashboard_stats()
+    invalidate_teacher_dashboards(teacher_ids)
     return redirect("manage_structure")
 
 
 @user_passes_test(is_admin)
+@require_POST
 def delete_subject(request, subject_id):
     subject = get_object_or_404(Subject, id=subject_id)
+    teacher_ids = [subject.teacher_id]
     if "restore" in request.POST:
-        subject.is_active = True
-        subject.save()
+        set_active(subject, True)
         messages.success(request, f"Subject '{subject.name}' restored.")
     elif "hard_delete" in request.POST:
         subject_name = subject.name
         subject.delete()
         messages.success(request, f"Subject '{subject_name}' permanently deleted.")
     else:
-        subject.is_active = False
-        subject.save()
+        set_active(subject, False)
         messages.warning(request, f"Subject '{subject.name}' deactivated.")
+    invalidate_dashboard_stats()
+    invalidate_teacher_dashboards(teacher_ids)
     return redirect("manage_structure")
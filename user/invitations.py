@@ -0,0 +1,99 @@
+import uuid
+
+from django.contrib.auth.base_user import BaseUserManager
+from django.db import transaction
+
+from .models import Invitation, User
+
+
+def parse_email_list(email_string):
+    """
+    Split the comma separated `emails` field into normalized addresses.
+
+    Order is preserved and repeated addresses are kept so the caller can
+    report them; see create_invitations.
+    """
+    return [
+        BaseUserManager.normalize_email(e.strip())
+        for e in email_string.split(",")
+        if e.strip()
+    ]
+
+
+def existing_invitations(emails):
+    """(email, class_id) of the invitations already sent to `emails`."""
+    return Invitation.objects.filter(email__in=emails).values_list("email", "class_id")
+
+
+def create_invitations(emails, role, class_id=None, names=None):
+    """
+    Create invitations for every new address in `emails` in one pass.
+
+    Existing invitations and users are found with one `email__in` query each
+    and the new rows are written with a single bulk insert, so the cost does
+    not grow with the number of addresses. `names` optionally maps an email
+    to (first_name, last_name).
+
+    Returns (invitations, failures) where failures is a list of
+    {"email": ..., "reason": ...} dicts for the success page. The reasons are
+    the ones the invite pages have always shown; a registered user or an
+    invitation to another class than `class_id` is still "Already invited",
+    with the finer cause under a "detail" key for callers that need it.
+    """
+    candidates = {e for e in emails if "@" in e}
+    invited = dict(existing_invitations(candidates))
+    registered = set(
+        User.objects.filter(email__in=candidates).values_list("email", flat=True)
+    )
+
+    failures = []
+    pending = {}
+    for email in emails:
+        if "@" not in email:
+            failures.append({"email": email, "reason": "Invalid format"})
+        elif email in pending:
+            failures.append({"email": email, "reason": "Already invited"})
+        elif email in invited:
+            failure = {"email": email, "reason": "Already invited"}
+            if class_id is not None and invited[email] != class_id:
+                failure["detail"] = "Already invited to another class"
+            failures.append(failure)
+        elif email in registered:
+            failures.append(
+                {
+                    "email": email,
+                    "reason": "Already invited",
+                    "detail": "Already registered",
+                }
+            )
+        else:
+            first_name, last_name = (names or {}).get(email, ("", ""))
+            pending[email] = Invitation(
+                email=email,
+                first_name=first_name,
+                last_name=last_name,
+                token=uuid.uuid4(),
+                role=role,
+                class_id=class_id,
+            )
+
+    if not pending:
+        return [], failures
+
+    with transaction.atomic():
+        Invitation.objects.bulk_create(pending.values(), ignore_conflicts=True)
+        # Rows that lost a race with a concurrent invite were skipped by the
+        # insert; only the tokens that made it in are ours.
+        saved = set(
+            Invitation.objects.filter(
+                token__in=[i.token for i in pending.values()]
+            ).values_list("email", flat=True)
+        )
+
+    invitations = []
+    for email, invitation in pending.items():
+        if email in saved:
+            invitations.append(invitation)
+        else:
+            failures.append({"email": email, "reason": "Already invited"})
+    return invitations, failures
@@ -0,0 +1,126 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+BATCH_SIZE = 100
+MAX_ATTEMPTS = 5
+RETRY_BASE_DELAY = timedelta(minutes=1)
+# How long a worker owns a claimed batch before another worker may retry it.
+CLAIM_LEASE = timedelta(minutes=10)
+
+
+def queue_mass_mail(datatuple):
+    """
+    Queue messages for background delivery instead of sending them inline.
+
+    Takes the same (subject, message, from_email, recipient_list) tuples as
+    django.core.mail.send_mass_mail and writes one outbox row per recipient
+    in a single insert. Returns the number of rows queued.
+    """
+    rows = [
+        OutgoingEmail(
+            subject=subject,
+            body=message,
+            from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+            recipient=recipient,
+        )
+        for subject, message, from_email, recipient_list in datatuple
+        for recipient in recipient_list
+    ]
+    OutgoingEmail.objects.bulk_create(rows)
+    return len(rows)
+
+
+def queue_mail(subject, message, from_email, recipient_list):
+    """Queue counterpart of django.core.mail.send_mail."""
+    return queue_mass_mail([(subject, message, from_email, recipient_list)])
+
+
+def due_mail(now):
+    """Queued messages whose next attempt is due at `now`, oldest first."""
+    return OutgoingEmail.objects.filter(
+        status=OutgoingEmail.Status.QUEUED, next_attempt_at__lte=now
+    ).order_by("next_attempt_at", "id")
+
+
+def _claim_batch(batch_size):
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(due_mail(now).select_for_update(skip_locked=True)[:batch_size])
+        OutgoingEmail.objects.filter(id__in=[mail.id for mail in batch]).update(
+            next_attempt_at=now + CLAIM_LEASE
+        )
+    return batch
+
+
+def _record_failure(mail, error):
+    mail.attempts += 1
+    mail.last_error = str(error)
+    if mail.attempts >= MAX_ATTEMPTS:
+        mail.status = OutgoingEmail.Status.FAILED
+    else:
+        mail.next_attempt_at = timezone.now() + RETRY_BASE_DELAY * 2 ** (
+            mail.attempts - 1
+        )
+
+
+def send_queued_mail(batch_size=BATCH_SIZE, connection=None):
+    """
+    Deliver one batch of due outbox rows over a single mail connection.
+
+    Failed messages are retried with exponential backoff and marked FAILED
+    after MAX_ATTEMPTS. Returns (sent, failed) counts for the batch; a batch
+    that comes back empty means the outbox is drained.
+
+    A `connection` passed in is left open for the caller's next batch; one
+    created here is closed when the batch is done.
+    """
+    batch = _claim_batch(batch_size)
+    if not batch:
+        return 0, 0
+
+    owns_connection = connection is None
+    connection = connection or get_connection()
+    sent = failed = 0
+    try:
+        connection.open()
+    except Exception as e:
+        # Nothing can be delivered; every claimed row is rescheduled.
+        for mail in batch:
+            _record_failure(mail, e)
+        failed = len(batch)
+    else:
+        try:
+            for mail in batch:
+                message = EmailMessage(
+                    mail.subject,
+                    mail.body,
+                    mail.from_email,
+                    [mail.recipient],
+                    connection=connection,
+                )
+                try:
+                    connection.send_messages([message])
+                except Exception as e:
+                    _record_failure(mail, e)
+                    failed += 1
+                else:
+                    mail.attempts += 1
+                    mail.status = OutgoingEmail.Status.SENT
+                    mail.sent_at = timezone.now()
+                    mail.last_error = ""
+                    sent += 1
+        finally:
+            if owns_connection:
+                connection.close()
+
+    OutgoingEmail.objects.bulk_update(
+        batch,
+        ["status", "attempts", "next_attempt_at", "last_error", "sent_at"],
+    )
+    return sent, failed
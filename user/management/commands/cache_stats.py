@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from classcheck.caching import counters, reset_counters
+
+
+class Command(BaseCommand):
+    help = "Print cache hits and misses per namespace, counted across all workers."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Zero the counters after printing them.",
+        )
+
+    def handle(self, *args, **options):
+        rows = counters()
+        if not rows:
+            self.stdout.write(
+                "No cache reads counted. Is CACHE_STATS enabled, with CACHE_URL "
+                "shared with the web workers?"
+            )
+        else:
+            header = f"{'namespace':<32} {'hits':>9} {'misses':>9} {'hit %':>7}"
+            self.stdout.write(header)
+            self.stdout.write("-" * len(header))
+            for namespace, row in rows.items():
+                rate = "-" if row["hit_rate"] is None else f"{row['hit_rate']:.1f}"
+                self.stdout.write(
+                    f"{namespace:<32} {row['hits']:>9} {row['misses']:>9} {rate:>7}"
+                )
+        if options["reset"]:
+            reset_counters()
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from classcheck.profiling import profile_table, reset_profiles
+
+
+class Command(BaseCommand):
+    help = "Print p50/p95 request timings per URL name recorded by the profiling middleware."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Discard the recorded samples after printing them.",
+        )
+
+    def handle(self, *args, **options):
+        rows = profile_table()
+        if not rows:
+            self.stdout.write(
+                "No samples recorded. Is REQUEST_PROFILING enabled, with a shared cache?"
+            )
+        else:
+            header = (
+                f"{'view':<32} {'n':>5} {'p50 ms':>9} {'p95 ms':>9} "
+                f"{'db p50':>9} {'db p95':>9} {'q p50':>6} {'q p95':>6}"
+            )
+            self.stdout.write(header)
+            self.stdout.write("-" * len(header))
+            for row in sorted(rows, key=lambda row: row["total_p95"], reverse=True):
+                self.stdout.write(
+                    f"{row['name']:<32} {row['count']:>5} "
+                    f"{row['total_p50']:>9.1f} {row['total_p95']:>9.1f} "
+                    f"{row['db_p50']:>9.1f} {row['db_p95']:>9.1f} "
+                    f"{row['queries_p50']:>6} {row['queries_p95']:>6}"
+                )
+        if options["reset"]:
+            reset_profiles()
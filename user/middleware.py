@@ -0,0 +1,26 @@
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.utils.functional import SimpleLazyObject
+
+from .principal import get_user
+
+
+async def auser(request):
+    if not hasattr(request, "_acached_user"):
+        request._acached_user = await sync_to_async(get_user)(request)
+    return request._acached_user
+
+
+class PrincipalAuthenticationMiddleware(AuthenticationMiddleware):
+    """
+    AuthenticationMiddleware that builds request.user, and request.auser()
+    for async views, from the cached auth principal when it can (see
+    user/principal.py).
+    """
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_user(request))
+        request.auser = partial(auser, request)
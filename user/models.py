@@ -3,8 +3,12 @@ from datetime import timedelta
 from django.contrib.auth.base_user import BaseUserManager
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils import timezone
 
+from .principal import forget_principal
+
 
 class CustomUserManager(BaseUserManager):
     def create_user(self, email, password=None, **extra_fields):
@@ -40,6 +44,7 @@ class User(AbstractUser):
 
     class Meta:
         db_table = "user"
+
     class Role(models.TextChoices):
         ADMIN = "ADMIN", "Admin"
         TEACHER = "TEACHER", "Teacher"
@@ -57,6 +62,12 @@ class User(AbstractUser):
         return self.role == self.Role.ADMIN
 
 
+@receiver([post_save, post_delete], sender=User)
+def drop_cached_principal(sender, instance, **kwargs):
+    # Role, active flag and password all feed the cached principal.
+    forget_principal(instance.pk)
+
+
 class Invitation(models.Model):
     email = models.EmailField(unique=True)
     first_name = models.CharField(max_length=150, default="")
@@ -78,3 +89,38 @@ class Invitation(models.Model):
 
     def __str__(self):
         return f"Invitation for {self.email} ({self.role})"
+
+
+class OutgoingEmail(models.Model):
+    """
+    A message waiting in the outbox.
+
+    Views queue rows with user.mail.queue_mass_mail; the send_queued_mail
+    command delivers them in batches and reschedules failures with backoff.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = "QUEUED", "Queued"
+        SENT = "SENT", "Sent"
+        FAILED = "FAILED", "Failed"
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254, blank=True)
+    recipient = models.EmailField()
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.QUEUED
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="outbox_due_idx")
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.recipient} ({self.status})"
@@ -0,0 +1,101 @@
+"""
+Cached auth principal, so authenticated requests skip the user lookup.
+
+After a full authentication, the handful of User fields that the role
+decorators and base template read are cached per user as a Principal.
+Later requests in any session of that user build request.user from it:
+an ordinary User instance with only those fields loaded and the rest
+deferred, so anything else still loads on first access. The session auth
+hash is kept alongside and compared on every request, so a password
+change logs other sessions out just as it does without the cache.
+
+The entry is dropped whenever the user is saved or deleted (see the
+signal receiver in user/models.py). QuerySet.update() bypasses those,
+so PRINCIPAL_TTL bounds how long such a change can go unnoticed.
+"""
+
+from typing import NamedTuple
+
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.crypto import constant_time_compare
+
+PRINCIPAL_KEY = "auth_principal:{}"
+PRINCIPAL_TTL = 5 * 60  # seconds
+
+
+class Principal(NamedTuple):
+    id: int
+    email: str
+    role: str
+    is_active: bool
+    session_hash: str
+
+    @classmethod
+    def from_user(cls, user):
+        return cls(
+            user.pk,
+            user.email,
+            user.role,
+            user.is_active,
+            user.get_session_auth_hash(),
+        )
+
+    def as_user(self):
+        """A User with the principal's fields loaded and every other field deferred."""
+        User = auth.get_user_model()
+        loaded = {
+            "id": self.id,
+            "email": self.email,
+            "role": self.role,
+            "is_active": self.is_active,
+        }
+        # from_db takes values in concrete field order.
+        names = [
+            field.attname
+            for field in User._meta.concrete_fields
+            if field.attname in loaded
+        ]
+        return User.from_db(DEFAULT_DB_ALIAS, names, [loaded[name] for name in names])
+
+
+def remember_principal(user):
+    cache.set(PRINCIPAL_KEY.format(user.pk), Principal.from_user(user), PRINCIPAL_TTL)
+
+
+def forget_principal(user_id):
+    cache.delete(PRINCIPAL_KEY.format(user_id))
+
+
+def get_user(request):
+    """
+    request.user from the cached principal when it is still valid for
+    this session, otherwise from django.contrib.auth.get_user.
+    """
+    try:
+        user_id = auth.get_user_model()._meta.pk.to_python(request.session[SESSION_KEY])
+        backend_path = request.session[BACKEND_SESSION_KEY]
+    except KeyError:
+        return auth.get_user(request)
+
+    principal = cache.get(PRINCIPAL_KEY.format(user_id))
+    session_hash = request.session.get(HASH_SESSION_KEY)
+    if (
+        principal is None
+        or not principal.is_active
+        or backend_path not in settings.AUTHENTICATION_BACKENDS
+        or not session_hash
+        or not constant_time_compare(session_hash, principal.session_hash)
+    ):
+        # The full path also handles hash fallbacks and flushes stale sessions.
+        user = auth.get_user(request)
+        if user.is_authenticated:
+            remember_principal(user)
+        return user
+
+    user = principal.as_user()
+    user.backend = backend_path
+    return user
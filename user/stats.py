@@ -0,0 +1,84 @@
+from django.db.models import Count, Q
+
+from classcheck.caching import bump, cached
+
+from teacher.models import AcademicSession, Department
+
+from .models import User
+
+DASHBOARD_STATS_NAMESPACE = "superuser_dashboard"
+DASHBOARD_STATS_TTL = 60  # seconds
+
+
+def _compute_dashboard_stats():
+    role_counts = dict(
+        User.objects.order_by().values_list("role").annotate(n=Count("id"))
+    )
+    sessions = list(
+        AcademicSession.objects.annotate(
+            department_count=Count(
+                "departments", filter=Q(departments__is_dead=False), distinct=True
+            ),
+        )
+        .order_by("-created_at")
+        .values("id", "year_range", "is_active", "department_count")
+    )
+    departments = (
+        Department.objects.filter(is_dead=False)
+        .annotate(
+            class_count=Count(
+                "classes", filter=Q(classes__is_dead=False), distinct=True
+            ),
+            subject_count=Count(
+                "classes__subjects",
+                filter=Q(classes__subjects__is_dead=False),
+                distinct=True,
+            ),
+            student_count=Count(
+                "classes__subjects__enrollments__student",
+                filter=Q(classes__subjects__is_dead=False),
+                distinct=True,
+            ),
+        )
+        .order_by("name")
+        .values(
+            "id",
+            "name",
+            "session_id",
+            "is_active",
+            "class_count",
+            "subject_count",
+            "student_count",
+        )
+    )
+    by_session = {session["id"]: session for session in sessions}
+    for session in sessions:
+        session["departments"] = []
+    for department in departments:
+        by_session[department["session_id"]]["departments"].append(department)
+
+    return {
+        "roles": {role: role_counts.get(role, 0) for role in User.Role.values},
+        "sessions": sessions,
+    }
+
+
+def dashboard_stats():
+    """
+    Aggregate counts for the superuser dashboard: users per role and, per
+    academic session, classes, subjects and enrolled students per department.
+
+    Computed with a handful of GROUP BY queries and cached for
+    DASHBOARD_STATS_TTL seconds; structure edits call
+    invalidate_dashboard_stats so admins see their own changes immediately.
+    """
+    return cached(
+        DASHBOARD_STATS_NAMESPACE,
+        ["stats"],
+        _compute_dashboard_stats,
+        DASHBOARD_STATS_TTL,
+    )
+
+
+def invalidate_dashboard_stats():
+    bump(DASHBOARD_STATS_NAMESPACE)
@@ -51,3 +51,37 @@ class SuperuserBulkInviteTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, "existing@example.com") # Failure list
         self.assertTrue(Invitation.objects.filter(email="new@example.com").exists())
+
+    def test_duplicates_and_registered_users(self):
+        User.objects.create_user(email="member@example.com", role=User.Role.TEACHER)
+        email_string = "dup@example.com, dup@example.com, member@example.com"
+        response = self.client.post("/invite-teacher/", {"emails": email_string})
+
+        self.assertEqual(response.context["total_success"], 1)
+        self.assertEqual(
+            response.context["failures"],
+            [
+                {"email": "dup@example.com", "reason": "Already invited"},
+                {
+                    "email": "member@example.com",
+                    "reason": "Already invited",
+                    "detail": "Already registered",
+                },
+            ],
+        )
+        self.assertEqual(Invitation.objects.filter(email="dup@example.com").count(), 1)
+
+    def test_query_count_is_flat(self):
+        from django.core.cache import cache
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        def count_queries(prefix, count):
+            emails = ",".join(f"{prefix}{n}@example.com" for n in range(count))
+            cache.clear()
+            with CaptureQueriesContext(connection) as ctx:
+                self.client.post("/invite-student/", {"emails": emails})
+            return len(ctx.captured_queries)
+
+        self.assertEqual(count_queries("small", 3), count_queries("large", 60))
+        self.assertEqual(Invitation.objects.count(), 63)
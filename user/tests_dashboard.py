@@ -0,0 +1,85 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from student.models import Enrollment
+from teacher.models import AcademicSession, Department, StudentClass, Subject
+from user.models import User
+
+
+class SuperuserDashboardTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.admin = User.objects.create_superuser(
+            email="admin@example.com", password="password", role=User.Role.ADMIN
+        )
+        self.client.force_login(self.admin)
+
+        self.session = AcademicSession.objects.create(
+            year_range="2090-2091", is_active=True
+        )
+        self.dept = Department.objects.create(name="Science", session=self.session)
+        self.teacher_count = 0
+
+    def add_subjects(self, count):
+        cls = StudentClass.objects.create(name="x", department=self.dept)
+        for _ in range(count):
+            self.teacher_count += 1
+            teacher = User.objects.create_user(
+                email=f"teacher{self.teacher_count}@example.com", role=User.Role.TEACHER
+            )
+            student = User.objects.create_user(
+                email=f"student{self.teacher_count}@example.com", role=User.Role.STUDENT
+            )
+            subject = Subject.objects.create(
+                name=f"Subject {self.teacher_count}", student_class=cls, teacher=teacher
+            )
+            Enrollment.objects.create(student=student, subject=subject)
+
+    def count_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/dashboard/")
+        self.assertEqual(response.status_code, 200)
+        return response, len(ctx.captured_queries)
+
+    def test_aggregates(self):
+        self.add_subjects(3)
+        response, _ = self.count_queries()
+
+        stats = response.context["stats"]
+        self.assertEqual(stats["roles"], {"ADMIN": 1, "TEACHER": 3, "STUDENT": 3})
+        (dept,) = stats["sessions"][0]["departments"]
+        self.assertEqual(
+            (dept["class_count"], dept["subject_count"], dept["student_count"]),
+            (1, 3, 3),
+        )
+        self.assertContains(response, "teacher1@example.com")
+
+    def test_query_count_is_flat(self):
+        self.add_subjects(2)
+        # Both measurements start cold: no session, principal or stats cached.
+        cache.clear()
+        _, small = self.count_queries()
+        cache.clear()
+        self.add_subjects(40)
+        _, large = self.count_queries()
+
+        self.assertEqual(small, large)
+
+    def test_structure_writes_invalidate_cache(self):
+        response, _ = self.count_queries()
+        self.assertEqual(
+            response.context["stats"]["sessions"][0]["department_count"], 1
+        )
+
+        self.client.post(
+            "/teacher/structure/department/add/",
+            {"name": "History", "session_id": self.session.id},
+        )
+
+        response, _ = self.count_queries()
+        self.assertEqual(
+            response.context["stats"]["sessions"][0]["department_count"], 2
+        )
@@ -0,0 +1,61 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core import mail
+from django.test import TestCase
+from django.utils import timezone
+
+from user.mail import MAX_ATTEMPTS, queue_mass_mail, send_queued_mail
+from user.models import OutgoingEmail
+
+
+class FlakyBackendError(Exception):
+    pass
+
+
+class OutboxWorkerTest(TestCase):
+    def queue(self, count):
+        return queue_mass_mail(
+            [
+                ("Hello", "Body", None, [f"user{n}@example.com"])
+                for n in range(count)
+            ]
+        )
+
+    def test_batches_share_one_connection(self):
+        self.queue(5)
+
+        with patch("user.mail.get_connection", wraps=mail.get_connection) as factory:
+            self.assertEqual(send_queued_mail(batch_size=3), (3, 0))
+            self.assertEqual(send_queued_mail(batch_size=3), (2, 0))
+            self.assertEqual(send_queued_mail(batch_size=3), (0, 0))
+
+        self.assertEqual(factory.call_count, 2)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual(
+            OutgoingEmail.objects.filter(status=OutgoingEmail.Status.SENT).count(), 5
+        )
+
+    def test_failures_back_off_then_give_up(self):
+        self.queue(1)
+        target = "django.core.mail.backends.locmem.EmailBackend.send_messages"
+
+        with patch(target, side_effect=FlakyBackendError("SMTP Error")):
+            self.assertEqual(send_queued_mail(), (0, 1))
+            queued = OutgoingEmail.objects.get()
+            self.assertEqual(queued.status, OutgoingEmail.Status.QUEUED)
+            self.assertEqual(queued.last_error, "SMTP Error")
+            self.assertGreater(queued.next_attempt_at, timezone.now())
+
+            # Not due yet, so nothing is claimed.
+            self.assertEqual(send_queued_mail(), (0, 0))
+
+            for _ in range(MAX_ATTEMPTS - 1):
+                OutgoingEmail.objects.update(
+                    next_attempt_at=timezone.now() - timedelta(seconds=1)
+                )
+                send_queued_mail()
+
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, OutgoingEmail.Status.FAILED)
+        self.assertEqual(queued.attempts, MAX_ATTEMPTS)
@@ -0,0 +1,79 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from user.models import User
+from user.principal import PRINCIPAL_KEY
+
+
+class PrincipalTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.teacher = User.objects.create_user(
+            "teacher@example.com", "pw-123456", role=User.Role.TEACHER
+        )
+        self.client = Client()
+        self.client.force_login(self.teacher)
+
+    def auth_queries(self, url="/teacher/dashboard/"):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        sql = [q["sql"] for q in ctx.captured_queries]
+        return response, [
+            s for s in sql if 'FROM "user"' in s or 'FROM "django_session"' in s
+        ]
+
+    def test_warm_request_skips_session_and_user_lookups(self):
+        self.auth_queries()
+        self.assertIn(PRINCIPAL_KEY.format(self.teacher.pk), cache)
+
+        response, queries = self.auth_queries()
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "teacher@example.com")
+        self.assertEqual(queries, [])
+
+    def test_role_change_takes_effect_immediately(self):
+        self.auth_queries()
+        self.teacher.role = User.Role.STUDENT
+        self.teacher.save()
+
+        response = self.client.get("/teacher/class/1/details/")
+        self.assertRedirects(response, "/login/", fetch_redirect_response=False)
+
+    def test_deactivated_user_is_logged_out(self):
+        self.auth_queries()
+        self.teacher.is_active = False
+        self.teacher.save(update_fields=["is_active"])
+
+        response = self.client.get("/teacher/class/1/details/")
+        self.assertRedirects(response, "/login/", fetch_redirect_response=False)
+
+    def test_password_change_ends_other_sessions(self):
+        self.auth_queries()
+        self.teacher.set_password("new-pw-123456")
+        self.teacher.save()
+
+        response = self.client.get("/teacher/class/1/details/")
+        self.assertRedirects(response, "/login/", fetch_redirect_response=False)
+
+    def test_deleted_user_is_logged_out(self):
+        self.auth_queries()
+        self.teacher.delete()
+
+        response = self.client.get("/teacher/class/1/details/")
+        self.assertRedirects(response, "/login/", fetch_redirect_response=False)
+
+    def test_other_fields_load_on_access(self):
+        self.teacher.first_name = "Ada"
+        self.teacher.save()
+        self.auth_queries()
+
+        request = self.client.get("/teacher/dashboard/").wsgi_request
+        self.assertEqual(request.user.first_name, "Ada")
+
+
+@override_settings(SESSION_ENGINE="django.contrib.sessions.backends.signed_cookies")
+class SignedCookieSessionTest(PrincipalTest):
+    """The same behaviour with the session kept in a signed cookie."""
@@ -41,8 +41,8 @@ class TeacherRegistrationTest(TestCase):
         url = reverse("register", args=[self.token])
         data = {
             "email": self.email,
-            "password": "password123",
-            "confirm_password": "password123",
+            "password1": "Attend-2025-ok",
+            "password2": "Attend-2025-ok",
             "first_name": "New",
             "last_name": "Teacher",
         }
@@ -71,8 +71,8 @@ class TeacherRegistrationTest(TestCase):
         url = reverse("register", args=[self.token])
         data = {
             "email": self.email,
-            "password": "password123",
-            "confirm_password": "password123",
+            "password1": "Attend-2025-ok",
+            "password2": "Attend-2025-ok",
             "first_name": "New",
             "last_name": "Teacher",
         }
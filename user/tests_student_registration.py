@@ -4,7 +4,7 @@ from django.test import Client, TestCase
 from django.urls import reverse
 
 from student.models import Enrollment
-from teacher.models import AcademicSession, Class, Department, StudentClass, Subject
+from teacher.models import AcademicSession, Department, StudentClass, Subject
 from user.models import Invitation, User
 
 
@@ -37,8 +37,8 @@ class StudentRegistrationTest(TestCase):
         url = reverse("register", args=[self.token])
         data = {
             "email": self.email,
-            "password": "password123",
-            "confirm_password": "password123",
+            "password1": "Attend-2025-ok",
+            "password2": "Attend-2025-ok",
             "first_name": "New",
             "last_name": "Student",
         }
@@ -1,6 +1,10 @@
+from io import StringIO
+
+from django.core import mail
+from django.core.management import call_command
 from django.test import TestCase, Client
 from django.contrib.auth import get_user_model
-from user.models import Invitation
+from user.models import Invitation, OutgoingEmail
 from unittest.mock import patch
 
 User = get_user_model()
@@ -13,31 +17,31 @@ class InvitationTransactionTest(TestCase):
         )
         self.client.force_login(self.admin)
 
-    def test_invite_teacher_email_failure_no_save(self):
-        # Mock send_mail to raise an exception
-        # Patch where it is used (user.views)
-        with patch('user.views.send_mail', side_effect=Exception("SMTP Error")):
-            email_string = "fail@example.com"
-            response = self.client.post(
-                "/invite-teacher/",
-                {"emails": email_string}
-            )
-            
-            self.assertEqual(response.status_code, 200)
-            # Should show error in context
-            self.assertContains(response, "SMTP Error")
-            # Should NOT create record
-            self.assertFalse(Invitation.objects.filter(email="fail@example.com").exists())
-
-    def test_invite_teacher_email_success_saves(self):
-        # Mock send_mail to succeed
-        with patch('user.views.send_mail') as mock_send:
-            email_string = "success@example.com"
+    def test_invite_teacher_queues_without_sending(self):
+        # The view only enqueues; SMTP is never touched during the request.
+        with patch('django.core.mail.backends.locmem.EmailBackend.send_messages') as mock_send:
+            email_string = "queued@example.com"
             response = self.client.post(
                 "/invite-teacher/",
                 {"emails": email_string}
             )
-            
+
             self.assertEqual(response.status_code, 200)
-            self.assertTrue(Invitation.objects.filter(email="success@example.com").exists())
-            self.assertTrue(mock_send.called)
+            self.assertFalse(mock_send.called)
+            self.assertTrue(Invitation.objects.filter(email="queued@example.com").exists())
+            queued = OutgoingEmail.objects.get(recipient="queued@example.com")
+            self.assertEqual(queued.status, OutgoingEmail.Status.QUEUED)
+
+    def test_invite_teacher_email_delivered_by_worker(self):
+        email_string = "success@example.com"
+        self.client.post(
+            "/invite-teacher/",
+            {"emails": email_string}
+        )
+        self.assertEqual(len(mail.outbox), 0)
+
+        call_command("send_queued_mail", stdout=StringIO())
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["success@example.com"])
+        self.assertIn("/register/", mail.outbox[0].body)
@@ -1,19 +1,24 @@
-import uuid
-
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import login, logout
 from django.contrib.auth.decorators import login_required
-from django.core.mail import send_mail
+from django.core.paginator import Paginator
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy
 from django.views.generic import CreateView, TemplateView
 
 from student.models import Enrollment
+from teacher.dashboard import invalidate_teacher_dashboards
+from teacher.structure import unclaimed_subjects
 
 from .decorators import admin_required
 from .forms import InviteStudentForm, InviteTeacherForm, RegisterForm
+from .invitations import create_invitations, parse_email_list
+from .mail import queue_mass_mail
 from .models import Invitation, User
+from .stats import dashboard_stats
+
+DASHBOARD_PAGE_SIZE = 25
 
 
 def logout_view(request):
@@ -30,43 +35,23 @@ def invite_teacher(request):
     if request.method == "POST":
         form = InviteTeacherForm(request.POST)
         if form.is_valid():
-            email_string = form.cleaned_data["emails"]
-            emails = [e.strip() for e in email_string.split(",") if e.strip()]
-
-            success_count = 0
-            failures = []
-
-            for email in emails:
-                if "@" not in email:
-                    failures.append({"email": email, "reason": "Invalid format"})
-                    continue
-
-                if Invitation.objects.filter(email=email).exists():
-                    failures.append({"email": email, "reason": "Already invited"})
-                    continue
-
-                try:
-                    invitation = Invitation(
-                        email=email, token=uuid.uuid4(), role=User.Role.TEACHER
-                    )
-                    scheme = request.scheme
-                    # Check for proxy headers first, fallback to request host
-                    host = request.META.get('HTTP_X_FORWARDED_HOST') or request.get_host()
-                    invite_link = f"{scheme}://{host}/register/{invitation.token}/"
-                    subject = "Invitation to join ClassCheck as a Teacher"
-                    message = f"Hi,\n\nYou have been invited to join ClassCheck. Please click the link below to set your password and activate your account:\n\n{invite_link}\n\nThis link is valid for 72 hours.\n\nBest regards,\nClassCheck Team"
-
-                    send_mail(
-                        subject,
-                        message,
-                        settings.DEFAULT_FROM_EMAIL,
-                        [email],
-                        fail_silently=False,
-                    )
-                    invitation.save()
-                    success_count += 1
-                except Exception as e:
-                    failures.append({"email": email, "reason": str(e)})
+            emails = parse_email_list(form.cleaned_data["emails"])
+            invitations, failures = create_invitations(emails, User.Role.TEACHER)
+            success_count = len(invitations)
+
+            scheme = request.scheme
+            # Check for proxy headers first, fallback to request host
+            host = request.META.get('HTTP_X_FORWARDED_HOST') or request.get_host()
+            subject = "Invitation to join ClassCheck as a Teacher"
+            outgoing = []
+            for invitation in invitations:
+                invite_link = f"{scheme}://{host}/register/{invitation.token}/"
+                message = f"Hi,\n\nYou have been invited to join ClassCheck. Please click the link below to set your password and activate your account:\n\n{invite_link}\n\nThis link is valid for 72 hours.\n\nBest regards,\nClassCheck Team"
+                outgoing.append(
+                    (subject, message, settings.DEFAULT_FROM_EMAIL, [invitation.email])
+                )
+
+            queue_mass_mail(outgoing)
 
             context = {
                 "title": "Teachers",
@@ -85,44 +70,23 @@ def invite_student(request):
     if request.method == "POST":
         form = InviteStudentForm(request.POST)
         if form.is_valid():
-            email_string = form.cleaned_data["emails"]
-            emails = [e.strip() for e in email_string.split(",") if e.strip()]
-
-            success_count = 0
-            failures = []
-
-            for email in emails:
-                if "@" not in email:
-                    failures.append({"email": email, "reason": "Invalid format"})
-                    continue
-
-                if Invitation.objects.filter(email=email).exists():
-                    failures.append({"email": email, "reason": "Already invited"})
-                    continue
-
-                try:
-                    invitation = Invitation(
-                        email=email, token=uuid.uuid4(), role=User.Role.STUDENT
-                    )
-
-                    scheme = request.scheme
-                    # Check for proxy headers first, fallback to request host
-                    host = request.META.get('HTTP_X_FORWARDED_HOST') or request.get_host()
-                    invite_link = f"{scheme}://{host}/register/{invitation.token}/"
-                    subject = "Invitation to join ClassCheck as a Student"
-                    message = f"Hi,\n\nYou have been invited to join ClassCheck as a Student. Please click the link below to set your password and activate your account:\n\n{invite_link}\n\nThis link is valid for 72 hours.\n\nBest regards,\nClassCheck Team"
-
-                    send_mail(
-                        subject,
-                        message,
-                        settings.DEFAULT_FROM_EMAIL,
-                        [email],
-                        fail_silently=False,
-                    )
-                    invitation.save()
-                    success_count += 1
-                except Exception as e:
-                    failures.append({"email": email, "reason": str(e)})
+            emails = parse_email_list(form.cleaned_data["emails"])
+            invitations, failures = create_invitations(emails, User.Role.STUDENT)
+            success_count = len(invitations)
+
+            scheme = request.scheme
+            # Check for proxy headers first, fallback to request host
+            host = request.META.get('HTTP_X_FORWARDED_HOST') or request.get_host()
+            subject = "Invitation to join ClassCheck as a Student"
+            outgoing = []
+            for invitation in invitations:
+                invite_link = f"{scheme}://{host}/register/{invitation.token}/"
+                message = f"Hi,\n\nYou have been invited to join ClassCheck as a Student. Please click the link below to set your password and activate your account:\n\n{invite_link}\n\nThis link is valid for 72 hours.\n\nBest regards,\nClassCheck Team"
+                outgoing.append(
+                    (subject, message, settings.DEFAULT_FROM_EMAIL, [invitation.email])
+                )
+
+            queue_mass_mail(outgoing)
 
             context = {
                 "title": "Students",
@@ -157,11 +121,8 @@ def register(request, token):
 
             # Assign pre-created subjects to the new teacher
             if user.is_teacher():
-                from teacher.models import Subject
-
-                Subject.objects.filter(
-                    teacher_email=user.email, teacher__isnull=True
-                ).update(teacher=user)
+                unclaimed_subjects(user.email).update(teacher=user)
+                invalidate_teacher_dashboards([user.pk])
 
             # Handle Enrollment if class_id is present
             if invitation.class_id:
@@ -191,16 +152,31 @@ def register(request, token):
 
 @admin_required
 def superuser_dashboard(request):
-    teachers = User.objects.filter(role=User.Role.TEACHER)
-    students = User.objects.filter(role=User.Role.STUDENT)
-
     from teacher.models import Subject
 
-    classes = Subject.objects.all()
+    teachers = User.objects.filter(role=User.Role.TEACHER).order_by("email")
+    students = User.objects.filter(role=User.Role.STUDENT).order_by("email")
+    classes = (
+        Subject.objects.filter(is_dead=False)
+        .select_related("student_class__department", "teacher")
+        .order_by("student_class__department__name", "student_class__name", "name")
+    )
+
     return render(
         request,
         "user/dashboard.html",
-        {"teachers": teachers, "students": students, "classes": classes},
+        {
+            "stats": dashboard_stats(),
+            "teachers": Paginator(teachers, DASHBOARD_PAGE_SIZE).get_page(
+                request.GET.get("teachers_page")
+            ),
+            "students": Paginator(students, DASHBOARD_PAGE_SIZE).get_page(
+                request.GET.get("students_page")
+            ),
+            "classes": Paginator(classes, DASHBOARD_PAGE_SIZE).get_page(
+                request.GET.get("classes_page")
+            ),
+        },
     )
 
 